@@ -1,29 +1,97 @@
 from __future__ import annotations
 
+import io
 import json
+import os
+import struct
 import subprocess
+import wave
+from dataclasses import dataclass
+from typing import BinaryIO
+
+_PCM_COPY_BYTES = 1024 * 1024
+_WAV_HEADER_BYTES = 44
+
+
+@dataclass
+class WavInfo:
+    sample_rate: int
+    channels: int
+    sample_width: int
+    n_frames: int
+
+    @property
+    def duration_ms(self) -> int:
+        return int(self.n_frames * 1000 / self.sample_rate)
+
+
+class MemoryReader(io.RawIOBase):
+    """Read-only, seekable file over an in-memory buffer. Unlike ``BytesIO``
+    it never copies the buffer, so several readers can share one part."""
+
+    def __init__(self, buffer, name: str = "audio.wav") -> None:
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+        self.name = name
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        # ``seek`` may go past the end, where reads return nothing.
+        count = max(0, min(len(target), len(self._view) - self._position))
+        target[:count] = self._view[self._position : self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += len(self._view)
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def getbuffer(self) -> memoryview:
+        return self._view
+
+    def reopen(self) -> MemoryReader:
+        return MemoryReader(self._view, self.name)
+
+
+AudioSource = str | MemoryReader
 
 
 def _run(cmd: list[str]) -> None:
     subprocess.run(cmd, check=True)
 
 
-def extract_normalized_wav(input_path: str, output_path: str) -> None:
-    _run(
-        [
-            "ffmpeg",
-            "-y",
-            "-i",
-            input_path,
-            "-ac",
-            "1",
-            "-ar",
-            "48000",
-            "-c:a",
-            "pcm_s16le",
-            output_path,
-        ]
-    )
+def extract_normalized_wav(
+    input_path: str, output_path: str, vad_output_path: str | None = None
+) -> None:
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-i",
+        input_path,
+        "-ac",
+        "1",
+        "-ar",
+        "48000",
+        "-c:a",
+        "pcm_s16le",
+        output_path,
+    ]
+    if vad_output_path:
+        # Second output from the same decode: a 16 kHz track for VAD.
+        cmd += ["-ac", "1", "-ar", "16000", "-c:a", "pcm_s16le", vad_output_path]
+    _run(cmd)
 
 
 def generate_playable_m4a(input_path: str, output_path: str) -> None:
@@ -46,28 +114,176 @@ def generate_playable_m4a(input_path: str, output_path: str) -> None:
     )
 
 
-def extract_clip(input_path: str, output_path: str, start_ms: int, end_ms: int) -> None:
-    start_sec = start_ms / 1000
-    duration = max(end_ms - start_ms, 0) / 1000
+def generate_hls(playable_path: str, output_dir: str, segment_s: int) -> str:
+    """Segment the playable M4A into fMP4 HLS without re-encoding.
+
+    Returns the playlist path; ``init.mp4`` and the ``seg-*.m4s`` segments
+    are written next to it and referenced by relative names.
+    """
+    playlist = os.path.join(output_dir, "index.m3u8")
     _run(
         [
             "ffmpeg",
             "-y",
-            "-ss",
-            str(start_sec),
             "-i",
-            input_path,
-            "-t",
-            str(duration),
-            "-ac",
-            "1",
-            "-ar",
-            "48000",
-            "-c:a",
-            "pcm_s16le",
-            output_path,
+            playable_path,
+            "-c",
+            "copy",
+            "-f",
+            "hls",
+            "-hls_time",
+            str(segment_s),
+            "-hls_playlist_type",
+            "vod",
+            "-hls_segment_type",
+            "fmp4",
+            "-hls_fmp4_init_filename",
+            "init.mp4",
+            "-hls_segment_filename",
+            os.path.join(output_dir, "seg-%05d.m4s"),
+            playlist,
         ]
     )
+    return playlist
+
+
+def encode_flac(wav_path: str, flac_path: str) -> None:
+    # Lossless, so a decoded archive is sample-identical to the WAV.
+    _run(["ffmpeg", "-y", "-i", wav_path, "-c:a", "flac", flac_path])
+
+
+def decode_flac(flac_path: str, wav_path: str) -> None:
+    _run(["ffmpeg", "-y", "-i", flac_path, "-c:a", "pcm_s16le", wav_path])
+
+
+def pcm_to_wav_bytes(pcm: bytes, sample_rate: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def pcm_file_to_wav(pcm_path: str, output_path: str, sample_rate: int) -> None:
+    with open(pcm_path, "rb") as source, wave.open(output_path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        while chunk := source.read(_PCM_COPY_BYTES):
+            wf.writeframes(chunk)
+
+
+def copy_wav_pcm(wav_path: str, target: BinaryIO) -> WavInfo:
+    """Append the PCM frames of a WAV to ``target``; returns its header
+    fields."""
+    with wave.open(wav_path, "rb") as wf:
+        info = WavInfo(
+            sample_rate=wf.getframerate(),
+            channels=wf.getnchannels(),
+            sample_width=wf.getsampwidth(),
+            n_frames=wf.getnframes(),
+        )
+        frames_per_chunk = _PCM_COPY_BYTES // (info.channels * info.sample_width)
+        while chunk := wf.readframes(frames_per_chunk):
+            target.write(chunk)
+    return info
+
+
+def read_wav_info(source: str | BinaryIO) -> WavInfo | None:
+    """Header fields of a PCM WAV, or None if the file is not one."""
+    if not isinstance(source, str):
+        source.seek(0)
+    try:
+        with wave.open(source, "rb") as wf:
+            return WavInfo(
+                sample_rate=wf.getframerate(),
+                channels=wf.getnchannels(),
+                sample_width=wf.getsampwidth(),
+                n_frames=wf.getnframes(),
+            )
+    except (wave.Error, EOFError):
+        return None
+    finally:
+        if not isinstance(source, str):
+            source.seek(0)
+
+
+def media_duration_ms(source: AudioSource) -> int | None:
+    """Duration from the WAV header when possible; ffprobe is only spawned
+    for other containers on disk."""
+    info = read_wav_info(source)
+    if info and info.sample_rate:
+        return info.duration_ms
+    if isinstance(source, str):
+        return probe_duration_ms(source)
+    return None
+
+
+def _wav_header(data_bytes: int, info: WavInfo) -> bytes:
+    block_align = info.channels * info.sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_bytes,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        info.channels,
+        info.sample_rate,
+        info.sample_rate * block_align,
+        block_align,
+        info.sample_width * 8,
+        b"data",
+        data_bytes,
+    )
+
+
+def _find_data_chunk(fh: BinaryIO) -> tuple[int, int]:
+    header = fh.read(12)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise ValueError("Not a RIFF/WAVE file")
+    while True:
+        chunk = fh.read(8)
+        if len(chunk) < 8:
+            raise ValueError("WAV file has no data chunk")
+        chunk_id, size = chunk[:4], int.from_bytes(chunk[4:], "little")
+        if chunk_id == b"data":
+            return fh.tell(), size
+        fh.seek(size + (size & 1), os.SEEK_CUR)
+
+
+def read_wav_part(
+    path: str, start_ms: int, end_ms: int, name: str = "part.wav"
+) -> MemoryReader:
+    """Cut ``[start_ms, end_ms)`` out of a PCM WAV without ffmpeg.
+
+    Seeks to the frame offset and reads the samples straight into one buffer
+    behind a fresh header, so the part is never re-encoded, written to disk
+    or copied again before upload.
+    """
+    info = read_wav_info(path)
+    if not info:
+        raise ValueError(f"{path} is not a PCM WAV file")
+    frame_bytes = info.channels * info.sample_width
+    with open(path, "rb") as fh:
+        data_offset, data_size = _find_data_chunk(fh)
+        data_size -= data_size % frame_bytes
+        start = min(int(start_ms * info.sample_rate / 1000) * frame_bytes, data_size)
+        end = min(int(end_ms * info.sample_rate / 1000) * frame_bytes, data_size)
+        end = max(end, start)
+        buffer = bytearray(_WAV_HEADER_BYTES + end - start)
+        buffer[:_WAV_HEADER_BYTES] = _wav_header(end - start, info)
+        view = memoryview(buffer)[_WAV_HEADER_BYTES:]
+        fh.seek(data_offset + start)
+        while view:
+            read = fh.readinto(view)
+            if not read:
+                raise ValueError(f"{path} is shorter than its header says")
+            view = view[read:]
+    return MemoryReader(buffer, name)
 
 
 def probe_duration_ms(input_path: str) -> int | None:
@@ -0,0 +1,121 @@
+"""Short audio clips for citation playback and hover previews.
+
+A clip is cut from the stored PCM WAV with an S3 Range GET of just its
+samples, so a 5 s preview of a 4-hour meeting reads ~160 KB instead of the
+whole playable file. The 16 kHz speech track is used when ingest produced
+one (a third of the bytes of the 48 kHz normalized audio). Finished clips
+are kept in a per-process LRU bounded by total bytes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+
+from app.audio import WavInfo, _find_data_chunk, _wav_header, read_wav_info
+from app.storage import read_object_range
+
+# Enough for the RIFF header plus the LIST/fact chunks ffmpeg writes.
+_HEADER_PROBE_BYTES = 4096
+
+
+@dataclass(frozen=True)
+class _Source:
+    info: WavInfo
+    data_offset: int
+    data_size: int
+
+
+@lru_cache(maxsize=256)
+def _source(object_key: str, version: str) -> _Source:
+    # ``version`` changes when the meeting is re-ingested, so a cached header
+    # never describes an overwritten object.
+    header = read_object_range(object_key, 0, _HEADER_PROBE_BYTES - 1)
+    info = read_wav_info(io.BytesIO(header))
+    if not info:
+        raise ValueError(f"{object_key} is not a PCM WAV file")
+    data_offset, data_size = _find_data_chunk(io.BytesIO(header))
+    return _Source(info=info, data_offset=data_offset, data_size=data_size)
+
+
+def clip_etag(object_key: str, version: str, start_ms: int, end_ms: int) -> str:
+    digest = hashlib.sha256(
+        f"{object_key}\0{version}\0{start_ms}\0{end_ms}".encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def cut_clip(object_key: str, version: str, start_ms: int, end_ms: int) -> bytes:
+    """WAV bytes of ``[start_ms, end_ms)`` of a stored PCM WAV."""
+    source = _source(object_key, version)
+    info = source.info
+    frame_bytes = info.channels * info.sample_width
+    data_size = source.data_size - source.data_size % frame_bytes
+    start = min(int(start_ms * info.sample_rate / 1000) * frame_bytes, data_size)
+    end = min(int(end_ms * info.sample_rate / 1000) * frame_bytes, data_size)
+    pcm = b""
+    if end > start:
+        pcm = read_object_range(
+            object_key, source.data_offset + start, source.data_offset + end - 1
+        )
+    return _wav_header(len(pcm), info) + pcm
+
+
+class ClipCache:
+    """Thread-safe LRU of clip bytes, bounded by their total size."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._items[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+
+def parse_range(header: str | None, length: int) -> tuple[int, int] | None:
+    """Inclusive byte range of a single-range ``Range`` header.
+
+    Returns None when the header is absent or malformed (the whole body is
+    sent); raises ValueError when the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    first_text, _, last_text = header[len("bytes=") :].strip().partition("-")
+    # Multipart ranges are not worth it for clips; send the whole body.
+    if not (first_text or last_text) or not all(
+        text.isdigit() for text in (first_text, last_text) if text
+    ):
+        return None
+    if not first_text:
+        suffix = int(last_text)
+        if suffix == 0 or length == 0:
+            raise ValueError(f"unsatisfiable range {header!r}")
+        return max(length - suffix, 0), length - 1
+    first = int(first_text)
+    last = int(last_text) if last_text else length - 1
+    if first >= length or last < first:
+        raise ValueError(f"unsatisfiable range {header!r}")
+    return first, min(last, length - 1)
@@ -0,0 +1,159 @@
+"""Backlog of queued work per queue stage, in estimated seconds.
+
+Queue length treats a 300 ms clip and a 4-hour ingest alike. Instead, every
+unit of work that is queued (including transcription jobs still waiting in
+the fair-share lists) records how much audio it covers in a per-stage Redis
+hash, and the job removes its entry when it ends. Estimated work is that
+audio multiplied by the job's real-time factor (seconds of work per second of
+audio), learned from finished jobs as an EWMA.
+
+The API's ``/metrics`` reads the hashes at scrape time, so an autoscaler can
+size workers on ``corin_queue_backlog_seconds`` instead of job counts.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+
+import redis
+from prometheus_client.core import GaugeMetricFamily
+from rq import Queue
+from rq.job import Job
+
+_BACKLOG_KEY = "corin:backlog:{stage}"
+_RTF_KEY = "corin:backlog:rtf"
+_DEFAULT_RTF = 0.1
+_RTF_ALPHA = 0.1
+# Entries of jobs whose work horse was killed are never settled; they are
+# dropped once they are this old so the signal cannot stay up forever.
+_STALE_AFTER_S = 24 * 3600
+# Uploads are queued before their duration is known; estimate it from the
+# size at a typical compressed bitrate (128 kbit/s = 16 bytes per ms).
+_UPLOAD_BYTES_PER_MS = 16
+
+
+def _key(stage: str) -> str:
+    return _BACKLOG_KEY.format(stage=stage)
+
+
+def _stage_of(queue: Queue) -> str:
+    return queue.name.removeprefix("corin-")
+
+
+def audio_ms_from_size(size_bytes: int | None) -> int:
+    return (size_bytes or 0) // _UPLOAD_BYTES_PER_MS
+
+
+def track_backlog(queue: Queue, units: list[tuple[str, int]]) -> list[dict]:
+    """Record ``(function path, audio ms)`` units of work on the queue's
+    stage; returns the job ``meta`` for each unit."""
+    if not units:
+        return []
+    stage = _stage_of(queue)
+    now = int(time.time())
+    metas: list[dict] = []
+    entries: dict[str, str] = {}
+    for func, audio_ms in units:
+        unit = uuid.uuid4().hex
+        audio_ms = max(int(audio_ms or 0), 0)
+        entries[unit] = f"{func}|{audio_ms}|{now}"
+        metas.append({"backlog": [stage, unit, audio_ms]})
+    try:
+        queue.connection.hset(_key(stage), mapping=entries)
+    except redis.RedisError:
+        # The backlog is a scaling signal; it never blocks an enqueue.
+        return [{} for _ in units]
+    return metas
+
+
+def settle_backlog(job: Job, elapsed_s: float) -> None:
+    """Remove the job's backlog entry and fold its run time into the
+    real-time factor of its function."""
+    entry = job.meta.get("backlog")
+    if not entry:
+        return
+    stage, unit, audio_ms = entry
+    connection = job.connection
+    try:
+        connection.hdel(_key(stage), unit)
+        if audio_ms > 0 and elapsed_s > 0:
+            sample = elapsed_s / (audio_ms / 1000)
+            raw = connection.hget(_RTF_KEY, job.func_name)
+            rtf = sample if raw is None else (
+                _RTF_ALPHA * sample + (1 - _RTF_ALPHA) * float(raw)
+            )
+            connection.hset(_RTF_KEY, job.func_name, rtf)
+    except redis.RedisError:
+        pass
+
+
+def backlog_snapshot(
+    connection: redis.Redis, stages: tuple[str, ...]
+) -> dict[str, dict[str, float]]:
+    """Per stage: queued units, audio seconds and estimated work seconds."""
+    now = time.time()
+    rtf = {
+        func.decode(): float(value)
+        for func, value in connection.hgetall(_RTF_KEY).items()
+    }
+    snapshot: dict[str, dict[str, float]] = {}
+    for stage in stages:
+        jobs = 0
+        audio_s = 0.0
+        work_s = 0.0
+        stale: list[bytes] = []
+        for unit, raw in connection.hgetall(_key(stage)).items():
+            func, ms, queued_at = raw.decode().rsplit("|", 2)
+            if now - int(queued_at) > _STALE_AFTER_S:
+                stale.append(unit)
+                continue
+            jobs += 1
+            audio_s += int(ms) / 1000
+            work_s += int(ms) / 1000 * rtf.get(func, _DEFAULT_RTF)
+        if stale:
+            connection.hdel(_key(stage), *stale)
+        snapshot[stage] = {"jobs": jobs, "audio_s": audio_s, "work_s": work_s}
+    return snapshot
+
+
+class BacklogCollector:
+    """Prometheus collector that reads the backlog at scrape time."""
+
+    def __init__(self, connection: redis.Redis, stages: tuple[str, ...]) -> None:
+        self.connection = connection
+        self.stages = stages
+
+    def _families(self) -> tuple[GaugeMetricFamily, ...]:
+        work = GaugeMetricFamily(
+            "corin_queue_backlog_seconds",
+            "Estimated seconds of work queued per stage",
+            labels=["stage"],
+        )
+        audio = GaugeMetricFamily(
+            "corin_queue_backlog_audio_seconds",
+            "Seconds of audio covered by queued work per stage",
+            labels=["stage"],
+        )
+        jobs = GaugeMetricFamily(
+            "corin_queue_backlog_jobs",
+            "Queued units of work per stage, including fair-share waiting jobs",
+            labels=["stage"],
+        )
+        return work, audio, jobs
+
+    def describe(self):
+        # Lets the collector register without a Redis round trip.
+        return list(self._families())
+
+    def collect(self):
+        work, audio, jobs = self._families()
+        try:
+            snapshot = backlog_snapshot(self.connection, self.stages)
+        except redis.RedisError:
+            return []
+        for stage, values in snapshot.items():
+            work.add_metric([stage], values["work_s"])
+            audio.add_metric([stage], values["audio_s"])
+            jobs.add_metric([stage], values["jobs"])
+        return [work, audio, jobs]
@@ -0,0 +1,74 @@
+"""Durable per-stage progress for the processing pipeline.
+
+Each long stage records the units of work it has finished in a
+``pipeline_checkpoints`` row, keyed by meeting and stage and tagged with a
+hash of the stage's input. A re-run after a crash picks up the state and
+skips what is already done; a different input (a new upload) starts the
+stage from scratch.
+
+Checkpoint writes are not committed here. Callers commit them together with
+the work they describe, so a checkpoint never claims more than is durable.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import uuid
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.models import PipelineCheckpoint
+
+INGEST_STAGE = "ingest"
+VAD_STAGE = "vad"
+
+
+def input_hash(*inputs: object) -> str:
+    digest = hashlib.sha256()
+    for value in inputs:
+        digest.update(str(value).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_checkpoint(
+    session, meeting_uuid: uuid.UUID, stage: str, inputs_hash: str
+) -> PipelineCheckpoint | None:
+    """The stage's checkpoint, or None when there is none for this input."""
+    checkpoint = session.execute(
+        select(PipelineCheckpoint).where(
+            PipelineCheckpoint.meeting_id == meeting_uuid,
+            PipelineCheckpoint.stage == stage,
+        )
+    ).scalar_one_or_none()
+    if checkpoint is None or checkpoint.input_hash != inputs_hash:
+        return None
+    return checkpoint
+
+
+def save_checkpoint(
+    session,
+    meeting_uuid: uuid.UUID,
+    stage: str,
+    inputs_hash: str,
+    state: dict[str, Any],
+    completed: bool = False,
+) -> None:
+    """Replace the stage's checkpoint; the caller commits."""
+    values = {
+        "input_hash": inputs_hash,
+        "state_json": state,
+        "completed_at": func.now() if completed else None,
+        "updated_at": func.now(),
+    }
+    stmt = pg_insert(PipelineCheckpoint).values(
+        id=uuid.uuid4(), meeting_id=meeting_uuid, stage=stage, **values
+    )
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[PipelineCheckpoint.meeting_id, PipelineCheckpoint.stage],
+            set_=values,
+        )
+    )
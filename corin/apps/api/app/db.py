@@ -1,17 +1,126 @@
+import os
+import time
 from collections.abc import Generator
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+from app.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUTS,
+    DB_POOL_SIZE,
+    DB_POOL_WAIT_SECONDS,
+)
 from app.models import Base
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+
+class InstrumentedQueuePool(QueuePool):
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
+            self._update_gauges()
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        # Set as the pool changes rather than read by a callback at scrape
+        # time, so worker job processes export them in multiprocess mode.
+        DB_POOL_CHECKED_OUT.set(self.checkedout())
+        DB_POOL_SIZE.set(self.checkedin() + self.checkedout())
+
+
+def _connect_args(settings: Settings) -> dict:
+    connect_args: dict = {}
+    if settings.db_pgbouncer:
+        # PgBouncer in transaction mode hands each transaction a different
+        # server connection, so server-side prepared statements cannot be
+        # reused and startup options are rejected; the statement timeout is
+        # set per transaction instead (``_set_local_statement_timeout``).
+        connect_args["prepare_threshold"] = None
+    elif settings.db_statement_timeout_ms:
+        connect_args["options"] = (
+            f"-c statement_timeout={settings.db_statement_timeout_ms}"
+        )
+    return connect_args
+
+
+def _set_local_statement_timeout(timeout_ms: int):
+    def on_begin(conn) -> None:
+        # Run on the DBAPI cursor: it opens the transaction, and executing
+        # through ``conn`` here would begin it again.
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+        finally:
+            cursor.close()
+
+    return on_begin
+
+
+def build_engine(settings: Settings) -> Engine:
+    built = create_engine(
+        settings.database_url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_s,
+        pool_recycle=settings.db_pool_recycle_s,
+        pool_pre_ping=True,
+        connect_args=_connect_args(settings),
+    )
+    if settings.db_pgbouncer and settings.db_statement_timeout_ms:
+        timeout_ms = settings.db_statement_timeout_ms
+        event.listen(built, "begin", _set_local_statement_timeout(timeout_ms))
+    event.listen(built, "checkout", lambda *_: DB_POOL_CHECKOUTS.inc())
+    return built
+
+
+engine = build_engine(settings)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 
+def _dispose_inherited_pool() -> None:
+    # RQ runs each job in a forked work horse; connections inherited from the
+    # parent must not be reused (or closed) by the child.
+    engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_inherited_pool)
+
+
+# create_all() only creates missing tables; columns and indexes added to
+# existing tables are applied here so older databases keep working.
+_SCHEMA_PATCHES = (
+    "ALTER TABLE transcript_segments ADD COLUMN IF NOT EXISTS vad_segment_id UUID "
+    "REFERENCES vad_segments(id)",
+    "ALTER TABLE transcript_segments ADD COLUMN IF NOT EXISTS part_start_ms INTEGER",
+    "ALTER TABLE transcript_segments ADD COLUMN IF NOT EXISTS part_seq INTEGER",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_transcript_segments_part "
+    "ON transcript_segments (meeting_id, vad_segment_id, part_start_ms, part_seq)",
+    "ALTER TABLE transcript_revisions ADD COLUMN IF NOT EXISTS kind VARCHAR(16) "
+    "NOT NULL DEFAULT 'snapshot'",
+    "ALTER TABLE transcript_revisions ADD COLUMN IF NOT EXISTS base_revision_no INTEGER",
+    "ALTER TABLE transcript_revisions ADD COLUMN IF NOT EXISTS delta_json JSONB",
+    "ALTER TABLE transcript_revisions ALTER COLUMN snapshot_json DROP NOT NULL",
+    "CREATE INDEX IF NOT EXISTS ix_transcript_revisions_meeting_rev "
+    "ON transcript_revisions (meeting_id, revision_no)",
+    "ALTER TABLE media_assets ADD COLUMN IF NOT EXISTS vad_object_key VARCHAR(512)",
+    "ALTER TABLE media_assets ADD COLUMN IF NOT EXISTS peaks_object_key VARCHAR(512)",
+    "ALTER TABLE media_assets ADD COLUMN IF NOT EXISTS hls_object_key VARCHAR(512)",
+    "ALTER TABLE media_assets ADD COLUMN IF NOT EXISTS archive_object_key VARCHAR(512)",
+)
+
+
 def get_session() -> Generator[Session, None, None]:
     session = SessionLocal()
     try:
@@ -24,3 +133,5 @@ def init_db() -> None:
     with engine.begin() as conn:
         conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         Base.metadata.create_all(bind=conn)
+        for statement in _SCHEMA_PATCHES:
+            conn.execute(text(statement))
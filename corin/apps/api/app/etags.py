@@ -0,0 +1,81 @@
+"""Conditional GET for meeting payloads.
+
+A meeting's ETag is a hash of what changes its detail: ``Meeting.updated_at``,
+the latest transcript revision and summary, and the number of transcript
+segments (transcription jobs add segments without touching the meeting
+row). Writes that change anything else the detail shows (media assets,
+speaker names, share links) call ``touch_meeting``. The fingerprint is one
+indexed query, so a poll that comes back ``304`` never loads the segments.
+
+The detail embeds presigned URLs, so the ETag also moves every
+``_URL_BUCKET_S``; a cached copy is never served with expired URLs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+import uuid
+
+from fastapi import Request
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Meeting, Summary, TranscriptRevision, TranscriptSegment
+
+# Half the lifetime of the presigned URLs in the detail (``presigned_get``).
+_URL_BUCKET_S = 1800
+
+
+def meeting_etag(
+    session: Session, meeting_uuid: uuid.UUID, *variant: object
+) -> str | None:
+    """Strong ETag of the meeting's detail, or None if the meeting does not
+    exist or was deleted. ``variant`` distinguishes representations of the
+    same meeting (e.g. the transcript format)."""
+    latest_revision = (
+        select(func.max(TranscriptRevision.revision_no))
+        .where(TranscriptRevision.meeting_id == meeting_uuid)
+        .scalar_subquery()
+    )
+    latest_summary = (
+        select(Summary.id)
+        .where(Summary.meeting_id == meeting_uuid)
+        # Summaries can share a timestamp; the id keeps the pick stable.
+        .order_by(Summary.created_at.desc(), Summary.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    segment_count = (
+        select(func.count())
+        .select_from(TranscriptSegment)
+        .where(TranscriptSegment.meeting_id == meeting_uuid)
+        .scalar_subquery()
+    )
+    row = session.execute(
+        select(
+            Meeting.updated_at, latest_revision, latest_summary, segment_count
+        ).where(Meeting.id == meeting_uuid, Meeting.deleted_at.is_(None))
+    ).first()
+    if row is None:
+        return None
+    url_bucket = int(time.time()) // _URL_BUCKET_S
+    fingerprint = "\0".join(str(value) for value in (*row, url_bucket, *variant))
+    return f'"{hashlib.sha256(fingerprint.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's ``If-None-Match`` names ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def touch_meeting(session: Session, meeting_uuid: uuid.UUID) -> None:
+    """Move the meeting's ETag for a change outside the meeting row. Not
+    committed."""
+    session.execute(
+        update(Meeting).where(Meeting.id == meeting_uuid).values(updated_at=func.now())
+    )
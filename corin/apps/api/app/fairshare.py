@@ -0,0 +1,106 @@
+"""Round-robin admission of transcription jobs across meetings.
+
+Transcription jobs are not put on the RQ queue when they are created. Each
+meeting keeps its pending jobs in its own Redis list, and a ring of meetings
+with pending work decides whose job goes next. ``refill_fair`` moves jobs
+from the ring to the transcribe queue only while that queue holds fewer than
+``TRANSCRIBE_QUEUE_DEPTH`` jobs. A meeting with 1500 clips therefore gets one
+slot per turn like everyone else, and a short meeting uploaded behind it
+starts transcribing after a handful of jobs instead of after the whole
+backlog.
+
+The queue is refilled whenever jobs are submitted and whenever a
+transcription job ends, so there is no separate scheduler process.
+"""
+
+from __future__ import annotations
+
+import json
+
+import redis
+from rq import Queue
+
+_RING_KEY = "corin:fair:meetings"
+_JOBS_PREFIX = "corin:fair:jobs:"
+
+# Append the job specs and put the meeting on the ring unless it is already
+# there. New meetings join at the tail, which is the next turn.
+_PUSH_SCRIPT = """
+redis.call('RPUSH', KEYS[2], unpack(ARGV, 2))
+if not redis.call('LPOS', KEYS[1], ARGV[1]) then
+  redis.call('RPUSH', KEYS[1], ARGV[1])
+end
+return redis.call('LLEN', KEYS[2])
+"""
+
+# Take up to ARGV[2] jobs, one per meeting per turn. The ring is rotated with
+# RPOPLPUSH; a meeting whose list runs empty leaves the ring.
+_POP_SCRIPT = """
+local taken = {}
+local count = tonumber(ARGV[2])
+while #taken < count do
+  local meeting = redis.call('RPOPLPUSH', KEYS[1], KEYS[1])
+  if not meeting then
+    break
+  end
+  local jobs = ARGV[1] .. meeting
+  local job = redis.call('LPOP', jobs)
+  if job then
+    taken[#taken + 1] = job
+  end
+  if redis.call('LLEN', jobs) == 0 then
+    redis.call('LREM', KEYS[1], 0, meeting)
+  end
+end
+return taken
+"""
+
+
+def submit_fair(
+    connection: redis.Redis,
+    meeting_id: str,
+    jobs: list[tuple[str, tuple, dict]],
+) -> None:
+    """Add ``(function path, args, job meta)`` jobs to the meeting's pending
+    list."""
+    if not jobs:
+        return
+    specs = [
+        json.dumps({"func": func, "args": list(args), "meta": meta})
+        for func, args, meta in jobs
+    ]
+    connection.eval(
+        _PUSH_SCRIPT, 2, _RING_KEY, _JOBS_PREFIX + meeting_id, meeting_id, *specs
+    )
+
+
+def take_fair(connection: redis.Redis, count: int) -> list[tuple[str, list, dict]]:
+    if count <= 0:
+        return []
+    specs = connection.eval(_POP_SCRIPT, 1, _RING_KEY, _JOBS_PREFIX, count)
+    return [
+        (spec["func"], spec["args"], spec.get("meta") or {})
+        for spec in map(json.loads, specs)
+    ]
+
+
+def refill_fair(queue: Queue, depth: int) -> int:
+    """Top ``queue`` up to ``depth`` waiting jobs; returns how many were moved.
+
+    Concurrent refills can overshoot the depth by a few jobs, which only
+    weakens fairness momentarily.
+    """
+    jobs = take_fair(queue.connection, depth - queue.count)
+    if jobs:
+        queue.enqueue_many(
+            [Queue.prepare_data(func, args, meta=meta) for func, args, meta in jobs]
+        )
+    return len(jobs)
+
+
+def clear_fair(connection: redis.Redis, meeting_id: str) -> None:
+    """Drop the meeting's pending jobs, e.g. before re-running its VAD."""
+    pipe = connection.pipeline(transaction=True)
+    pipe.delete(_JOBS_PREFIX + meeting_id)
+    pipe.lrem(_RING_KEY, 0, meeting_id)
+    pipe.execute()
@@ -0,0 +1,80 @@
+"""Completion tracking for fan-out stages.
+
+A stage that splits work into many jobs registers one member per job in a
+Redis set. Each job removes its member when it succeeds; the job that empties
+the set starts the next stage. This replaces a ``depends_on`` list of
+hundreds of jobs, and re-running a finished job cannot trigger the next stage
+twice.
+
+A group belongs to the run that started it. Starting it again for the same
+run, e.g. when a live stream reconnects, keeps the members that are still
+pending instead of re-creating the set, so members that already completed
+are not waited for again.
+"""
+
+from __future__ import annotations
+
+import redis
+
+# Transcription jobs of a meeting; the group's last job queues consolidation.
+TRANSCRIBE_STAGE = "transcribe"
+
+_KEY = "corin:fanout:{meeting_id}:{stage}"
+_TTL_S = 7 * 24 * 3600
+
+# KEYS: group set, run key. ARGV: run id, TTL, members. Replace the group
+# unless this run started it; returns 1 when it was (re)created.
+_START_SCRIPT = """
+if redis.call('GET', KEYS[2]) == ARGV[1] then
+  return 0
+end
+redis.call('DEL', KEYS[1])
+if #ARGV > 2 then
+  redis.call('SADD', KEYS[1], unpack(ARGV, 3))
+  redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+
+def _key(meeting_id: str, stage: str) -> str:
+    return _KEY.format(meeting_id=meeting_id, stage=stage)
+
+
+def start_fanout(
+    connection: redis.Redis,
+    meeting_id: str,
+    stage: str,
+    members: list[str],
+    run_id: str,
+) -> bool:
+    """Replace any group left by another run with ``members``. Returns False,
+    leaving the group as it is, if ``run_id`` already started it."""
+    key = _key(meeting_id, stage)
+    started = connection.eval(
+        _START_SCRIPT, 2, key, f"{key}:run", run_id, _TTL_S, *members
+    )
+    return bool(started)
+
+
+def add_fanout_members(
+    connection: redis.Redis, meeting_id: str, stage: str, members: list[str]
+) -> None:
+    key = _key(meeting_id, stage)
+    pipe = connection.pipeline()
+    pipe.sadd(key, *members)
+    pipe.expire(key, _TTL_S)
+    pipe.expire(f"{key}:run", _TTL_S)
+    pipe.execute()
+
+
+def complete_fanout_member(
+    connection: redis.Redis, meeting_id: str, stage: str, member: str
+) -> bool:
+    """Remove ``member``; True only for the call that emptied the group."""
+    pipe = connection.pipeline(transaction=True)
+    pipe.srem(_key(meeting_id, stage), member)
+    pipe.scard(_key(meeting_id, stage))
+    removed, remaining = pipe.execute()
+    return bool(removed) and remaining == 0
@@ -0,0 +1,80 @@
+"""Segmented (HLS, fMP4) playback of the playable audio.
+
+Ingest stream-copies the playable M4A into ~6 s segments, so a seek costs
+one small segment fetch instead of byte-range requests into a multi-hour
+file. The bucket is private, so the stored playlist keeps relative segment
+names and the API rewrites them to presigned URLs when it is requested.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from app.storage import upload_fileobj
+
+PLAYLIST_NAME = "index.m3u8"
+PLAYLIST_CONTENT_TYPE = "application/vnd.apple.mpegurl"
+_UPLOAD_WORKERS = 8
+_MAP_URI = re.compile(r'(#EXT-X-MAP:.*URI=")([^"]+)(")')
+
+
+def _upload_file(path: str, object_key: str, content_type: str) -> None:
+    with open(path, "rb") as fh:
+        upload_fileobj(object_key, fh, content_type)
+
+
+def upload_hls(directory: str, prefix: str) -> str:
+    """Upload a segmented output under ``prefix``; returns the playlist key.
+
+    Segments go up in parallel and the playlist last, so a published
+    playlist never points at a missing segment.
+    """
+    names = sorted(name for name in os.listdir(directory) if name != PLAYLIST_NAME)
+    with ThreadPoolExecutor(max_workers=_UPLOAD_WORKERS) as executor:
+        for future in [
+            executor.submit(
+                _upload_file,
+                os.path.join(directory, name),
+                prefix + name,
+                "audio/mp4",
+            )
+            for name in names
+        ]:
+            future.result()
+    _upload_file(
+        os.path.join(directory, PLAYLIST_NAME),
+        prefix + PLAYLIST_NAME,
+        PLAYLIST_CONTENT_TYPE,
+    )
+    return prefix + PLAYLIST_NAME
+
+
+def rewrite_playlist(
+    playlist: str, prefix: str, sign: Callable[[list[str]], list[str]]
+) -> str:
+    """Replace relative URIs (segments and the init map) with the URLs
+    ``sign`` returns for ``prefix + name``; all keys are signed in one call."""
+    lines = playlist.splitlines()
+    names: list[str] = []
+    for line in lines:
+        match = _MAP_URI.search(line)
+        if match:
+            names.append(match.group(2))
+        elif line.strip() and not line.startswith("#"):
+            names.append(line.strip())
+    urls = iter(sign([prefix + name for name in names]))
+
+    rewritten: list[str] = []
+    for line in lines:
+        if _MAP_URI.search(line):
+            url = next(urls)
+            line = _MAP_URI.sub(
+                lambda match: match.group(1) + url + match.group(3), line
+            )
+        elif line.strip() and not line.startswith("#"):
+            line = next(urls)
+        rewritten.append(line)
+    return "\n".join(rewritten) + "\n"
@@ -0,0 +1,210 @@
+"""Lifecycle of a meeting's stored audio.
+
+Two kinds of objects are only needed while a meeting is being processed:
+
+- the ``clips/{id}/*.wav`` cut per VAD segment, each read once by its
+  transcription job;
+- the 48 kHz normalized WAV (~350 MB per hour), read by VAD.
+
+Once a meeting is consolidated its clips are deleted and the normalized WAV
+is replaced by a lossless FLAC copy at ``archive/{id}/{asset id}.flac``. A
+later VAD run rehydrates it with ``fetch_normalized``. The 16 kHz VAD track,
+the playable audio and the peaks stay as they are: the player and citation
+clips read them.
+
+Soft-deleted meetings are purged, objects and rows, once they have been
+deleted for ``DELETED_MEETING_RETENTION_DAYS``.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.audio import decode_flac, encode_flac
+from app.etags import touch_meeting
+from app.models import (
+    MediaAsset,
+    Meeting,
+    PipelineCheckpoint,
+    PipelineTiming,
+    SegmentEmbedding,
+    ShareLink,
+    SpeakerLabel,
+    Summary,
+    TranscriptRevision,
+    TranscriptSegment,
+    VadSegment,
+)
+from app.storage import delete_objects, download_file, list_object_keys, upload_fileobj
+from app.timing import timed_stage
+
+ARCHIVE_PREFIX = "archive/"
+# Every object of a meeting is stored under one of these plus its id.
+_MEETING_PREFIXES = ("original/", "normalized/", "playable/", "clips/", ARCHIVE_PREFIX)
+# Tables holding a meeting's rows, ordered so foreign keys hold while deleting.
+_MEETING_TABLES = (
+    SegmentEmbedding,
+    TranscriptSegment,
+    VadSegment,
+    TranscriptRevision,
+    Summary,
+    ShareLink,
+    SpeakerLabel,
+    PipelineTiming,
+    PipelineCheckpoint,
+    MediaAsset,
+)
+
+
+def intermediate_objects(session: Session, meeting_uuid: uuid.UUID) -> list[str]:
+    """Keys of the meeting's clips and unarchived normalized audio."""
+    keys = list(
+        session.execute(
+            select(VadSegment.clip_object_key).where(
+                VadSegment.meeting_id == meeting_uuid,
+                VadSegment.clip_object_key.is_not(None),
+            )
+        ).scalars()
+    )
+    for asset in session.execute(
+        select(MediaAsset).where(MediaAsset.meeting_id == meeting_uuid)
+    ).scalars():
+        if asset.normalized_object_key and not asset.archive_object_key:
+            keys.append(asset.normalized_object_key)
+    return keys
+
+
+def meetings_with_intermediates(session: Session) -> list[uuid.UUID]:
+    """Finished meetings that still hold clips or an unarchived normalized
+    WAV, e.g. ones processed before this lifecycle existed."""
+    has_clips = (
+        select(VadSegment.id)
+        .where(
+            VadSegment.meeting_id == Meeting.id,
+            VadSegment.clip_object_key.is_not(None),
+        )
+        .exists()
+    )
+    has_wav = (
+        select(MediaAsset.id)
+        .where(
+            MediaAsset.meeting_id == Meeting.id,
+            MediaAsset.normalized_object_key.is_not(None),
+            MediaAsset.archive_object_key.is_(None),
+        )
+        .exists()
+    )
+    return list(
+        session.execute(
+            select(Meeting.id).where(
+                Meeting.status == "done",
+                Meeting.deleted_at.is_(None),
+                or_(has_clips, has_wav),
+            )
+        ).scalars()
+    )
+
+
+def collect_clips(session: Session, meeting_uuid: uuid.UUID) -> int:
+    """Delete the meeting's VAD clips and clear their keys; returns how many
+    were deleted. Not committed."""
+    keys = list(
+        session.execute(
+            select(VadSegment.clip_object_key).where(
+                VadSegment.meeting_id == meeting_uuid,
+                VadSegment.clip_object_key.is_not(None),
+            )
+        ).scalars()
+    )
+    if not keys:
+        return 0
+    with timed_stage("storage"):
+        delete_objects(keys)
+    session.execute(
+        update(VadSegment)
+        .where(VadSegment.meeting_id == meeting_uuid)
+        .values(clip_object_key=None)
+    )
+    return len(keys)
+
+
+def archive_normalized(session: Session, asset: MediaAsset) -> bool:
+    """Replace the asset's normalized WAV with a FLAC archive; returns False
+    if there was nothing to archive. Commits."""
+    if not asset.normalized_object_key or asset.archive_object_key:
+        return False
+    # Keyed by asset: a meeting may hold several, each with its own archive.
+    archive_key = f"{ARCHIVE_PREFIX}{asset.meeting_id}/{asset.id}.flac"
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wav_path = os.path.join(tmpdir, "normalized.wav")
+        flac_path = os.path.join(tmpdir, "normalized.flac")
+        with timed_stage("download"):
+            download_file(asset.normalized_object_key, wav_path)
+        with timed_stage("ffmpeg"):
+            encode_flac(wav_path, flac_path)
+        with timed_stage("upload"):
+            with open(flac_path, "rb") as fh:
+                upload_fileobj(archive_key, fh, "audio/flac")
+    asset.archive_object_key = archive_key
+    touch_meeting(session, asset.meeting_id)
+    with timed_stage("db"):
+        session.commit()
+    # The WAV goes only after the archive is recorded, so a crash in between
+    # leaves both copies rather than neither.
+    with timed_stage("storage"):
+        delete_objects([asset.normalized_object_key])
+    return True
+
+
+def fetch_normalized(asset: MediaAsset, target_path: str) -> None:
+    """Download the normalized WAV, decoding it from the FLAC archive when
+    it has been archived."""
+    if not asset.archive_object_key:
+        with timed_stage("download"):
+            download_file(asset.normalized_object_key, target_path)
+        return
+    flac_path = f"{target_path}.flac"
+    with timed_stage("download"):
+        download_file(asset.archive_object_key, flac_path)
+    with timed_stage("ffmpeg"):
+        decode_flac(flac_path, target_path)
+    os.remove(flac_path)
+
+
+def purgeable_meetings(session: Session, retention_days: int) -> list[uuid.UUID]:
+    """Meetings soft-deleted more than ``retention_days`` ago."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    return list(
+        session.execute(
+            select(Meeting.id).where(
+                Meeting.deleted_at.is_not(None), Meeting.deleted_at < cutoff
+            )
+        ).scalars()
+    )
+
+
+def purge_meeting(session: Session, meeting_uuid: uuid.UUID) -> int:
+    """Delete every object and row of a meeting; returns how many objects
+    were deleted. Commits."""
+    keys = [
+        key
+        for prefix in _MEETING_PREFIXES
+        for key in list_object_keys(f"{prefix}{meeting_uuid}/")
+    ]
+    delete_objects(keys)
+    delete_meeting_rows(session, meeting_uuid)
+    session.commit()
+    return len(keys)
+
+
+def delete_meeting_rows(session: Session, meeting_uuid: uuid.UUID) -> None:
+    """Delete the meeting and every row that references it. Not committed."""
+    for model in _MEETING_TABLES:
+        session.execute(delete(model).where(model.meeting_id == meeting_uuid))
+    session.execute(delete(Meeting).where(Meeting.id == meeting_uuid))
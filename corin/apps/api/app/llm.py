@@ -3,11 +3,14 @@ from __future__ import annotations
 import json
 import os
 import re
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 
-from openai import OpenAI
+import httpx
+from openai import DefaultHttpxClient, OpenAI
 
-from app.audio import probe_duration_ms
+from app.audio import AudioSource, media_duration_ms
 from app.config import get_settings
 
 
@@ -30,42 +33,98 @@ class TranscriptionUsage:
 class TranscriptionResult:
     segments: list[TranscriptionSegment]
     usage: TranscriptionUsage | None = None
+    provider: str | None = None
 
 
-def get_client() -> OpenAI:
+_client: OpenAI | None = None
+_client_lock = threading.Lock()
+
+
+def _client_options() -> dict:
     settings = get_settings()
     if not settings.openai_api_key:
         raise RuntimeError("OPENAI_API_KEY is not set")
-    return OpenAI(api_key=settings.openai_api_key)
+    return {
+        "api_key": settings.openai_api_key,
+        "base_url": settings.openai_base_url or None,
+        "max_retries": settings.openai_max_retries,
+        "timeout": httpx.Timeout(
+            settings.openai_timeout_s, connect=settings.openai_connect_timeout_s
+        ),
+    }
 
 
-def transcribe_audio(file_path: str) -> list[TranscriptionSegment]:
-    settings = get_settings()
-    provider = settings.stt_provider
-    if provider == "openai_4o":
-        result = _transcribe_openai_4o(file_path)
-        return result.segments
-    elif provider == "whisper":
-        result = _transcribe_whisper(file_path)
-        return result.segments
-    else:
-        result = _transcribe_openai_4o(file_path)
-        return result.segments
-
-
-def transcribe_audio_with_usage(file_path: str) -> TranscriptionResult:
+def _http_limits() -> httpx.Limits:
     settings = get_settings()
-    provider = settings.stt_provider
-    if provider == "openai_4o":
-        return _transcribe_openai_4o(file_path)
-    elif provider == "whisper":
-        return _transcribe_whisper(file_path)
-    else:
-        return _transcribe_openai_4o(file_path)
+    return httpx.Limits(
+        max_connections=settings.openai_max_connections,
+        max_keepalive_connections=settings.openai_max_keepalive_connections,
+        keepalive_expiry=settings.openai_keepalive_expiry_s,
+    )
+
+
+def get_client() -> OpenAI:
+    """Process-wide client, so calls share one keep-alive connection pool
+    instead of paying a new TLS handshake each time."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(
+                    **_client_options(),
+                    http_client=DefaultHttpxClient(limits=_http_limits()),
+                )
+    return _client
+
+
+def _reset_inherited_clients() -> None:
+    # Sockets inherited from the parent belong to its pool; the child drops
+    # them without closing and builds its own client on first use.
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_inherited_clients)
+
+
+def transcribe_audio(file_path: AudioSource) -> list[TranscriptionSegment]:
+    return transcribe_audio_with_usage(file_path).segments
+
+
+def transcribe_audio_with_usage(file_path: AudioSource) -> TranscriptionResult:
+    """Transcribe a WAV path or in-memory part through the provider registry
+    (``app.stt``): the configured ``stt_provider`` first, with hedging and
+    fallback."""
+    from app.stt import get_stt_router
+
+    return get_stt_router().transcribe(file_path)
+
+
+def transcribe_batch_with_usage(
+    file_paths: list[AudioSource],
+) -> list[TranscriptionResult]:
+    """Transcribe several clips. Providers with a batch entry point (local)
+    decode them together; others are called once per clip."""
+    from app.stt import get_stt_router
+
+    return get_stt_router().transcribe_batch(file_paths)
+
+
+def _get_file_size(file_path: AudioSource) -> int:
+    if isinstance(file_path, str):
+        return os.path.getsize(file_path)
+    return len(file_path.getbuffer())
 
 
-def _get_file_size(file_path: str) -> int:
-    return os.path.getsize(file_path)
+@contextmanager
+def _open_audio(file_path: AudioSource):
+    if isinstance(file_path, str):
+        with open(file_path, "rb") as audio_file:
+            yield audio_file
+        return
+    file_path.seek(0)
+    yield file_path
 
 
 def _extract_usage(response) -> TranscriptionUsage | None:
@@ -99,7 +158,7 @@ def _normalize_speaker(speaker: str | None) -> str | None:
     return speaker
 
 
-def _transcribe_openai_4o(file_path: str) -> TranscriptionResult:
+def _transcribe_openai_4o(file_path: AudioSource) -> TranscriptionResult:
     settings = get_settings()
     client = get_client()
     file_size = _get_file_size(file_path)
@@ -124,7 +183,7 @@ def _transcribe_openai_4o(file_path: str) -> TranscriptionResult:
     if settings.stt_language:
         request_args["language"] = settings.stt_language
 
-    with open(file_path, "rb") as audio_file:
+    with _open_audio(file_path) as audio_file:
         response = client.audio.transcriptions.create(
             file=audio_file,
             **request_args,
@@ -161,7 +220,7 @@ def _transcribe_openai_4o(file_path: str) -> TranscriptionResult:
         text = getattr(response, "text", None)
         if text is None and isinstance(response_dict, dict):
             text = response_dict.get("text")
-        duration_ms = probe_duration_ms(file_path) or 0
+        duration_ms = media_duration_ms(file_path) or 0
         segments = [
             TranscriptionSegment(
                 start_ms=0, end_ms=duration_ms, text=text or "", speaker=None
@@ -172,10 +231,10 @@ def _transcribe_openai_4o(file_path: str) -> TranscriptionResult:
     return TranscriptionResult(segments=segments, usage=usage)
 
 
-def _transcribe_whisper(file_path: str) -> TranscriptionResult:
+def _transcribe_whisper(file_path: AudioSource) -> TranscriptionResult:
     settings = get_settings()
     client = get_client()
-    with open(file_path, "rb") as audio_file:
+    with _open_audio(file_path) as audio_file:
         response = client.audio.transcriptions.create(
             file=audio_file,
             model=settings.openai_stt_model,
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+DB_POOL_CHECKOUTS = Counter(
+    "corin_db_pool_checkouts",
+    "Connections checked out of the SQLAlchemy pool",
+)
+DB_POOL_WAIT_SECONDS = Histogram(
+    "corin_db_pool_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "corin_db_pool_checked_out",
+    "Database connections currently checked out",
+    multiprocess_mode="livesum",
+)
+DB_POOL_SIZE = Gauge(
+    "corin_db_pool_size",
+    "Connections currently held by the pool, including overflow",
+    multiprocess_mode="livesum",
+)
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "corin_pipeline_stage_seconds",
+    "Duration of pipeline job stages",
+    ["job", "stage"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0),
+)
+
+STT_REQUEST_SECONDS = Histogram(
+    "corin_stt_request_seconds",
+    "Latency of STT provider calls",
+    ["provider", "outcome"],
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0),
+)
+STT_HEDGES = Counter(
+    "corin_stt_hedges",
+    "Hedged STT requests sent because the provider exceeded its p95 latency",
+    ["provider"],
+)
+STT_HEDGE_DISCARDED_TOKENS = Counter(
+    "corin_stt_hedge_discarded_tokens",
+    "Tokens used by hedged STT requests that lost the race; not billed to a meeting",
+    ["provider", "kind"],
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
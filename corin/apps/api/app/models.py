@@ -8,6 +8,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     BigInteger,
     Numeric,
@@ -79,6 +80,12 @@ class Meeting(Base):
     speaker_labels: Mapped[list["SpeakerLabel"]] = relationship(
         back_populates="meeting", cascade="all, delete-orphan"
     )
+    pipeline_timings: Mapped[list["PipelineTiming"]] = relationship(
+        back_populates="meeting", cascade="all, delete-orphan"
+    )
+    pipeline_checkpoints: Mapped[list["PipelineCheckpoint"]] = relationship(
+        back_populates="meeting", cascade="all, delete-orphan"
+    )
 
 
 class MediaAsset(Base):
@@ -94,7 +101,12 @@ class MediaAsset(Base):
     normalized_object_key: Mapped[str | None] = mapped_column(
         String(512), nullable=True
     )
+    vad_object_key: Mapped[str | None] = mapped_column(String(512), nullable=True)
     playable_object_key: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    peaks_object_key: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    hls_object_key: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    # Set once the normalized WAV has been replaced by a FLAC copy.
+    archive_object_key: Mapped[str | None] = mapped_column(String(512), nullable=True)
     original_filename: Mapped[str | None] = mapped_column(String(255), nullable=True)
     original_content_type: Mapped[str | None] = mapped_column(
         String(255), nullable=True
@@ -131,6 +143,16 @@ class VadSegment(Base):
 
 class TranscriptSegment(Base):
     __tablename__ = "transcript_segments"
+    __table_args__ = (
+        Index(
+            "uq_transcript_segments_part",
+            "meeting_id",
+            "vad_segment_id",
+            "part_start_ms",
+            "part_seq",
+            unique=True,
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -138,6 +160,11 @@ class TranscriptSegment(Base):
     meeting_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("meetings.id"), index=True
     )
+    vad_segment_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("vad_segments.id"), nullable=True
+    )
+    part_start_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    part_seq: Mapped[int | None] = mapped_column(Integer, nullable=True)
     start_ms: Mapped[int] = mapped_column(Integer)
     end_ms: Mapped[int] = mapped_column(Integer)
     speaker_key: Mapped[str] = mapped_column(String(50), default="spk_1")
@@ -152,6 +179,9 @@ class TranscriptSegment(Base):
 
 class TranscriptRevision(Base):
     __tablename__ = "transcript_revisions"
+    __table_args__ = (
+        Index("ix_transcript_revisions_meeting_rev", "meeting_id", "revision_no"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -160,7 +190,10 @@ class TranscriptRevision(Base):
         UUID(as_uuid=True), ForeignKey("meetings.id"), index=True
     )
     revision_no: Mapped[int] = mapped_column(Integer)
-    snapshot_json: Mapped[dict] = mapped_column(JSONB)
+    kind: Mapped[str] = mapped_column(String(16), default="snapshot")
+    base_revision_no: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    snapshot_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    delta_json: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -240,3 +273,48 @@ class SegmentEmbedding(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+
+
+class PipelineTiming(Base):
+    __tablename__ = "pipeline_timings"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    meeting_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("meetings.id"), index=True
+    )
+    job: Mapped[str] = mapped_column(String(64))
+    rq_job_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    stage: Mapped[str] = mapped_column(String(32))
+    duration_ms: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    meeting: Mapped[Meeting] = relationship(back_populates="pipeline_timings")
+
+
+class PipelineCheckpoint(Base):
+    __tablename__ = "pipeline_checkpoints"
+    __table_args__ = (
+        Index("uq_pipeline_checkpoints_stage", "meeting_id", "stage", unique=True),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    meeting_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("meetings.id")
+    )
+    stage: Mapped[str] = mapped_column(String(32))
+    input_hash: Mapped[str] = mapped_column(String(64))
+    state_json: Mapped[dict] = mapped_column(JSONB, default=dict)
+    completed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    meeting: Mapped[Meeting] = relationship(back_populates="pipeline_checkpoints")
@@ -0,0 +1,128 @@
+"""Multi-resolution waveform peaks for the web player.
+
+Peaks are computed from the normalized 16-bit mono WAV produced by ingest,
+so the browser never has to download and decode the whole recording to draw
+a waveform.
+
+File layout (little-endian)::
+
+    header   "CPK1", version u16, level count u16, sample rate u32,
+             total samples u64
+    levels   per level: samples per peak u32, peak count u32, byte offset u64
+    data     per level: (min i8, max i8) for every peak
+
+Levels are stored coarsest first and the coarsest one has at most
+``MAX_OVERVIEW_PEAKS`` peaks, so the header plus the overview fit in the
+first few kilobytes whatever the recording length; finer levels are fetched
+with Range requests when the user zooms in.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO
+
+import numpy as np
+
+from app.audio import _find_data_chunk, read_wav_info
+
+MAGIC = b"CPK1"
+VERSION = 1
+# 10 ms at 48 kHz; each coarser level merges LEVEL_FACTOR peaks.
+BASE_SAMPLES_PER_PEAK = 480
+LEVEL_FACTOR = 4
+MAX_OVERVIEW_PEAKS = 2048
+
+_HEADER = struct.Struct("<4sHHIQ")
+_LEVEL = struct.Struct("<IIQ")
+# Peaks of this many base windows are computed per read, bounding memory for
+# multi-hour recordings.
+_WINDOWS_PER_READ = 8192
+
+
+@dataclass(frozen=True)
+class PeakLevel:
+    samples_per_peak: int
+    count: int
+    offset: int
+
+
+def _base_peaks(fh: BinaryIO, data_offset: int, data_size: int) -> np.ndarray:
+    """(n, 2) int16 min/max for every BASE_SAMPLES_PER_PEAK samples."""
+    chunks: list[np.ndarray] = []
+    read_bytes = BASE_SAMPLES_PER_PEAK * _WINDOWS_PER_READ * 2
+    fh.seek(data_offset)
+    remaining = data_size
+    while remaining > 0:
+        raw = fh.read(min(read_bytes, remaining))
+        if not raw:
+            break
+        remaining -= len(raw)
+        samples = np.frombuffer(raw[: len(raw) - len(raw) % 2], dtype="<i2")
+        full = len(samples) - len(samples) % BASE_SAMPLES_PER_PEAK
+        windows = samples[:full].reshape(-1, BASE_SAMPLES_PER_PEAK)
+        chunk = np.stack([windows.min(axis=1), windows.max(axis=1)], axis=1)
+        if full < len(samples):
+            tail = samples[full:]
+            chunk = np.concatenate([chunk, [[tail.min(), tail.max()]]])
+        chunks.append(chunk)
+    if not chunks:
+        return np.zeros((0, 2), dtype=np.int16)
+    return np.concatenate(chunks)
+
+
+def _merge(peaks: np.ndarray, factor: int) -> np.ndarray:
+    groups = -(-len(peaks) // factor)
+    padded = np.empty((groups * factor, 2), dtype=peaks.dtype)
+    padded[: len(peaks)] = peaks
+    # Padding repeats the last peak so it cannot widen the final group.
+    padded[len(peaks) :] = peaks[-1]
+    grouped = padded.reshape(groups, factor, 2)
+    return np.stack(
+        [grouped[:, :, 0].min(axis=1), grouped[:, :, 1].max(axis=1)], axis=1
+    )
+
+
+def _to_int8(peaks: np.ndarray) -> np.ndarray:
+    # The top byte of each sample: 1/128 of full scale is plenty for drawing.
+    return (peaks >> 8).astype(np.int8)
+
+
+def compute_peaks(wav_path: str) -> bytes:
+    """Peak file for a 16-bit mono PCM WAV."""
+    info = read_wav_info(wav_path)
+    if not info or info.sample_width != 2 or info.channels != 1:
+        raise ValueError(f"{wav_path} is not a 16-bit mono PCM WAV file")
+    with open(wav_path, "rb") as fh:
+        data_offset, data_size = _find_data_chunk(fh)
+        data_size = min(data_size, os.fstat(fh.fileno()).st_size - data_offset)
+        base = _base_peaks(fh, data_offset, data_size)
+
+    levels = [(BASE_SAMPLES_PER_PEAK, base)]
+    while len(levels[-1][1]) > MAX_OVERVIEW_PEAKS:
+        samples_per_peak, peaks = levels[-1]
+        levels.append((samples_per_peak * LEVEL_FACTOR, _merge(peaks, LEVEL_FACTOR)))
+    levels.reverse()
+
+    offset = _HEADER.size + _LEVEL.size * len(levels)
+    header = [
+        _HEADER.pack(MAGIC, VERSION, len(levels), info.sample_rate, data_size // 2)
+    ]
+    for samples_per_peak, peaks in levels:
+        header.append(_LEVEL.pack(samples_per_peak, len(peaks), offset))
+        offset += len(peaks) * 2
+    return b"".join(header + [_to_int8(peaks).tobytes() for _, peaks in levels])
+
+
+def read_peak_levels(data: bytes) -> tuple[int, int, list[PeakLevel]]:
+    """Sample rate, total samples and level index of a peak file."""
+    magic, version, n_levels, sample_rate, total_samples = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a peak file")
+    levels = [
+        PeakLevel(*_LEVEL.unpack_from(data, _HEADER.size + _LEVEL.size * index))
+        for index in range(n_levels)
+    ]
+    return sample_rate, total_samples, levels
@@ -1,10 +1,98 @@
 import redis
 from rq import Queue
+from rq.exceptions import NoSuchJobError
+from rq.job import Job, JobStatus
 
+from app.backlog import track_backlog
+from app.checkpoints import input_hash
 from app.config import get_settings
 
+# Stage queues, highest priority first. A worker listening on several of them
+# always drains the earlier ones first, so finishing a meeting (consolidate,
+# summarize) is never stuck behind another meeting's transcription backlog.
+# Storage housekeeping only runs when nothing else is waiting.
+FINALIZE_QUEUE = "finalize"
+INGEST_QUEUE = "ingest"
+TRANSCRIBE_QUEUE = "transcribe"
+LIFECYCLE_QUEUE = "lifecycle"
+QUEUE_STAGES = (FINALIZE_QUEUE, INGEST_QUEUE, TRANSCRIBE_QUEUE, LIFECYCLE_QUEUE)
 
-def get_queue() -> Queue:
+# Jobs enqueued before the queues were split; workers keep draining it.
+_LEGACY_QUEUE = "corin"
+
+
+def queue_name(stage: str | None) -> str:
+    if stage is None:
+        return _LEGACY_QUEUE
+    if stage not in QUEUE_STAGES:
+        raise ValueError(f"Unknown queue stage: {stage}")
+    return f"corin-{stage}"
+
+
+def get_queue(stage: str | None = None) -> Queue:
     settings = get_settings()
     connection = redis.from_url(settings.redis_url)
-    return Queue("corin", connection=connection)
+    return Queue(queue_name(stage), connection=connection)
+
+
+def worker_queue_names(stages: str) -> list[str]:
+    """Queue names for a comma-separated ``WORKER_QUEUES`` value, in the
+    given priority order, followed by the legacy queue."""
+    names = [queue_name(stage.strip()) for stage in stages.split(",") if stage.strip()]
+    return list(dict.fromkeys(names + [_LEGACY_QUEUE]))
+
+
+# A job with one of these statuses will still run, so enqueueing the same
+# work again would duplicate it.
+_LIVE_STATUSES = (
+    JobStatus.QUEUED,
+    JobStatus.STARTED,
+    JobStatus.DEFERRED,
+    JobStatus.SCHEDULED,
+)
+_ENQUEUE_LOCK_TTL_S = 30
+
+
+def idempotency_key(meeting_id: str, stage: str, *inputs: object) -> str:
+    """Job id for ``stage`` of a meeting with the given inputs."""
+    return f"{stage}-{meeting_id}-{input_hash(*inputs)[:16]}"
+
+
+def job_path(func) -> str:
+    """Import path RQ stores for ``func``."""
+    if isinstance(func, str):
+        return func
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def enqueue_once(
+    queue: Queue,
+    key: str,
+    func,
+    *args,
+    backlog_ms: int | None = None,
+    **kwargs,
+) -> Job:
+    """Enqueue ``func`` under the job id ``key`` unless a job with that id is
+    still waiting or running, in which case that job is returned. Finished
+    and failed jobs do not block a new run, so retries still go through.
+
+    ``backlog_ms`` is the audio the job covers, counted in the stage's
+    backlog (see ``app.backlog``) until the job ends."""
+    connection = queue.connection
+    lock = f"corin:enqueue-lock:{key}"
+    if not connection.set(lock, 1, nx=True, ex=_ENQUEUE_LOCK_TTL_S):
+        # A concurrent request is enqueueing the same job right now.
+        return Job(key, connection=connection)
+    try:
+        try:
+            job = Job.fetch(key, connection=connection)
+        except NoSuchJobError:
+            job = None
+        if job is not None and job.get_status(refresh=False) in _LIVE_STATUSES:
+            return job
+        if backlog_ms is not None:
+            (kwargs["meta"],) = track_backlog(queue, [(job_path(func), backlog_ms)])
+        return queue.enqueue(func, *args, job_id=key, **kwargs)
+    finally:
+        connection.delete(lock)
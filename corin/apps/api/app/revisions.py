@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import func, select
+
+from app.config import get_settings
+from app.models import Meeting, TranscriptRevision, TranscriptSegment
+
+
+class RevisionConflictError(Exception):
+    def __init__(self, current_revision_no: int) -> None:
+        super().__init__(f"transcript is at revision {current_revision_no}")
+        self.current_revision_no = current_revision_no
+
+
+def segment_state(seg: TranscriptSegment) -> dict[str, Any]:
+    return {
+        "id": str(seg.id),
+        "start_ms": seg.start_ms,
+        "end_ms": seg.end_ms,
+        "speaker_key": seg.speaker_key,
+        "text": seg.text,
+    }
+
+
+def latest_revision_no(session, meeting_uuid: uuid.UUID) -> int | None:
+    return session.execute(
+        select(func.max(TranscriptRevision.revision_no)).where(
+            TranscriptRevision.meeting_id == meeting_uuid
+        )
+    ).scalar()
+
+
+def _lock_revision_head(session, meeting_uuid: uuid.UUID) -> tuple[int, int | None]:
+    # Serializes revision numbering per meeting for concurrent editors.
+    session.execute(
+        select(Meeting.id).where(Meeting.id == meeting_uuid).with_for_update()
+    )
+    latest, latest_base = session.execute(
+        select(
+            func.max(TranscriptRevision.revision_no),
+            func.max(TranscriptRevision.revision_no).filter(
+                TranscriptRevision.kind == "snapshot"
+            ),
+        ).where(TranscriptRevision.meeting_id == meeting_uuid)
+    ).one()
+    return (latest or 0) + 1, latest_base
+
+
+def _snapshot_revision(
+    session, meeting_uuid: uuid.UUID, revision_no: int
+) -> TranscriptRevision:
+    session.flush()
+    segments = (
+        session.execute(
+            select(TranscriptSegment)
+            .where(TranscriptSegment.meeting_id == meeting_uuid)
+            .order_by(TranscriptSegment.start_ms.asc())
+        )
+        .scalars()
+        .all()
+    )
+    return TranscriptRevision(
+        meeting_id=meeting_uuid,
+        revision_no=revision_no,
+        kind="snapshot",
+        base_revision_no=revision_no,
+        snapshot_json={"segments": [segment_state(seg) for seg in segments]},
+    )
+
+
+def record_snapshot(session, meeting_uuid: uuid.UUID) -> TranscriptRevision:
+    next_rev, _base_rev = _lock_revision_head(session, meeting_uuid)
+    revision = _snapshot_revision(session, meeting_uuid, next_rev)
+    session.add(revision)
+    return revision
+
+
+def record_delta(
+    session,
+    meeting_uuid: uuid.UUID,
+    upserted: Iterable[TranscriptSegment],
+    deleted_ids: Iterable[uuid.UUID] = (),
+    expected_revision_no: int | None = None,
+) -> TranscriptRevision:
+    """Store only the changed segments, falling back to a full snapshot when
+    there is no base yet or the delta chain reached the snapshot interval.
+
+    When ``expected_revision_no`` is given (0 for a transcript without
+    revisions) and the latest revision differs, ``RevisionConflictError`` is
+    raised before anything is written.
+    """
+    settings = get_settings()
+    next_rev, base_rev = _lock_revision_head(session, meeting_uuid)
+    if expected_revision_no is not None and next_rev - 1 != expected_revision_no:
+        raise RevisionConflictError(next_rev - 1)
+    if base_rev is None or next_rev - base_rev >= settings.transcript_snapshot_interval:
+        revision = _snapshot_revision(session, meeting_uuid, next_rev)
+    else:
+        revision = TranscriptRevision(
+            meeting_id=meeting_uuid,
+            revision_no=next_rev,
+            kind="delta",
+            base_revision_no=base_rev,
+            delta_json={
+                "upserts": [segment_state(seg) for seg in upserted],
+                "deletes": [str(seg_id) for seg_id in deleted_ids],
+            },
+        )
+    session.add(revision)
+    return revision
+
+
+def apply_revisions(
+    base_segments: list[dict[str, Any]], deltas: Iterable[dict]
+) -> list[dict[str, Any]]:
+    by_id = {seg["id"]: seg for seg in base_segments}
+    for delta in deltas:
+        for seg in delta.get("upserts", []):
+            by_id[seg["id"]] = seg
+        for seg_id in delta.get("deletes", []):
+            by_id.pop(seg_id, None)
+    return sorted(by_id.values(), key=lambda seg: (seg["start_ms"], seg["end_ms"]))
+
+
+def reconstruct_revision(
+    session, meeting_uuid: uuid.UUID, revision_no: int
+) -> list[dict[str, Any]] | None:
+    target = session.execute(
+        select(TranscriptRevision.base_revision_no).where(
+            TranscriptRevision.meeting_id == meeting_uuid,
+            TranscriptRevision.revision_no == revision_no,
+        )
+    ).first()
+    if target is None:
+        return None
+    # Revisions written before deltas existed are all full snapshots.
+    base_rev = target.base_revision_no or revision_no
+    rows = session.execute(
+        select(
+            TranscriptRevision.kind,
+            TranscriptRevision.snapshot_json,
+            TranscriptRevision.delta_json,
+        )
+        .where(
+            TranscriptRevision.meeting_id == meeting_uuid,
+            TranscriptRevision.revision_no >= base_rev,
+            TranscriptRevision.revision_no <= revision_no,
+        )
+        .order_by(TranscriptRevision.revision_no.asc())
+    ).all()
+    base = rows[0]
+    base_segments = list((base.snapshot_json or {}).get("segments", []))
+    return apply_revisions(
+        base_segments, [row.delta_json or {} for row in rows[1:]]
+    )
@@ -0,0 +1,349 @@
+import io
+import tempfile
+import uuid
+from dataclasses import replace
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
+from sqlalchemy import func, select
+from starlette.concurrency import run_in_threadpool
+
+from app.audio import (
+    copy_wav_pcm,
+    pcm_file_to_wav,
+    pcm_to_wav_bytes,
+    read_wav_info,
+)
+from app.auth import get_current_user
+from app.backlog import track_backlog
+from app.config import get_settings
+from app.db import SessionLocal
+from app.fairshare import refill_fair, submit_fair
+from app.fanout import (
+    TRANSCRIBE_STAGE,
+    add_fanout_members,
+    complete_fanout_member,
+    start_fanout,
+)
+from app.models import MediaAsset, Meeting, VadSegment
+from app.queue import (
+    FINALIZE_QUEUE,
+    INGEST_QUEUE,
+    TRANSCRIBE_QUEUE,
+    enqueue_once,
+    get_queue,
+    idempotency_key,
+    job_path,
+)
+from app.storage import delete_objects, download_file, upload_fileobj
+from app.tasks import consolidate_transcript, ingest_upload, transcribe_vad_segment
+from app.vad import StreamingVad, VadSegmentResult
+
+router = APIRouter(prefix="/meetings", tags=["live"])
+
+_SUPPORTED_SAMPLE_RATES = (8000, 16000, 32000, 48000)
+# Fan-out member held until the stream ends, so consolidation cannot start
+# while more segments may still arrive.
+_STREAM_MEMBER = "live-stream"
+# Fan-out run of a meeting's live recording, shared by its reconnects.
+_LIVE_RUN = "live"
+# ``original_filename`` of the meeting's live recording.
+_LIVE_FILENAME = "live.wav"
+
+
+class LiveRecording:
+    """Server side of one live stream.
+
+    PCM is appended to a scratch file as it arrives. Each segment finalized
+    by ``StreamingVad`` is cut from that file by byte range, uploaded as a
+    clip and queued for transcription straight away, so the transcript fills
+    in while the meeting is still running.
+
+    A stream that reconnects to a meeting continues its recording: the live
+    original recorded so far is loaded into the scratch file first, new
+    segments are placed after it, and the original is replaced by the whole
+    recording when the stream ends.
+    """
+
+    def __init__(self, meeting_id: uuid.UUID, sample_rate: int) -> None:
+        self.meeting_id = meeting_id
+        self.sample_rate = sample_rate
+        self.streamer = StreamingVad(sample_rate)
+        self.segment_count = 0
+        # Where this connection's audio starts in the meeting's recording.
+        self.offset_ms = 0
+        self._previous_segments = 0
+        self._asset_id: uuid.UUID | None = None
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._pcm_path = Path(self._tmpdir.name) / "live.pcm"
+        self._pcm = open(self._pcm_path, "wb")
+
+    def start(self) -> bool:
+        """Returns False if the meeting does not exist. Raises ValueError if
+        the recording being continued has another sample rate."""
+        with SessionLocal() as session:
+            meeting = session.get(Meeting, self.meeting_id)
+            if not meeting:
+                return False
+            asset = session.execute(
+                select(MediaAsset).where(
+                    MediaAsset.meeting_id == self.meeting_id,
+                    MediaAsset.original_filename == _LIVE_FILENAME,
+                )
+            ).scalar()
+            if asset:
+                self._asset_id = asset.id
+                self._load_recording(asset.original_object_key)
+            self._previous_segments = _segment_count(session, self.meeting_id)
+            meeting.status = "live"
+            meeting.progress_json = {
+                "stage": "live",
+                "percent": 0,
+                "segments": self._previous_segments,
+            }
+            session.commit()
+        # A reconnecting stream continues the meeting's live group: segments
+        # still being transcribed stay in it and only the stream rejoins.
+        connection = get_queue(TRANSCRIBE_QUEUE).connection
+        meeting_id = str(self.meeting_id)
+        if not start_fanout(
+            connection, meeting_id, TRANSCRIBE_STAGE, [_STREAM_MEMBER], _LIVE_RUN
+        ):
+            add_fanout_members(
+                connection, meeting_id, TRANSCRIBE_STAGE, [_STREAM_MEMBER]
+            )
+        return True
+
+    def _load_recording(self, object_key: str) -> None:
+        wav_path = Path(self._tmpdir.name) / "previous.wav"
+        download_file(object_key, str(wav_path))
+        info = read_wav_info(str(wav_path))
+        if info is None or info.sample_rate != self.sample_rate:
+            raise ValueError("Sample rate differs from the recording being continued")
+        copy_wav_pcm(str(wav_path), self._pcm)
+        wav_path.unlink()
+        self.offset_ms = info.n_frames * 1000 // info.sample_rate
+
+    def feed(self, chunk: bytes) -> list[dict]:
+        self._pcm.write(chunk)
+        segments = self.streamer.feed(chunk)
+        if segments:
+            self._pcm.flush()
+        return [self._dispatch(self._shift(segment)) for segment in segments]
+
+    def finish(self) -> list[dict]:
+        self._pcm.close()
+        events = [
+            self._dispatch(self._shift(segment))
+            for segment in self.streamer.finish()
+        ]
+        try:
+            self._finalize()
+        finally:
+            self._tmpdir.cleanup()
+        return events
+
+    def abort(self) -> None:
+        if not self._pcm.closed:
+            self._pcm.close()
+        self._tmpdir.cleanup()
+
+    def _shift(self, segment: VadSegmentResult) -> VadSegmentResult:
+        return replace(
+            segment,
+            start_ms=segment.start_ms + self.offset_ms,
+            end_ms=segment.end_ms + self.offset_ms,
+            padded_start_ms=segment.padded_start_ms + self.offset_ms,
+            padded_end_ms=segment.padded_end_ms + self.offset_ms,
+        )
+
+    def _read_pcm(self, start_ms: int, end_ms: int) -> bytes:
+        start = int(start_ms * self.sample_rate / 1000) * 2
+        end = int(end_ms * self.sample_rate / 1000) * 2
+        with open(self._pcm_path, "rb") as fh:
+            fh.seek(start)
+            return fh.read(end - start)
+
+    def _dispatch(self, segment: VadSegmentResult) -> dict:
+        meeting_id = str(self.meeting_id)
+        vad_id = uuid.uuid4()
+        clip_key = f"clips/{meeting_id}/{vad_id}.wav"
+        pcm = self._read_pcm(segment.padded_start_ms, segment.padded_end_ms)
+        upload_fileobj(
+            clip_key, io.BytesIO(pcm_to_wav_bytes(pcm, self.sample_rate)), "audio/wav"
+        )
+        with SessionLocal() as session:
+            session.add(
+                VadSegment(
+                    id=vad_id,
+                    meeting_id=self.meeting_id,
+                    start_ms=segment.start_ms,
+                    end_ms=segment.end_ms,
+                    padded_start_ms=segment.padded_start_ms,
+                    padded_end_ms=segment.padded_end_ms,
+                    energy_score=segment.energy_score,
+                    clip_object_key=clip_key,
+                )
+            )
+            meeting = session.get(Meeting, self.meeting_id)
+            if meeting:
+                meeting.progress_json = {
+                    "stage": "live",
+                    "percent": 0,
+                    "segments": self._previous_segments + self.segment_count + 1,
+                }
+            session.commit()
+        queue = get_queue(TRANSCRIBE_QUEUE)
+        add_fanout_members(
+            queue.connection, meeting_id, TRANSCRIBE_STAGE, [str(vad_id)]
+        )
+        func = job_path(transcribe_vad_segment)
+        (meta,) = track_backlog(
+            queue, [(func, segment.padded_end_ms - segment.padded_start_ms)]
+        )
+        submit_fair(
+            queue.connection, meeting_id, [(func, (meeting_id, str(vad_id)), meta)]
+        )
+        refill_fair(queue, get_settings().transcribe_queue_depth)
+        self.segment_count += 1
+        return {
+            "type": "segment",
+            "vad_segment_id": str(vad_id),
+            "start_ms": segment.start_ms,
+            "end_ms": segment.end_ms,
+        }
+
+    def _finalize(self) -> None:
+        meeting_id = str(self.meeting_id)
+        wav_path = Path(self._tmpdir.name) / "live.wav"
+        pcm_file_to_wav(str(self._pcm_path), str(wav_path), self.sample_rate)
+        # A new key per stop, so the ingest of the whole recording is not
+        # skipped as already done for an earlier, shorter one.
+        object_key = f"original/{meeting_id}/{uuid.uuid4()}-{_LIVE_FILENAME}"
+        with open(wav_path, "rb") as fh:
+            upload_fileobj(object_key, fh, "audio/wav")
+
+        replaced_key = None
+        with SessionLocal() as session:
+            meeting = session.get(Meeting, self.meeting_id)
+            if not meeting:
+                return
+            asset = None
+            if self._asset_id:
+                asset = session.get(MediaAsset, self._asset_id)
+            if asset:
+                replaced_key = asset.original_object_key
+                asset.original_object_key = object_key
+            else:
+                session.add(
+                    MediaAsset(
+                        meeting_id=self.meeting_id,
+                        original_object_key=object_key,
+                        original_filename=_LIVE_FILENAME,
+                        original_content_type="audio/wav",
+                    )
+                )
+            # Earlier connections' segments count too; they may still be
+            # transcribing.
+            segment_count = _segment_count(session, self.meeting_id)
+            if segment_count:
+                meeting.status = "transcribing"
+                meeting.progress_json = {
+                    "stage": "transcribing",
+                    "percent": 30,
+                    "segments": segment_count,
+                }
+            else:
+                meeting.status = "failed"
+                meeting.progress_json = {
+                    "stage": "vad",
+                    "percent": 0,
+                    "error": "no speech detected",
+                }
+            session.commit()
+        if replaced_key:
+            delete_objects([replaced_key])
+
+        duration_ms = self._pcm_path.stat().st_size * 1000 // (2 * self.sample_rate)
+        enqueue_once(
+            get_queue(INGEST_QUEUE),
+            idempotency_key(meeting_id, "ingest", object_key),
+            ingest_upload,
+            meeting_id,
+            object_key,
+            live=True,
+            backlog_ms=duration_ms,
+        )
+        queue = get_queue(FINALIZE_QUEUE)
+        emptied = complete_fanout_member(
+            queue.connection, meeting_id, TRANSCRIBE_STAGE, _STREAM_MEMBER
+        )
+        if emptied and segment_count:
+            enqueue_once(
+                queue,
+                idempotency_key(meeting_id, "consolidate"),
+                consolidate_transcript,
+                meeting_id,
+                backlog_ms=duration_ms,
+            )
+
+
+def _segment_count(session, meeting_uuid: uuid.UUID) -> int:
+    return session.execute(
+        select(func.count())
+        .select_from(VadSegment)
+        .where(VadSegment.meeting_id == meeting_uuid)
+    ).scalar_one()
+
+
+@router.websocket("/{meeting_id}/live")
+async def live_ingest(
+    websocket: WebSocket,
+    meeting_id: uuid.UUID,
+    sample_rate: int = Query(default=16000),
+    _user: str | None = Depends(get_current_user),
+) -> None:
+    """Stream 16-bit mono PCM as binary messages; send the text message
+    ``stop`` (or disconnect) to end the recording."""
+    await websocket.accept()
+    if sample_rate not in _SUPPORTED_SAMPLE_RATES:
+        await websocket.close(code=1003, reason="Unsupported sample rate")
+        return
+
+    recording = LiveRecording(meeting_id, sample_rate)
+    try:
+        started = await run_in_threadpool(recording.start)
+    except ValueError as exc:
+        recording.abort()
+        await websocket.close(code=1003, reason=str(exc))
+        return
+    if not started:
+        recording.abort()
+        await websocket.close(code=4404, reason="Meeting not found")
+        return
+
+    connected = True
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                connected = False
+                break
+            if message.get("bytes"):
+                for event in await run_in_threadpool(recording.feed, message["bytes"]):
+                    await websocket.send_json(event)
+            elif message.get("text") == "stop":
+                break
+    except WebSocketDisconnect:
+        connected = False
+    except BaseException:
+        recording.abort()
+        raise
+
+    events = await run_in_threadpool(recording.finish)
+    if not connected:
+        return
+    for event in events:
+        await websocket.send_json(event)
+    await websocket.send_json({"type": "done", "segments": recording.segment_count})
+    await websocket.close()
@@ -1,26 +1,74 @@
+import hashlib
 import uuid
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
-from sqlalchemy import String, cast, or_, select
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from sqlalchemy import String, cast, func, or_, select
 from sqlalchemy.orm import Session
 
+from app.audio_clips import ClipCache, clip_etag, cut_clip, parse_range
 from app.auth import get_current_user
+from app.backlog import audio_ms_from_size
+from app.config import get_settings
 from app.db import get_session
-from app.models import MediaAsset, Meeting, SpeakerLabel, Summary, TranscriptSegment
-from app.queue import get_queue
+from app.etags import etag_matches, meeting_etag, touch_meeting
+from app.hls import PLAYLIST_CONTENT_TYPE, rewrite_playlist
+from app.models import (
+    MediaAsset,
+    Meeting,
+    PipelineTiming,
+    SpeakerLabel,
+    Summary,
+    TranscriptSegment,
+)
+from app.checkpoints import INGEST_STAGE
+from app.queue import (
+    FINALIZE_QUEUE,
+    INGEST_QUEUE,
+    enqueue_once,
+    get_queue,
+    idempotency_key,
+)
+from app.revisions import RevisionConflictError, reconstruct_revision, record_delta
 from app.schemas import (
     MeetingCreate,
     MeetingDetail,
     MeetingOut,
+    MeetingTimings,
+    SegmentBatchResult,
+    SegmentBatchUpdate,
     SpeakerRename,
+    RevisionSegmentOut,
+    StageTimingOut,
+    TranscriptRevisionContent,
+    TranscriptSegmentOut,
     UploadResponse,
 )
-from app.storage import presigned_get, upload_fileobj
-from app.tasks import ingest_upload, summarize_meeting
+from app.storage import (
+    presigned_get_many,
+    read_object,
+    upload_fileobj,
+)
+from app.serialization import JsonBytesResponse, columnar, meeting_detail_payload
+from app.tasks import enqueue_summary, ingest_upload, reembed_segments
 
 router = APIRouter(prefix="/meetings", tags=["meetings"])
 
+# Segment URLs must outlive a long listening session.
+_HLS_URL_TTL_S = 6 * 3600
+# Clients may keep the detail but must revalidate it; unchanged polls get 304.
+_DETAIL_CACHE_CONTROL = "private, no-cache"
+_clip_cache = ClipCache(get_settings().audio_clip_cache_mb * 1024 * 1024)
+
 
 @router.post("", response_model=MeetingOut)
 def create_meeting(
@@ -77,21 +125,268 @@ def list_meetings(
 
 @router.get("/{meeting_id}", response_model=MeetingDetail)
 def get_meeting(
+    meeting_id: uuid.UUID,
+    request: Request,
+    transcript_format: Literal["rows", "columnar"] = "rows",
+    session: Session = Depends(get_session),
+    _user: str | None = Depends(get_current_user),
+) -> Response:
+    etag = meeting_etag(session, meeting_id, transcript_format)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    headers = {"ETag": etag, "Cache-Control": _DETAIL_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    meeting = session.get(Meeting, meeting_id)
+    if not meeting or meeting.deleted_at:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    detail = meeting_detail_payload(session, meeting, transcript_format)
+    return JsonBytesResponse(detail, headers=headers)
+
+
+@router.delete("/{meeting_id}")
+def delete_meeting(
     meeting_id: uuid.UUID,
     session: Session = Depends(get_session),
     _user: str | None = Depends(get_current_user),
-) -> MeetingDetail:
+) -> dict:
+    """Soft delete; objects and rows are purged after
+    ``DELETED_MEETING_RETENTION_DAYS`` (see ``app.lifecycle``)."""
     meeting = session.get(Meeting, meeting_id)
     if not meeting or meeting.deleted_at:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    playable_url = None
-    if meeting.media_assets:
-        asset = meeting.media_assets[0]
-        if asset.playable_object_key:
-            playable_url = presigned_get(asset.playable_object_key).url
-    detail = MeetingDetail.model_validate(meeting)
-    detail.playable_url = playable_url
-    return detail
+    meeting.deleted_at = func.now()
+    session.commit()
+    return {"ok": True}
+
+
+@router.get("/{meeting_id}/hls.m3u8")
+def get_meeting_hls_playlist(
+    meeting_id: uuid.UUID,
+    session: Session = Depends(get_session),
+    _user: str | None = Depends(get_current_user),
+) -> Response:
+    """HLS playlist with every segment URL presigned."""
+    hls_key = session.execute(
+        select(MediaAsset.hls_object_key)
+        .join(Meeting, Meeting.id == MediaAsset.meeting_id)
+        .where(
+            MediaAsset.meeting_id == meeting_id,
+            MediaAsset.hls_object_key.is_not(None),
+            Meeting.deleted_at.is_(None),
+        )
+    ).scalar()
+    if not hls_key:
+        raise HTTPException(status_code=404, detail="Segmented audio not found")
+    prefix = hls_key.rsplit("/", 1)[0] + "/"
+    playlist = rewrite_playlist(
+        read_object(hls_key).decode(),
+        prefix,
+        lambda keys: presigned_get_many(keys, expires_in=_HLS_URL_TTL_S),
+    )
+    return Response(
+        content=playlist,
+        media_type=PLAYLIST_CONTENT_TYPE,
+        # Well inside the URL lifetime so a cached playlist never hands out
+        # expired segment URLs.
+        headers={"Cache-Control": f"private, max-age={_HLS_URL_TTL_S // 12}"},
+    )
+
+
+@router.get("/{meeting_id}/audio")
+def get_meeting_audio_clip(
+    meeting_id: uuid.UUID,
+    request: Request,
+    start_ms: int = Query(ge=0),
+    end_ms: int = Query(gt=0),
+    session: Session = Depends(get_session),
+    _user: str | None = Depends(get_current_user),
+) -> Response:
+    """WAV clip of ``[start_ms, end_ms)`` for citation playback; supports
+    ``If-None-Match`` and single ``Range`` requests."""
+    settings = get_settings()
+    if end_ms <= start_ms:
+        raise HTTPException(status_code=422, detail="end_ms must exceed start_ms")
+    if end_ms - start_ms > settings.audio_clip_max_ms:
+        raise HTTPException(
+            status_code=422,
+            detail=f"clips are limited to {settings.audio_clip_max_ms} ms",
+        )
+    asset = session.execute(
+        select(MediaAsset)
+        .join(Meeting, Meeting.id == MediaAsset.meeting_id)
+        .where(MediaAsset.meeting_id == meeting_id, Meeting.deleted_at.is_(None))
+    ).scalar()
+    # Speech previews come from the 16 kHz track when there is one; an
+    # archived normalized WAV cannot be range-read.
+    source_key = asset.vad_object_key if asset else None
+    if asset and not source_key and not asset.archive_object_key:
+        source_key = asset.normalized_object_key
+    if not source_key:
+        raise HTTPException(status_code=404, detail="Meeting audio not found")
+    version = asset.original_object_key
+    etag = clip_etag(source_key, version, start_ms, end_ms)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        # The ETag covers the source upload, so a clip never changes.
+        "Cache-Control": "private, max-age=86400",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    clip = _clip_cache.get(etag)
+    if clip is None:
+        clip = cut_clip(source_key, version, start_ms, end_ms)
+        _clip_cache.put(etag, clip)
+    try:
+        byte_range = parse_range(request.headers.get("range"), len(clip))
+    except ValueError:
+        headers["Content-Range"] = f"bytes */{len(clip)}"
+        return Response(status_code=416, headers=headers)
+    if byte_range is None:
+        return Response(content=clip, media_type="audio/wav", headers=headers)
+    first, last = byte_range
+    headers["Content-Range"] = f"bytes {first}-{last}/{len(clip)}"
+    return Response(
+        content=clip[first : last + 1],
+        status_code=206,
+        media_type="audio/wav",
+        headers=headers,
+    )
+
+
+@router.get("/{meeting_id}/timings", response_model=MeetingTimings)
+def get_meeting_timings(
+    meeting_id: uuid.UUID,
+    session: Session = Depends(get_session),
+    _user: str | None = Depends(get_current_user),
+) -> MeetingTimings:
+    meeting = session.get(Meeting, meeting_id)
+    if not meeting or meeting.deleted_at:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    rows = session.execute(
+        select(
+            PipelineTiming.job,
+            PipelineTiming.stage,
+            func.count(),
+            func.sum(PipelineTiming.duration_ms),
+            func.max(PipelineTiming.duration_ms),
+        )
+        .where(PipelineTiming.meeting_id == meeting_id)
+        .group_by(PipelineTiming.job, PipelineTiming.stage)
+        .order_by(PipelineTiming.job, PipelineTiming.stage)
+    ).all()
+    stages = [
+        StageTimingOut(
+            job=job, stage=stage, count=count, total_ms=total_ms, max_ms=max_ms
+        )
+        for job, stage, count, total_ms, max_ms in rows
+    ]
+    totals_ms: dict[str, int] = {}
+    for item in stages:
+        totals_ms[item.stage] = totals_ms.get(item.stage, 0) + item.total_ms
+    return MeetingTimings(meeting_id=meeting_id, totals_ms=totals_ms, stages=stages)
+
+
+@router.get(
+    "/{meeting_id}/revisions/{revision_no}",
+    response_model=TranscriptRevisionContent,
+)
+def get_revision(
+    meeting_id: uuid.UUID,
+    revision_no: int,
+    transcript_format: Literal["rows", "columnar"] = "rows",
+    session: Session = Depends(get_session),
+    _user: str | None = Depends(get_current_user),
+) -> Response:
+    segments = reconstruct_revision(session, meeting_id, revision_no)
+    if segments is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    # Snapshot segments are stored with exactly RevisionSegmentOut's fields.
+    content = {"revision_no": revision_no, "segments": segments, "columns": None}
+    if transcript_format == "columnar":
+        content["columns"] = columnar(segments, list(RevisionSegmentOut.model_fields))
+        content["segments"] = []
+    return JsonBytesResponse(content)
+
+
+@router.patch("/{meeting_id}/segments", response_model=SegmentBatchResult)
+def update_segments(
+    meeting_id: uuid.UUID,
+    payload: SegmentBatchUpdate,
+    session: Session = Depends(get_session),
+    _user: str | None = Depends(get_current_user),
+) -> SegmentBatchResult:
+    meeting = session.get(Meeting, meeting_id)
+    if not meeting or meeting.deleted_at:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+
+    edits = {edit.id: edit for edit in payload.edits}
+    segments = (
+        session.execute(
+            select(TranscriptSegment)
+            .where(TranscriptSegment.meeting_id == meeting_id)
+            .where(TranscriptSegment.id.in_(list(edits)))
+        )
+        .scalars()
+        .all()
+    )
+    if len(segments) != len(edits):
+        raise HTTPException(status_code=404, detail="Segment not found")
+
+    reembed_ids: list[str] = []
+    for segment in segments:
+        edit = edits[segment.id]
+        if edit.text is not None and edit.text != segment.text:
+            segment.text = edit.text
+            reembed_ids.append(str(segment.id))
+        if edit.speaker_key is not None:
+            segment.speaker_key = edit.speaker_key
+        if edit.start_ms is not None:
+            segment.start_ms = edit.start_ms
+        if edit.end_ms is not None:
+            segment.end_ms = edit.end_ms
+        if segment.start_ms > segment.end_ms:
+            raise HTTPException(
+                status_code=422, detail=f"Segment {segment.id} ends before it starts"
+            )
+
+    try:
+        revision = record_delta(
+            session,
+            meeting_id,
+            upserted=segments,
+            expected_revision_no=payload.base_revision_no,
+        )
+    except RevisionConflictError as exc:
+        session.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "error": "revision conflict",
+                "current_revision_no": exc.current_revision_no,
+            },
+        ) from exc
+    result = SegmentBatchResult(
+        revision_no=revision.revision_no,
+        segments=[TranscriptSegmentOut.model_validate(seg) for seg in segments],
+    )
+    session.commit()
+
+    if reembed_ids:
+        queue = get_queue(FINALIZE_QUEUE)
+        queue.enqueue(reembed_segments, str(meeting_id), reembed_ids)
+
+    return result
+
+
+def _content_digest(fileobj, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()[:16]
 
 
 @router.post("/{meeting_id}/upload", response_model=UploadResponse)
@@ -105,22 +400,37 @@ def upload_meeting_media(
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
 
-    object_key = f"original/{meeting_id}/{uuid.uuid4()}-{file.filename}"
-    upload_fileobj(object_key, file.file, file.content_type)
+    # The key is derived from the content, so uploading the same file again
+    # (a double click, a client retry) maps to the same object and job.
+    digest = _content_digest(file.file)
+    object_key = f"original/{meeting_id}/{digest}-{file.filename}"
+    existing = session.execute(
+        select(MediaAsset.id).where(
+            MediaAsset.meeting_id == meeting_id,
+            MediaAsset.original_object_key == object_key,
+        )
+    ).first()
+    if not existing:
+        upload_fileobj(object_key, file.file, file.content_type)
+        asset = MediaAsset(
+            meeting_id=meeting_id,
+            original_object_key=object_key,
+            original_filename=file.filename,
+            original_content_type=file.content_type,
+        )
+        session.add(asset)
+        meeting.status = "uploaded"
+        meeting.progress_json = {"stage": "uploaded", "percent": 1}
+        session.commit()
 
-    asset = MediaAsset(
-        meeting_id=meeting_id,
-        original_object_key=object_key,
-        original_filename=file.filename,
-        original_content_type=file.content_type,
+    enqueue_once(
+        get_queue(INGEST_QUEUE),
+        idempotency_key(str(meeting_id), INGEST_STAGE, object_key),
+        ingest_upload,
+        str(meeting_id),
+        object_key,
+        backlog_ms=audio_ms_from_size(file.size),
     )
-    session.add(asset)
-    meeting.status = "uploaded"
-    meeting.progress_json = {"stage": "uploaded", "percent": 1}
-    session.commit()
-
-    queue = get_queue()
-    queue.enqueue(ingest_upload, str(meeting_id), object_key)
 
     return UploadResponse(meeting_id=meeting_id, object_key=object_key)
 
@@ -134,8 +444,7 @@ def regenerate_summary(
     meeting = session.get(Meeting, meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    queue = get_queue()
-    queue.enqueue(summarize_meeting, str(meeting_id))
+    enqueue_summary(str(meeting_id))
     meeting.status = "summarizing"
     meeting.progress_json = {"stage": "summarizing", "percent": 70}
     session.commit()
@@ -169,5 +478,6 @@ def rename_speaker(
         session.add(label)
     else:
         label.display_name = payload.display_name
+    touch_meeting(session, meeting_id)
     session.commit()
     return {"ok": True}
@@ -7,7 +7,7 @@ from app.auth import get_current_user
 from app.db import get_session
 from app.models import TranscriptSegment
 from app.schemas import SegmentUpdate, TranscriptSegmentOut
-from app.tasks import _snapshot_transcript
+from app.revisions import record_delta
 
 router = APIRouter(prefix="/segments", tags=["segments"])
 
@@ -23,8 +23,7 @@ def update_segment(
     if not segment:
         raise HTTPException(status_code=404, detail="Segment not found")
     segment.text = payload.text
-    session.commit()
-    _snapshot_transcript(session, segment.meeting_id)
+    record_delta(session, segment.meeting_id, upserted=[segment])
     session.commit()
     session.refresh(segment)
     return TranscriptSegmentOut.model_validate(segment)
@@ -1,17 +1,23 @@
 import secrets
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.auth import get_current_user
 from app.db import get_session
+from app.etags import etag_matches, meeting_etag, touch_meeting
 from app.models import Meeting, ShareLink
 from app.schemas import MeetingDetail, ShareLinkOut
-from app.storage import presigned_get
+from app.serialization import JsonBytesResponse, meeting_detail_payload
 
 router = APIRouter(tags=["share"])
 
+# Shared links are opened by many people at once (e.g. posted in chat), so
+# browsers and proxies may reuse the page for a minute and then revalidate.
+# That is well within the lifetime of the presigned URLs it contains.
+_SHARE_CACHE_CONTROL = "public, max-age=60"
+
 
 @router.post("/meetings/{meeting_id}/share-links", response_model=ShareLinkOut)
 def create_share_link(
@@ -25,13 +31,16 @@ def create_share_link(
     token = secrets.token_urlsafe(32)
     share = ShareLink(meeting_id=meeting_id, token=token)
     session.add(share)
+    touch_meeting(session, meeting_id)
     session.commit()
     session.refresh(share)
     return ShareLinkOut.model_validate(share)
 
 
 @router.get("/share/{token}", response_model=MeetingDetail)
-def get_share(token: str, session: Session = Depends(get_session)) -> MeetingDetail:
+def get_share(
+    token: str, request: Request, session: Session = Depends(get_session)
+) -> Response:
     share = (
         session.query(ShareLink)
         .filter(ShareLink.token == token, ShareLink.revoked_at.is_(None))
@@ -39,14 +48,14 @@ def get_share(token: str, session: Session = Depends(get_session)) -> MeetingDet
     )
     if not share:
         raise HTTPException(status_code=404, detail="Share link not found")
+    etag = meeting_etag(session, share.meeting_id)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    headers = {"ETag": etag, "Cache-Control": _SHARE_CACHE_CONTROL}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
     meeting = session.get(Meeting, share.meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    playable_url = None
-    if meeting.media_assets:
-        asset = meeting.media_assets[0]
-        if asset.playable_object_key:
-            playable_url = presigned_get(asset.playable_object_key).url
-    detail = MeetingDetail.model_validate(meeting)
-    detail.playable_url = playable_url
-    return detail
+    detail = meeting_detail_payload(session, meeting)
+    return JsonBytesResponse(detail, headers=headers)
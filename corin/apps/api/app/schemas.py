@@ -19,7 +19,11 @@ class MediaAssetOut(OrmBase):
     id: UUID
     original_object_key: str
     normalized_object_key: str | None
+    vad_object_key: str | None = None
     playable_object_key: str | None
+    peaks_object_key: str | None = None
+    hls_object_key: str | None = None
+    archive_object_key: str | None = None
     original_filename: str | None
     original_content_type: str | None
     duration_ms: int | None
@@ -43,13 +47,49 @@ class TranscriptSegmentOut(OrmBase):
     confidence: float | None
 
 
+class TranscriptColumns(BaseModel):
+    """Transcript segments as parallel arrays (``transcript_format=columnar``)."""
+
+    id: list[UUID]
+    start_ms: list[int]
+    end_ms: list[int]
+    speaker_key: list[str]
+    text: list[str]
+    confidence: list[float | None]
+
+
 class TranscriptRevisionOut(OrmBase):
+    """Revision metadata; ``/revisions/{revision_no}`` serves the content."""
+
     id: UUID
     revision_no: int
-    snapshot_json: dict
+    kind: str = "snapshot"
+    base_revision_no: int | None = None
     created_at: datetime
 
 
+class RevisionSegmentOut(BaseModel):
+    id: UUID
+    start_ms: int
+    end_ms: int
+    speaker_key: str
+    text: str
+
+
+class RevisionSegmentColumns(BaseModel):
+    id: list[UUID]
+    start_ms: list[int]
+    end_ms: list[int]
+    speaker_key: list[str]
+    text: list[str]
+
+
+class TranscriptRevisionContent(BaseModel):
+    revision_no: int
+    segments: list[RevisionSegmentOut]
+    columns: RevisionSegmentColumns | None = None
+
+
 class SummaryOut(OrmBase):
     id: UUID
     kind: str
@@ -89,11 +129,28 @@ class MeetingDetail(MeetingOut):
     media_assets: list[MediaAssetOut]
     vad_segments: list[VadSegmentOut]
     transcript_segments: list[TranscriptSegmentOut]
+    transcript_columns: TranscriptColumns | None = None
     transcript_revisions: list[TranscriptRevisionOut]
     summaries: list[SummaryOut]
     share_links: list[ShareLinkOut]
     speaker_labels: list[SpeakerLabelOut]
     playable_url: str | None = None
+    peaks_url: str | None = None
+    hls_url: str | None = None
+
+
+class StageTimingOut(BaseModel):
+    job: str
+    stage: str
+    count: int
+    total_ms: int
+    max_ms: int
+
+
+class MeetingTimings(BaseModel):
+    meeting_id: UUID
+    totals_ms: dict[str, int]
+    stages: list[StageTimingOut]
 
 
 class UploadResponse(BaseModel):
@@ -105,6 +162,24 @@ class SegmentUpdate(BaseModel):
     text: str
 
 
+class SegmentEdit(BaseModel):
+    id: UUID
+    text: str | None = None
+    speaker_key: str | None = None
+    start_ms: int | None = None
+    end_ms: int | None = None
+
+
+class SegmentBatchUpdate(BaseModel):
+    base_revision_no: int = Field(ge=0)
+    edits: list[SegmentEdit] = Field(min_length=1)
+
+
+class SegmentBatchResult(BaseModel):
+    revision_no: int
+    segments: list[TranscriptSegmentOut]
+
+
 class SpeakerRename(BaseModel):
     display_name: str
 
@@ -0,0 +1,127 @@
+"""JSON for transcript-heavy responses, built from row tuples.
+
+The detail of a long meeting holds thousands of transcript segments; its
+revisions are listed as metadata only. Validating each ORM object into a pydantic model
+and then running FastAPI's encoder over the result took most of the request
+time, so these endpoints select plain columns and serialize the dicts with
+pydantic-core's ``to_json``, which handles UUIDs and datetimes natively. The
+routes keep their ``response_model`` for the OpenAPI schema.
+
+``columnar`` turns a list of row dicts into parallel arrays, which drops the
+repeated keys from the payload.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import (
+    MediaAsset,
+    Meeting,
+    ShareLink,
+    SpeakerLabel,
+    Summary,
+    TranscriptRevision,
+    TranscriptSegment,
+    VadSegment,
+)
+from app.schemas import (
+    MediaAssetOut,
+    MeetingOut,
+    ShareLinkOut,
+    SpeakerLabelOut,
+    SummaryOut,
+    TranscriptRevisionOut,
+    TranscriptSegmentOut,
+    VadSegmentOut,
+)
+from app.storage import presigned_get
+
+# (model, output schema, sort column) of each list in ``MeetingDetail``.
+_DETAIL_LISTS = {
+    "media_assets": (MediaAsset, MediaAssetOut, MediaAsset.created_at),
+    "vad_segments": (VadSegment, VadSegmentOut, VadSegment.start_ms),
+    "transcript_segments": (
+        TranscriptSegment,
+        TranscriptSegmentOut,
+        TranscriptSegment.start_ms,
+    ),
+    "transcript_revisions": (
+        TranscriptRevision,
+        TranscriptRevisionOut,
+        TranscriptRevision.revision_no,
+    ),
+    "summaries": (Summary, SummaryOut, Summary.created_at),
+    "share_links": (ShareLink, ShareLinkOut, ShareLink.created_at),
+    "speaker_labels": (SpeakerLabel, SpeakerLabelOut, SpeakerLabel.speaker_key),
+}
+
+
+class JsonBytesResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def columnar(rows: list[dict[str, Any]], fields: list[str]) -> dict[str, list]:
+    """``{field: [value per row]}`` for ``fields``."""
+    return {field: [row[field] for row in rows] for field in fields}
+
+
+def schema_rows(
+    session: Session,
+    model: type,
+    schema: type[BaseModel],
+    meeting_uuid: uuid.UUID,
+    order_by: Any,
+) -> list[dict[str, Any]]:
+    """The meeting's rows of ``model`` as dicts of ``schema``'s fields,
+    selected as plain columns rather than ORM objects."""
+    fields = list(schema.model_fields)
+    rows = session.execute(
+        select(*(getattr(model, field) for field in fields))
+        .where(model.meeting_id == meeting_uuid)
+        .order_by(order_by)
+    ).all()
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def meeting_detail_payload(
+    session: Session, meeting: Meeting, transcript_format: str = "rows"
+) -> dict[str, Any]:
+    """``MeetingDetail`` as a plain dict, without loading relationships.
+
+    With ``transcript_format="columnar"`` the transcript is sent as
+    ``transcript_columns`` and ``transcript_segments`` is empty. The media
+    URLs point at the first asset, as both the meeting and share views play
+    it.
+    """
+    payload = MeetingOut.model_validate(meeting).model_dump()
+    for name, (model, schema, order_by) in _DETAIL_LISTS.items():
+        payload[name] = schema_rows(session, model, schema, meeting.id, order_by)
+    payload["transcript_columns"] = None
+    if transcript_format == "columnar":
+        payload["transcript_columns"] = columnar(
+            payload["transcript_segments"], list(TranscriptSegmentOut.model_fields)
+        )
+        payload["transcript_segments"] = []
+    payload["playable_url"] = None
+    payload["peaks_url"] = None
+    payload["hls_url"] = None
+    if payload["media_assets"]:
+        asset = payload["media_assets"][0]
+        if asset["playable_object_key"]:
+            payload["playable_url"] = presigned_get(asset["playable_object_key"]).url
+        if asset["peaks_object_key"]:
+            payload["peaks_url"] = presigned_get(asset["peaks_object_key"]).url
+        if asset["hls_object_key"]:
+            payload["hls_url"] = f"/meetings/{meeting.id}/hls.m3u8"
+    return payload
@@ -7,6 +7,8 @@ from botocore.config import Config
 
 from app.config import get_settings
 
+_DELETE_BATCH = 1000
+
 
 @dataclass
 class PresignedUrl:
@@ -57,6 +59,66 @@ def download_file(object_key: str, target_path: str) -> None:
     client.download_file(settings.s3_bucket, object_key, target_path)
 
 
+def read_object(object_key: str) -> bytes:
+    settings = get_settings()
+    client = get_s3_client()
+    return client.get_object(Bucket=settings.s3_bucket, Key=object_key)["Body"].read()
+
+
+def read_object_range(object_key: str, first: int, last: int) -> bytes:
+    """Bytes ``first`` to ``last`` (inclusive) of an object."""
+    settings = get_settings()
+    client = get_s3_client()
+    response = client.get_object(
+        Bucket=settings.s3_bucket, Key=object_key, Range=f"bytes={first}-{last}"
+    )
+    return response["Body"].read()
+
+
+def list_object_keys(prefix: str) -> list[str]:
+    settings = get_settings()
+    client = get_s3_client()
+    paginator = client.get_paginator("list_objects_v2")
+    return [
+        item["Key"]
+        for page in paginator.paginate(Bucket=settings.s3_bucket, Prefix=prefix)
+        for item in page.get("Contents", [])
+    ]
+
+
+def delete_objects(object_keys: list[str]) -> None:
+    """Delete keys with one request per 1000 (the DeleteObjects limit);
+    missing keys are not an error."""
+    settings = get_settings()
+    client = get_s3_client()
+    for index in range(0, len(object_keys), _DELETE_BATCH):
+        batch = object_keys[index : index + _DELETE_BATCH]
+        response = client.delete_objects(
+            Bucket=settings.s3_bucket,
+            Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+        )
+        errors = response.get("Errors")
+        if errors:
+            raise RuntimeError(
+                f"Failed to delete {len(errors)} objects, e.g. {errors[0]['Key']}: "
+                f"{errors[0].get('Message')}"
+            )
+
+
+def presigned_get_many(object_keys: list[str], expires_in: int = 3600) -> list[str]:
+    """Presigned GET URLs for many keys, signed with one client."""
+    settings = get_settings()
+    client = get_s3_client()
+    return [
+        client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": settings.s3_bucket, "Key": object_key},
+            ExpiresIn=expires_in,
+        )
+        for object_key in object_keys
+    ]
+
+
 def presigned_get(object_key: str, expires_in: int = 3600) -> PresignedUrl:
     settings = get_settings()
     client = get_s3_client()
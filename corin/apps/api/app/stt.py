@@ -0,0 +1,315 @@
+"""STT provider registry with health tracking, hedging and fallback.
+
+Per-provider health (latency EWMA, a window of recent latencies and
+circuit-breaker state) is kept in Redis so every forked RQ work horse sees
+the same picture. A call goes to the first provider whose breaker is closed;
+when it runs past that provider's p95 latency a hedged duplicate is sent to
+the next one and whichever answers first wins. Failures fall through the
+configured order.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Callable, Protocol
+
+import redis
+
+from app import llm
+from app.audio import AudioSource
+from app.config import get_settings
+from app.llm import TranscriptionResult
+from app.metrics import STT_HEDGE_DISCARDED_TOKENS, STT_HEDGES, STT_REQUEST_SECONDS
+
+_EWMA_ALPHA = 0.2
+_LATENCY_WINDOW = 100
+_HEALTH_KEY = "corin:stt:health:{name}"
+
+ProviderFn = Callable[[AudioSource], TranscriptionResult]
+BatchProviderFn = Callable[[list[AudioSource]], list[TranscriptionResult]]
+
+
+def _transcribe_local(file_path: AudioSource) -> TranscriptionResult:
+    from app.stt_local import transcribe_local
+
+    return transcribe_local(file_path)
+
+
+def _transcribe_local_batch(
+    file_paths: list[AudioSource],
+) -> list[TranscriptionResult]:
+    from app.stt_local import transcribe_local_batch
+
+    return transcribe_local_batch(file_paths)
+
+
+_PROVIDERS: dict[str, ProviderFn] = {
+    "openai_4o": llm._transcribe_openai_4o,
+    "whisper": llm._transcribe_whisper,
+    "local": _transcribe_local,
+}
+_BATCH_PROVIDERS: dict[str, BatchProviderFn] = {
+    "local": _transcribe_local_batch,
+}
+
+
+@dataclass
+class ProviderHealth:
+    ewma_ms: float | None = None
+    latencies_ms: list[float] = field(default_factory=list)
+    failures: int = 0
+    open_until: float = 0.0
+
+    def record_success(self, latency_ms: float) -> None:
+        if self.ewma_ms is None:
+            self.ewma_ms = latency_ms
+        else:
+            self.ewma_ms = _EWMA_ALPHA * latency_ms + (1 - _EWMA_ALPHA) * self.ewma_ms
+        self.latencies_ms = (self.latencies_ms + [round(latency_ms, 1)])[
+            -_LATENCY_WINDOW:
+        ]
+        self.failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self, now: float, threshold: int, cooldown_s: float) -> None:
+        # Once the cool-down passes the breaker is half-open: the next call
+        # is let through, and another failure re-opens it straight away.
+        self.failures += 1
+        if self.failures >= threshold:
+            self.open_until = now + cooldown_s
+
+    def is_open(self, now: float) -> bool:
+        return now < self.open_until
+
+    def p95_ms(self, min_samples: int) -> float | None:
+        if len(self.latencies_ms) < max(min_samples, 1):
+            return None
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+
+class HealthStore(Protocol):
+    def load(self, name: str) -> ProviderHealth: ...
+
+    def update(self, name: str, change: Callable[[ProviderHealth], None]) -> None: ...
+
+
+class RedisHealthStore:
+    """Health as one JSON value per provider. Updates are read-modify-write;
+    a concurrent job can occasionally drop another's sample, which only
+    nudges the statistics. Redis errors never fail a transcription."""
+
+    def __init__(self, connection: redis.Redis) -> None:
+        self.connection = connection
+
+    def load(self, name: str) -> ProviderHealth:
+        try:
+            raw = self.connection.get(_HEALTH_KEY.format(name=name))
+        except redis.RedisError:
+            return ProviderHealth()
+        if not raw:
+            return ProviderHealth()
+        return ProviderHealth(**json.loads(raw))
+
+    def update(self, name: str, change: Callable[[ProviderHealth], None]) -> None:
+        health = self.load(name)
+        change(health)
+        try:
+            self.connection.set(
+                _HEALTH_KEY.format(name=name), json.dumps(asdict(health))
+            )
+        except redis.RedisError:
+            pass
+
+
+class SttRouter:
+    def __init__(
+        self,
+        providers: dict[str, ProviderFn],
+        batch_providers: dict[str, BatchProviderFn],
+        store: HealthStore,
+        order: list[str],
+        hedge: bool = True,
+        hedge_min_samples: int = 20,
+        breaker_failures: int = 3,
+        breaker_cooldown_s: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.providers = providers
+        self.batch_providers = batch_providers
+        self.store = store
+        self.order = order
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown_s = breaker_cooldown_s
+        self.clock = clock
+
+    def candidates(self) -> list[str]:
+        now = self.clock()
+        available = [
+            name for name in self.order if not self.store.load(name).is_open(now)
+        ]
+        # With every breaker open, keep trying the primary rather than fail
+        # without a request.
+        return available or self.order[:1]
+
+    def _record(self, name: str, elapsed: float, error: BaseException | None) -> None:
+        STT_REQUEST_SECONDS.labels(
+            provider=name, outcome="error" if error else "ok"
+        ).observe(elapsed)
+        if error:
+            self.store.update(
+                name,
+                lambda health: health.record_failure(
+                    self.clock(), self.breaker_failures, self.breaker_cooldown_s
+                ),
+            )
+        else:
+            self.store.update(
+                name, lambda health: health.record_success(elapsed * 1000)
+            )
+
+    def _call(self, name: str, file_path: AudioSource) -> TranscriptionResult:
+        if not isinstance(file_path, str):
+            # Hedged calls run concurrently; each gets its own read position
+            # over the shared buffer.
+            file_path = file_path.reopen()
+        started = time.perf_counter()
+        try:
+            result = self.providers[name](file_path)
+        except Exception as exc:
+            self._record(name, time.perf_counter() - started, exc)
+            raise
+        self._record(name, time.perf_counter() - started, None)
+        result.provider = name
+        return result
+
+    def _hedged(
+        self, primary: str, backup: str, file_path: AudioSource, hedge_after_s: float
+    ) -> tuple[TranscriptionResult | None, Exception | None, bool]:
+        # The losing request is not cancelled (HTTP calls cannot be); it
+        # finishes in the background, still updates its provider's health,
+        # and its usage is counted in ``corin_stt_hedge_discarded_tokens``.
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            pending = {executor.submit(self._call, primary, file_path)}
+            done, _ = wait(pending, timeout=hedge_after_s)
+            hedged = not done
+            if hedged:
+                STT_HEDGES.labels(provider=primary).inc()
+                pending.add(executor.submit(self._call, backup, file_path))
+            error: Exception | None = None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    exc = future.exception()
+                    if exc is None:
+                        for loser in (done | pending) - {future}:
+                            loser.add_done_callback(_count_discarded_usage)
+                        return future.result(), None, hedged
+                    error = exc  # type: ignore[assignment]
+            return None, error, hedged
+        finally:
+            executor.shutdown(wait=False)
+
+    def transcribe(self, file_path: AudioSource) -> TranscriptionResult:
+        return self._transcribe(file_path, self.candidates())
+
+    def _transcribe(
+        self, file_path: AudioSource, candidates: list[str]
+    ) -> TranscriptionResult:
+        error: Exception | None = None
+        index = 0
+        while index < len(candidates):
+            primary = candidates[index]
+            backup = candidates[index + 1] if index + 1 < len(candidates) else None
+            hedge_after_ms = None
+            if self.hedge and backup:
+                hedge_after_ms = self.store.load(primary).p95_ms(
+                    self.hedge_min_samples
+                )
+            if hedge_after_ms is None or backup is None:
+                try:
+                    return self._call(primary, file_path)
+                except Exception as exc:
+                    error = exc
+                    index += 1
+                    continue
+            result, error, hedged = self._hedged(
+                primary, backup, file_path, hedge_after_ms / 1000
+            )
+            if result is not None:
+                return result
+            index += 2 if hedged else 1
+        assert error is not None
+        raise error
+
+    def transcribe_batch(
+        self, file_paths: list[AudioSource]
+    ) -> list[TranscriptionResult]:
+        candidates = self.candidates()
+        batch = self.batch_providers.get(candidates[0])
+        if batch and file_paths:
+            name = candidates[0]
+            started = time.perf_counter()
+            # Per-clip latency keeps batch calls comparable with single ones.
+            try:
+                results = batch(file_paths)
+            except Exception as exc:
+                self._record(name, time.perf_counter() - started, exc)
+                # Clips fall back to the next providers, not one by one to
+                # the provider that just failed; it is only retried when
+                # there is no other.
+                candidates = candidates[1:] or candidates
+            else:
+                elapsed = (time.perf_counter() - started) / len(file_paths)
+                self._record(name, elapsed, None)
+                for result in results:
+                    result.provider = name
+                return results
+        return [self._transcribe(file_path, candidates) for file_path in file_paths]
+
+
+def _count_discarded_usage(future: Future) -> None:
+    if future.exception() is not None:
+        return
+    result = future.result()
+    if result.usage is None:
+        return
+    for kind, tokens in (
+        ("audio", result.usage.audio_tokens),
+        ("text", result.usage.text_tokens),
+        ("output", result.usage.output_tokens),
+    ):
+        STT_HEDGE_DISCARDED_TOKENS.labels(provider=result.provider, kind=kind).inc(
+            tokens
+        )
+
+
+def provider_order(primary: str, fallback_order: str) -> list[str]:
+    names = [primary] + [name.strip() for name in fallback_order.split(",")]
+    order: list[str] = []
+    for name in names:
+        if name and name in _PROVIDERS and name not in order:
+            order.append(name)
+    return order or ["openai_4o"]
+
+
+@lru_cache(maxsize=1)
+def get_stt_router() -> SttRouter:
+    settings = get_settings()
+    return SttRouter(
+        providers=_PROVIDERS,
+        batch_providers=_BATCH_PROVIDERS,
+        store=RedisHealthStore(redis.from_url(settings.redis_url)),
+        order=provider_order(settings.stt_provider, settings.stt_fallback_order),
+        hedge=settings.stt_hedge,
+        hedge_min_samples=settings.stt_hedge_min_samples,
+        breaker_failures=settings.stt_breaker_failures,
+        breaker_cooldown_s=settings.stt_breaker_cooldown_s,
+    )
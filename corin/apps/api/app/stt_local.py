@@ -0,0 +1,120 @@
+"""Local CPU transcription with faster-whisper (CTranslate2).
+
+``faster-whisper`` (1.2 or later) is an optional dependency, imported only
+when ``STT_PROVIDER=local``. The model is loaded once per process; run the
+worker with ``WORKER_SIMPLE=true`` so jobs share the worker's copy instead of
+reloading it in every forked work horse.
+"""
+
+from __future__ import annotations
+
+import bisect
+from functools import lru_cache
+
+import numpy as np
+
+from app.audio import AudioSource
+from app.config import get_settings
+from app.llm import TranscriptionResult, TranscriptionSegment
+
+_SAMPLE_RATE = 16000
+_MAX_WINDOW_SAMPLES = 30 * _SAMPLE_RATE
+
+
+@lru_cache(maxsize=1)
+def get_local_pipeline():
+    try:
+        from faster_whisper import BatchedInferencePipeline, WhisperModel
+    except ImportError as exc:
+        raise RuntimeError(
+            "STT_PROVIDER=local requires the faster-whisper package"
+        ) from exc
+    settings = get_settings()
+    model = WhisperModel(
+        settings.local_stt_model,
+        device="cpu",
+        compute_type=settings.local_stt_compute_type,
+        cpu_threads=settings.local_stt_cpu_threads,
+        download_root=settings.local_stt_model_dir,
+    )
+    return BatchedInferencePipeline(model=model)
+
+
+def _plan_windows(clip_samples: list[int]) -> tuple[list[int], list[tuple[int, int]]]:
+    """Clip start offsets in the concatenated audio, and decode windows of at
+    most 30 s that never cross a clip boundary (Whisper's context length)."""
+    offsets: list[int] = []
+    windows: list[tuple[int, int]] = []
+    position = 0
+    for samples in clip_samples:
+        offsets.append(position)
+        n_windows = -(-samples // _MAX_WINDOW_SAMPLES)
+        for index in range(n_windows):
+            windows.append(
+                (
+                    position + samples * index // n_windows,
+                    position + samples * (index + 1) // n_windows,
+                )
+            )
+        position += samples
+    return offsets, windows
+
+
+def _split_segments(
+    segments: list[tuple[float, float, str]],
+    offsets: list[int],
+    clip_samples: list[int],
+) -> list[TranscriptionResult]:
+    """Assign segments (absolute seconds) back to their clips, rebased to
+    each clip's own timeline."""
+    results = [TranscriptionResult(segments=[]) for _ in offsets]
+    for start_s, end_s, text in segments:
+        text = text.strip()
+        if not text:
+            continue
+        start_sample = int(round(start_s * _SAMPLE_RATE))
+        index = max(bisect.bisect_right(offsets, start_sample) - 1, 0)
+        clip_end_ms = clip_samples[index] * 1000 // _SAMPLE_RATE
+        offset_s = offsets[index] / _SAMPLE_RATE
+        results[index].segments.append(
+            TranscriptionSegment(
+                start_ms=max(int((start_s - offset_s) * 1000), 0),
+                end_ms=min(int((end_s - offset_s) * 1000), clip_end_ms),
+                text=text,
+            )
+        )
+    return results
+
+
+def transcribe_local_batch(file_paths: list[AudioSource]) -> list[TranscriptionResult]:
+    """Transcribe several clips in one batched decode. Clips are concatenated
+    and every ≤30 s window is a separate batch item, so short VAD clips fill
+    the batch instead of being decoded one by one."""
+    from faster_whisper import decode_audio
+
+    settings = get_settings()
+    audios = [decode_audio(path, sampling_rate=_SAMPLE_RATE) for path in file_paths]
+    clip_samples = [len(audio) for audio in audios]
+    offsets, windows = _plan_windows(clip_samples)
+    if not windows:
+        return [TranscriptionResult(segments=[]) for _ in file_paths]
+
+    segments, _info = get_local_pipeline().transcribe(
+        np.concatenate(audios),
+        language=settings.stt_language,
+        # Seconds: faster-whisper < 1.2 read these dicts as sample indices.
+        clip_timestamps=[
+            {"start": start / _SAMPLE_RATE, "end": end / _SAMPLE_RATE}
+            for start, end in windows
+        ],
+        batch_size=settings.local_stt_batch_size,
+        beam_size=settings.local_stt_beam_size,
+        without_timestamps=False,
+    )
+    return _split_segments(
+        [(seg.start, seg.end, seg.text) for seg in segments], offsets, clip_samples
+    )
+
+
+def transcribe_local(file_path: AudioSource) -> TranscriptionResult:
+    return transcribe_local_batch([file_path])[0]
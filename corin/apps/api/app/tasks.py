@@ -1,43 +1,76 @@
 from __future__ import annotations
 
+import io
 import tempfile
 import uuid
 from decimal import Decimal
 from pathlib import Path
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import func, select
+from rq import Queue
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.audio import (
-    extract_clip,
+    AudioSource,
     extract_normalized_wav,
+    generate_hls,
     generate_playable_m4a,
-    probe_duration_ms,
+    media_duration_ms,
+    read_wav_info,
+    read_wav_part,
 )
+from app.backlog import track_backlog
+from app.checkpoints import (
+    INGEST_STAGE,
+    VAD_STAGE,
+    input_hash,
+    load_checkpoint,
+    save_checkpoint,
+)
+from app.config import get_settings
 from app.db import SessionLocal
+from app.etags import touch_meeting
+from app.fairshare import clear_fair, refill_fair, submit_fair
+from app.fanout import TRANSCRIBE_STAGE, complete_fanout_member, start_fanout
+from app.hls import upload_hls
+from app.lifecycle import archive_normalized, collect_clips, fetch_normalized
 from app.llm import (
+    TranscriptionResult,
     embed_texts,
     summarize_map,
     summarize_reduce,
-    transcribe_audio_with_usage,
+    transcribe_batch_with_usage,
 )
 from app.models import (
     MediaAsset,
     Meeting,
     SegmentEmbedding,
     Summary,
-    TranscriptRevision,
     TranscriptSegment,
     VadSegment,
 )
-from app.queue import get_queue
+from app.peaks import compute_peaks
+from app.queue import (
+    FINALIZE_QUEUE,
+    INGEST_QUEUE,
+    LIFECYCLE_QUEUE,
+    TRANSCRIBE_QUEUE,
+    enqueue_once,
+    get_queue,
+    idempotency_key,
+    job_path,
+)
+from app.revisions import latest_revision_no, record_snapshot
 from app.storage import download_file, upload_fileobj
+from app.timing import timed_job, timed_stage
 from app.vad import detect_segments
 
 
 _MAX_TRANSCRIBE_BYTES = 25 * 1024 * 1024
 _SAFE_TRANSCRIBE_BYTES = 24 * 1024 * 1024
 _BYTES_PER_MS = 96
+_FANOUT_MAX_BATCH = 64
 
 
 def _iter_clip_parts(total_ms: int, max_part_ms: int) -> list[tuple[int, int]]:
@@ -74,13 +107,82 @@ def _compute_stt_cost(
     return input_cost + output_cost
 
 
-def _window_has_existing_segments(
-    segments: list[Any], window_start: int, window_end: int
-) -> bool:
-    for seg in segments:
-        if seg.start_ms >= window_start and seg.end_ms <= window_end:
-            return True
-    return False
+def _build_segment_rows(
+    meeting_uuid: uuid.UUID,
+    vad_segment_uuid: uuid.UUID,
+    part_start_ms: int,
+    window_start: int,
+    result: TranscriptionResult,
+) -> list[dict[str, Any]]:
+    rows = []
+    for part_seq, seg in enumerate(result.segments):
+        start_ms, end_ms = _remap_segment_times(
+            window_start, seg.start_ms, seg.end_ms
+        )
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "meeting_id": meeting_uuid,
+                "vad_segment_id": vad_segment_uuid,
+                "part_start_ms": part_start_ms,
+                "part_seq": part_seq,
+                "start_ms": start_ms,
+                "end_ms": end_ms,
+                "speaker_key": seg.speaker or "spk_1",
+                "text": seg.text.strip(),
+            }
+        )
+    return rows
+
+
+def _insert_transcript_rows(
+    session, rows: list[dict[str, Any]]
+) -> set[tuple[uuid.UUID, int]]:
+    """Insert segment rows; returns (VAD segment id, part start) of the parts
+    that got new rows. Parts an earlier attempt stored are skipped."""
+    if not rows:
+        return set()
+    stmt = (
+        pg_insert(TranscriptSegment)
+        .values(rows)
+        .on_conflict_do_nothing(
+            index_elements=[
+                TranscriptSegment.meeting_id,
+                TranscriptSegment.vad_segment_id,
+                TranscriptSegment.part_start_ms,
+                TranscriptSegment.part_seq,
+            ]
+        )
+        .returning(TranscriptSegment.vad_segment_id, TranscriptSegment.part_start_ms)
+    )
+    return {(row[0], row[1]) for row in session.execute(stmt)}
+
+
+def _new_usage(
+    parts: list[tuple[tuple[uuid.UUID, int], TranscriptionResult]],
+    inserted: set[tuple[uuid.UUID, int]],
+    input_usd_per_1m: float,
+    output_usd_per_1m: float,
+) -> tuple[int, int, int, Decimal]:
+    """Audio, text and output tokens and cost of the parts this attempt
+    stored. A part whose rows already existed was billed by the attempt that
+    stored them; a part without text has no rows and is always counted."""
+    audio_tokens = text_tokens = output_tokens = 0
+    cost = Decimal("0")
+    for part_key, result in parts:
+        if not result.usage or (result.segments and part_key not in inserted):
+            continue
+        audio_tokens += result.usage.audio_tokens
+        text_tokens += result.usage.text_tokens
+        output_tokens += result.usage.output_tokens
+        cost += _compute_stt_cost(
+            result.usage.audio_tokens,
+            result.usage.text_tokens,
+            result.usage.output_tokens,
+            input_usd_per_1m,
+            output_usd_per_1m,
+        )
+    return audio_tokens, text_tokens, output_tokens, cost
 
 
 def _update_progress(
@@ -92,15 +194,39 @@ def _update_progress(
     meeting.progress_json = payload
 
 
-def ingest_upload(meeting_id: str, original_object_key: str) -> None:
+@timed_job("ingest_upload")
+def ingest_upload(
+    meeting_id: str, original_object_key: str, live: bool = False
+) -> None:
+    """Normalize an uploaded recording and queue VAD.
+
+    Live recordings were already segmented and transcribed while streaming,
+    so for ``live`` only the media assets are produced and the meeting status
+    is left to the transcription jobs.
+
+    Each output (normalized + VAD tracks and waveform peaks, playable M4A) is
+    checkpointed once uploaded, so a re-run after a crash only produces what
+    is missing.
+    """
     meeting_uuid = uuid.UUID(meeting_id)
+    settings = get_settings()
+    inputs_hash = input_hash(original_object_key)
     with SessionLocal() as session:
         meeting = session.get(Meeting, meeting_uuid)
         if not meeting:
             return
-        meeting.status = "preprocessing"
-        _update_progress(meeting, "preprocessing", 5)
-        session.commit()
+        checkpoint = load_checkpoint(session, meeting_uuid, INGEST_STAGE, inputs_hash)
+        if checkpoint and checkpoint.completed_at:
+            # Already ingested; a crash may still have lost the VAD job.
+            if not live:
+                _enqueue_run_vad(meeting_id, original_object_key, None)
+            return
+        done = set(checkpoint.state_json.get("done", [])) if checkpoint else set()
+        if not live:
+            meeting.status = "preprocessing"
+            _update_progress(meeting, "preprocessing", 5)
+            with timed_stage("db"):
+                session.commit()
 
         asset = (
             session.execute(
@@ -109,45 +235,128 @@ def ingest_upload(meeting_id: str, original_object_key: str) -> None:
             .scalars()
             .first()
         )
+        if live and asset and asset.original_object_key != original_object_key:
+            # A reconnected stream has since replaced this recording with a
+            # longer one, which is ingested by its own job.
+            return
         if not asset:
             asset = MediaAsset(
                 meeting_id=meeting_uuid,
                 original_object_key=original_object_key,
             )
             session.add(asset)
-            session.commit()
+            with timed_stage("db"):
+                session.commit()
 
         with tempfile.TemporaryDirectory() as tmpdir:
             tmp_path = Path(tmpdir)
             original_path = tmp_path / "original"
             normalized_path = tmp_path / "normalized.wav"
+            vad_path = tmp_path / "vad-16k.wav"
             playable_path = tmp_path / "playable.m4a"
 
-            download_file(original_object_key, str(original_path))
-            extract_normalized_wav(str(original_path), str(normalized_path))
-            generate_playable_m4a(str(original_path), str(playable_path))
+            with timed_stage("download"):
+                download_file(original_object_key, str(original_path))
 
-            normalized_key = f"normalized/{meeting_id}/audio.wav"
-            playable_key = f"playable/{meeting_id}/audio.m4a"
+            if "normalized" not in done:
+                with timed_stage("ffmpeg"):
+                    extract_normalized_wav(
+                        str(original_path), str(normalized_path), str(vad_path)
+                    )
+                with timed_stage("peaks"):
+                    peaks = compute_peaks(str(normalized_path))
+                normalized_key = f"normalized/{meeting_id}/audio.wav"
+                vad_key = f"normalized/{meeting_id}/vad-16k.wav"
+                peaks_key = f"playable/{meeting_id}/peaks.bin"
+                with timed_stage("upload"):
+                    with open(normalized_path, "rb") as nf:
+                        upload_fileobj(normalized_key, nf, "audio/wav")
+                    with open(vad_path, "rb") as vf:
+                        upload_fileobj(vad_key, vf, "audio/wav")
+                    upload_fileobj(
+                        peaks_key, io.BytesIO(peaks), "application/octet-stream"
+                    )
+                asset.normalized_object_key = normalized_key
+                # A re-ingest replaces the WAV, so an older archive is stale.
+                asset.archive_object_key = None
+                asset.vad_object_key = vad_key
+                asset.peaks_object_key = peaks_key
+                asset.duration_ms = media_duration_ms(str(normalized_path))
+                done.add("normalized")
+                touch_meeting(session, meeting_uuid)
+                save_checkpoint(
+                    session,
+                    meeting_uuid,
+                    INGEST_STAGE,
+                    inputs_hash,
+                    {"done": sorted(done)},
+                )
+                with timed_stage("db"):
+                    session.commit()
 
-            with open(normalized_path, "rb") as nf:
-                upload_fileobj(normalized_key, nf, "audio/wav")
-            with open(playable_path, "rb") as pf:
-                upload_fileobj(playable_key, pf, "audio/mp4")
+            playable_key = f"playable/{meeting_id}/audio.m4a"
+            with timed_stage("ffmpeg"):
+                generate_playable_m4a(str(original_path), str(playable_path))
+            with timed_stage("upload"):
+                with open(playable_path, "rb") as pf:
+                    upload_fileobj(playable_key, pf, "audio/mp4")
 
-            asset.normalized_object_key = normalized_key
             asset.playable_object_key = playable_key
-            asset.duration_ms = probe_duration_ms(str(playable_path))
-            meeting.status = "vad"
-            _update_progress(meeting, "vad", 15)
-            session.commit()
+            if settings.hls_enabled:
+                hls_dir = tmp_path / "hls"
+                hls_dir.mkdir()
+                with timed_stage("ffmpeg"):
+                    generate_hls(
+                        str(playable_path), str(hls_dir), settings.hls_segment_s
+                    )
+                with timed_stage("upload"):
+                    asset.hls_object_key = upload_hls(
+                        str(hls_dir), f"playable/{meeting_id}/hls/"
+                    )
+            done.add("playable")
+            touch_meeting(session, meeting_uuid)
+            save_checkpoint(
+                session,
+                meeting_uuid,
+                INGEST_STAGE,
+                inputs_hash,
+                {"done": sorted(done)},
+                completed=True,
+            )
+            if not live:
+                meeting.status = "vad"
+                _update_progress(meeting, "vad", 15)
+            with timed_stage("db"):
+                session.commit()
 
-    queue = get_queue()
-    queue.enqueue(run_vad, meeting_id)
+    if live:
+        return
+    _enqueue_run_vad(meeting_id, original_object_key, asset.duration_ms)
 
 
+def _enqueue_run_vad(
+    meeting_id: str, original_object_key: str, duration_ms: int | None
+) -> None:
+    enqueue_once(
+        get_queue(INGEST_QUEUE),
+        idempotency_key(meeting_id, VAD_STAGE, original_object_key),
+        run_vad,
+        meeting_id,
+        backlog_ms=duration_ms or 0,
+    )
+
+
+@timed_job("run_vad")
 def run_vad(meeting_id: str) -> None:
+    """Detect speech, cut clips and submit the transcription jobs.
+
+    The VAD rows are committed together with a checkpoint listing them, and
+    the checkpoint then counts the jobs submitted so far. A re-run reuses
+    those rows instead of inserting duplicates, skips detection, and
+    continues with the first job that was not submitted.
+    """
     meeting_uuid = uuid.UUID(meeting_id)
+    settings = get_settings()
     with SessionLocal() as session:
         meeting = session.get(Meeting, meeting_uuid)
         if not meeting:
@@ -165,150 +374,333 @@ def run_vad(meeting_id: str) -> None:
             session.commit()
             return
 
+        inputs_hash = input_hash(asset.original_object_key)
+        checkpoint = load_checkpoint(session, meeting_uuid, VAD_STAGE, inputs_hash)
+        if checkpoint and checkpoint.completed_at:
+            return
+        queue = get_queue(TRANSCRIBE_QUEUE)
+
         with tempfile.TemporaryDirectory() as tmpdir:
             tmp_path = Path(tmpdir)
             normalized_path = tmp_path / "normalized.wav"
-            download_file(asset.normalized_object_key, str(normalized_path))
-
-            segments = detect_segments(str(normalized_path))
-            if not segments:
-                meeting.status = "failed"
-                _update_progress(meeting, "vad", 0, {"error": "no speech detected"})
-                session.commit()
-                return
-
-            vad_rows: list[VadSegment] = []
-            for segment in segments:
-                vad_row = VadSegment(
-                    meeting_id=meeting_uuid,
-                    start_ms=segment.start_ms,
-                    end_ms=segment.end_ms,
-                    padded_start_ms=segment.padded_start_ms,
-                    padded_end_ms=segment.padded_end_ms,
-                    energy_score=segment.energy_score,
+            fetch_normalized(asset, str(normalized_path))
+
+            if checkpoint:
+                state = checkpoint.state_json
+                vad_rows = _load_vad_rows(session, state["segment_ids"])
+                clips_per_job = state["clips_per_job"]
+                submitted = state["submitted"]
+            else:
+                # VAD runs on the 16 kHz track when ingest produced one;
+                # meetings ingested before that fall back to the 48 kHz
+                # normalized audio.
+                vad_path = normalized_path
+                if asset.vad_object_key:
+                    vad_path = tmp_path / "vad-16k.wav"
+                    with timed_stage("download"):
+                        download_file(asset.vad_object_key, str(vad_path))
+
+                with timed_stage("vad"):
+                    segments = detect_segments(
+                        str(vad_path),
+                        workers=settings.vad_workers,
+                        min_shard_ms=settings.vad_min_shard_s * 1000,
+                        shard_overlap_ms=settings.vad_shard_overlap_ms,
+                    )
+                if not segments:
+                    meeting.status = "failed"
+                    _update_progress(
+                        meeting, "vad", 0, {"error": "no speech detected"}
+                    )
+                    session.commit()
+                    return
+
+                # Ids and clip keys are assigned up front so every row goes
+                # in with one commit and the fan-out group is known before
+                # any job can finish.
+                vad_rows = []
+                for segment in segments:
+                    vad_id = uuid.uuid4()
+                    vad_rows.append(
+                        VadSegment(
+                            id=vad_id,
+                            meeting_id=meeting_uuid,
+                            start_ms=segment.start_ms,
+                            end_ms=segment.end_ms,
+                            padded_start_ms=segment.padded_start_ms,
+                            padded_end_ms=segment.padded_end_ms,
+                            energy_score=segment.energy_score,
+                            clip_object_key=f"clips/{meeting_id}/{vad_id}.wav",
+                        )
+                    )
+                # The local provider decodes several clips per batch, so
+                # its clips are grouped into one job each.
+                clips_per_job = (
+                    settings.local_stt_batch_clips
+                    if settings.stt_provider == "local"
+                    else 1
+                )
+                submitted = 0
+                session.add_all(vad_rows)
+                # The group is registered before the commit, so a crash
+                # after the commit cannot leave jobs without one. Each
+                # detection has fresh row ids and so is a run of its own.
+                clear_fair(queue.connection, meeting_id)
+                start_fanout(
+                    queue.connection,
+                    meeting_id,
+                    TRANSCRIBE_STAGE,
+                    [
+                        str(vad_rows[index].id)
+                        for index in range(0, len(vad_rows), clips_per_job)
+                    ],
+                    run_id=f"vad-{vad_rows[0].id}",
+                )
+                meeting.status = "transcribing"
+                _update_progress(
+                    meeting,
+                    "transcribing",
+                    30,
+                    {"segments": len(vad_rows)},
                 )
-                session.add(vad_row)
-                vad_rows.append(vad_row)
-            session.commit()
 
-            jobs = []
-            queue = get_queue()
-            for vad_row in vad_rows:
-                clip_path = tmp_path / f"segment-{vad_row.id}.wav"
-                extract_clip(
-                    str(normalized_path),
-                    str(clip_path),
-                    vad_row.padded_start_ms,
-                    vad_row.padded_end_ms,
+            segment_ids = [str(vad_row.id) for vad_row in vad_rows]
+            groups = [
+                vad_rows[index : index + clips_per_job]
+                for index in range(0, len(vad_rows), clips_per_job)
+            ]
+
+            def checkpoint_submitted() -> None:
+                save_checkpoint(
+                    session,
+                    meeting_uuid,
+                    VAD_STAGE,
+                    inputs_hash,
+                    {
+                        "segment_ids": segment_ids,
+                        "clips_per_job": clips_per_job,
+                        "submitted": submitted,
+                    },
+                    completed=submitted >= len(groups),
                 )
-                clip_key = f"clips/{meeting_id}/{vad_row.id}.wav"
-                with open(clip_path, "rb") as cf:
-                    upload_fileobj(clip_key, cf, "audio/wav")
-                vad_row.clip_object_key = clip_key
-                session.commit()
-                job = queue.enqueue(transcribe_vad_segment, meeting_id, str(vad_row.id))
-                jobs.append(job)
-
-            meeting.status = "transcribing"
-            _update_progress(
-                meeting,
-                "transcribing",
-                30,
-                {"segments": len(vad_rows)},
-            )
-            session.commit()
+                with timed_stage("db"):
+                    session.commit()
+
+            checkpoint_submitted()
+
+            # Jobs are submitted in batches as their clips are uploaded.
+            # Batches start at one job and double, so transcription starts
+            # with the first clip while later round trips are shared. They
+            # wait in the meeting's fair-share list and reach the transcribe
+            # queue in turn with other meetings' jobs.
+            pending: list = []
+            flush_at = 1
+            for group in groups[submitted:]:
+                for vad_row in group:
+                    # The normalized track is PCM WAV, so clips are cut by
+                    # byte range and uploaded from memory, not through ffmpeg.
+                    clip = read_wav_part(
+                        str(normalized_path),
+                        vad_row.padded_start_ms,
+                        vad_row.padded_end_ms,
+                    )
+                    with timed_stage("upload"):
+                        upload_fileobj(vad_row.clip_object_key, clip, "audio/wav")
+                pending.append(_transcription_job_data(meeting_id, group))
+                if len(pending) >= flush_at:
+                    _submit_transcription_jobs(queue, meeting_id, pending)
+                    submitted += len(pending)
+                    checkpoint_submitted()
+                    pending = []
+                    flush_at = min(flush_at * 2, _FANOUT_MAX_BATCH)
+            if pending:
+                _submit_transcription_jobs(queue, meeting_id, pending)
+                submitted += len(pending)
+                checkpoint_submitted()
+
+
+def _load_vad_rows(session, segment_ids: list[str]) -> list[VadSegment]:
+    ids = [uuid.UUID(segment_id) for segment_id in segment_ids]
+    by_id = {
+        vad_row.id: vad_row
+        for vad_row in session.execute(
+            select(VadSegment).where(VadSegment.id.in_(ids))
+        ).scalars()
+    }
+    return [by_id[vad_id] for vad_id in ids if vad_id in by_id]
+
+
+def _transcription_job_data(
+    meeting_id: str, group: list[VadSegment]
+) -> tuple[str, tuple, int]:
+    """(function path, args, audio ms) of the job transcribing ``group``."""
+    audio_ms = sum(row.padded_end_ms - row.padded_start_ms for row in group)
+    if len(group) == 1:
+        return (
+            job_path(transcribe_vad_segment),
+            (meeting_id, str(group[0].id)),
+            audio_ms,
+        )
+    return (
+        job_path(transcribe_vad_segments),
+        (meeting_id, [str(row.id) for row in group]),
+        audio_ms,
+    )
+
+
+def _submit_transcription_jobs(
+    queue: Queue, meeting_id: str, jobs: list[tuple[str, tuple, int]]
+) -> None:
+    metas = track_backlog(queue, [(path, audio_ms) for path, _, audio_ms in jobs])
+    submit_fair(
+        queue.connection,
+        meeting_id,
+        [(path, args, meta) for (path, args, _), meta in zip(jobs, metas)],
+    )
+    refill_fair(queue, get_settings().transcribe_queue_depth)
+
+
+def _meeting_audio_ms(session, meeting_uuid: uuid.UUID) -> int:
+    duration_ms = session.execute(
+        select(func.max(MediaAsset.duration_ms)).where(
+            MediaAsset.meeting_id == meeting_uuid
+        )
+    ).scalar()
+    return duration_ms or 0
+
+
+def _complete_transcription(meeting_id: str, member: str) -> None:
+    queue = get_queue(FINALIZE_QUEUE)
+    if complete_fanout_member(queue.connection, meeting_id, TRANSCRIBE_STAGE, member):
+        with SessionLocal() as session:
+            audio_ms = _meeting_audio_ms(session, uuid.UUID(meeting_id))
+        enqueue_once(
+            queue,
+            idempotency_key(meeting_id, "consolidate"),
+            consolidate_transcript,
+            meeting_id,
+            backlog_ms=audio_ms,
+        )
+
 
-            queue.enqueue(consolidate_transcript, meeting_id, depends_on=jobs)
+def _refill_transcribe_queue() -> None:
+    # Runs as each transcription job ends, successful or not, to admit the
+    # next meeting's job in turn.
+    refill_fair(get_queue(TRANSCRIBE_QUEUE), get_settings().transcribe_queue_depth)
 
 
+@timed_job("transcribe_vad_segment")
 def transcribe_vad_segment(meeting_id: str, segment_id: str) -> None:
+    try:
+        _transcribe_vad_rows(meeting_id, [segment_id])
+        _complete_transcription(meeting_id, segment_id)
+    finally:
+        _refill_transcribe_queue()
+
+
+@timed_job("transcribe_vad_segments")
+def transcribe_vad_segments(meeting_id: str, segment_ids: list[str]) -> None:
+    try:
+        _transcribe_vad_rows(meeting_id, segment_ids)
+        _complete_transcription(meeting_id, segment_ids[0])
+    finally:
+        _refill_transcribe_queue()
+
+
+def _transcribe_vad_rows(meeting_id: str, segment_ids: list[str]) -> None:
     meeting_uuid = uuid.UUID(meeting_id)
-    segment_uuid = uuid.UUID(segment_id)
     with SessionLocal() as session:
-        from app.config import get_settings
-
         settings = get_settings()
-        meeting = session.get(Meeting, meeting_uuid)
-        if meeting:
-            meeting.stt_provider = settings.stt_provider
-            session.commit()
-
-        vad_row = session.get(VadSegment, segment_uuid)
-        if not vad_row or not vad_row.clip_object_key:
+        vad_rows = [
+            vad_row
+            for vad_row in (
+                session.get(VadSegment, uuid.UUID(segment_id))
+                for segment_id in segment_ids
+            )
+            if vad_row and vad_row.clip_object_key
+        ]
+        if not vad_rows:
             return
 
         with tempfile.TemporaryDirectory() as tmpdir:
-            clip_path = Path(tmpdir) / "clip.wav"
-            download_file(vad_row.clip_object_key, str(clip_path))
-            clip_duration_ms = probe_duration_ms(str(clip_path))
-            fallback_ms = vad_row.padded_end_ms - vad_row.padded_start_ms
-            total_ms = clip_duration_ms or fallback_ms
-            max_part_ms = int(_SAFE_TRANSCRIBE_BYTES / _BYTES_PER_MS)
-
-            usage_audio_tokens = 0
-            usage_text_tokens = 0
-            usage_output_tokens = 0
-            total_cost = Decimal("0")
-
-            for part_start_ms, part_end_ms in _iter_clip_parts(total_ms, max_part_ms):
-                window_start = vad_row.padded_start_ms + part_start_ms
-                window_end = vad_row.padded_start_ms + part_end_ms
-                existing_segments = (
-                    session.execute(
-                        select(TranscriptSegment)
-                        .where(TranscriptSegment.meeting_id == meeting_uuid)
-                        .where(TranscriptSegment.start_ms >= window_start)
-                        .where(TranscriptSegment.end_ms <= window_end)
-                    )
-                    .scalars()
-                    .all()
-                )
-                if _window_has_existing_segments(
-                    existing_segments, window_start, window_end
-                ):
-                    continue
-
-                part_path = clip_path
-                if part_start_ms != 0 or part_end_ms != total_ms:
-                    part_path = Path(tmpdir) / f"clip-{part_start_ms}-{part_end_ms}.wav"
-                    extract_clip(
-                        str(clip_path),
-                        str(part_path),
-                        part_start_ms,
-                        part_end_ms,
+            # (vad row, part start within the clip, audio) for every part of
+            # every clip; all parts go to the provider in one batch call.
+            # Oversized clips are split into in-memory WAV parts read straight
+            # from the downloaded file, without ffmpeg or temp files.
+            parts: list[tuple[VadSegment, int, AudioSource]] = []
+            for vad_row in vad_rows:
+                clip_path = Path(tmpdir) / f"clip-{vad_row.id}.wav"
+                with timed_stage("download"):
+                    download_file(vad_row.clip_object_key, str(clip_path))
+                # Clips are always WAV, so the header gives the exact length
+                # without an ffprobe subprocess per clip.
+                clip_info = read_wav_info(str(clip_path))
+                bytes_per_ms = _BYTES_PER_MS
+                total_ms = vad_row.padded_end_ms - vad_row.padded_start_ms
+                if clip_info and clip_info.sample_rate:
+                    total_ms = clip_info.duration_ms
+                    bytes_per_ms = (
+                        clip_info.sample_rate
+                        * clip_info.channels
+                        * clip_info.sample_width
+                        / 1000
                     )
+                max_part_ms = int(_SAFE_TRANSCRIBE_BYTES / bytes_per_ms)
 
-                result = transcribe_audio_with_usage(str(part_path))
-                for seg in result.segments:
-                    start_ms, end_ms = _remap_segment_times(
-                        window_start, seg.start_ms, seg.end_ms
-                    )
-                    session.add(
-                        TranscriptSegment(
-                            meeting_id=meeting_uuid,
-                            start_ms=start_ms,
-                            end_ms=end_ms,
-                            speaker_key=seg.speaker or "spk_1",
-                            text=seg.text.strip(),
+                for part_start_ms, part_end_ms in _iter_clip_parts(
+                    total_ms, max_part_ms
+                ):
+                    part: AudioSource = str(clip_path)
+                    if part_start_ms != 0 or part_end_ms != total_ms:
+                        part = read_wav_part(
+                            str(clip_path),
+                            part_start_ms,
+                            part_end_ms,
+                            name=f"clip-{part_start_ms}-{part_end_ms}.wav",
                         )
+                    parts.append((vad_row, part_start_ms, part))
+
+            with timed_stage("stt"):
+                results = transcribe_batch_with_usage([part for _, _, part in parts])
+
+            # Buffered for a single INSERT; the unique part key makes a re-run
+            # of the same job a no-op instead of duplicating segments.
+            segment_rows: list[dict[str, Any]] = []
+            for (vad_row, part_start_ms, _), result in zip(parts, results):
+                segment_rows.extend(
+                    _build_segment_rows(
+                        meeting_uuid,
+                        vad_row.id,
+                        part_start_ms,
+                        vad_row.padded_start_ms + part_start_ms,
+                        result,
                     )
-                session.commit()
-
-                if result.usage:
-                    usage_audio_tokens += result.usage.audio_tokens
-                    usage_text_tokens += result.usage.text_tokens
-                    usage_output_tokens += result.usage.output_tokens
-                    total_cost += _compute_stt_cost(
-                        result.usage.audio_tokens,
-                        result.usage.text_tokens,
-                        result.usage.output_tokens,
-                        settings.openai_transcribe_input_usd_per_1m,
-                        settings.openai_transcribe_output_usd_per_1m,
-                    )
+                )
 
-            if usage_audio_tokens or usage_text_tokens or usage_output_tokens:
+            with timed_stage("db"):
+                inserted = _insert_transcript_rows(session, segment_rows)
                 meeting = session.get(Meeting, meeting_uuid)
-                if meeting:
+            # Usage is only added with the rows it produced, so a retried or
+            # duplicate job does not bill the meeting twice.
+            usage_audio_tokens, usage_text_tokens, usage_output_tokens, total_cost = (
+                _new_usage(
+                    [
+                        ((vad_row.id, part_start_ms), result)
+                        for (vad_row, part_start_ms, _), result in zip(parts, results)
+                    ],
+                    inserted,
+                    settings.openai_transcribe_input_usd_per_1m,
+                    settings.openai_transcribe_output_usd_per_1m,
+                )
+            )
+            if meeting:
+                # Fallback or hedging may have served some parts elsewhere;
+                # record the provider that actually answered.
+                meeting.stt_provider = next(
+                    (r.provider for r in reversed(results) if r.provider),
+                    settings.stt_provider,
+                )
+                if usage_audio_tokens or usage_text_tokens or usage_output_tokens:
                     meeting.stt_audio_tokens = (
                         meeting.stt_audio_tokens or 0
                     ) + usage_audio_tokens
@@ -324,48 +716,11 @@ def transcribe_vad_segment(meeting_id: str, segment_id: str) -> None:
                         else Decimal("0")
                     )
                     meeting.stt_cost_usd = current_cost + total_cost
-                    session.commit()
-
-
-def _snapshot_transcript(session, meeting_uuid: uuid.UUID) -> None:
-    segments = (
-        session.execute(
-            select(TranscriptSegment)
-            .where(TranscriptSegment.meeting_id == meeting_uuid)
-            .order_by(TranscriptSegment.start_ms.asc())
-        )
-        .scalars()
-        .all()
-    )
-    snapshot = [
-        {
-            "id": str(seg.id),
-            "start_ms": seg.start_ms,
-            "end_ms": seg.end_ms,
-            "speaker_key": seg.speaker_key,
-            "text": seg.text,
-        }
-        for seg in segments
-    ]
-    latest_rev = (
-        session.execute(
-            select(TranscriptRevision)
-            .where(TranscriptRevision.meeting_id == meeting_uuid)
-            .order_by(TranscriptRevision.revision_no.desc())
-        )
-        .scalars()
-        .first()
-    )
-    next_rev = 1 if not latest_rev else latest_rev.revision_no + 1
-    session.add(
-        TranscriptRevision(
-            meeting_id=meeting_uuid,
-            revision_no=next_rev,
-            snapshot_json={"segments": snapshot},
-        )
-    )
+            with timed_stage("db"):
+                session.commit()
 
 
+@timed_job("consolidate_transcript")
 def consolidate_transcript(meeting_id: str) -> None:
     meeting_uuid = uuid.UUID(meeting_id)
     with SessionLocal() as session:
@@ -375,19 +730,105 @@ def consolidate_transcript(meeting_id: str) -> None:
         meeting.status = "summarizing"
         _update_progress(meeting, "summarizing", 65)
 
-        _snapshot_transcript(session, meeting_uuid)
+        with timed_stage("db"):
+            record_snapshot(session, meeting_uuid)
+
+            segments = (
+                session.execute(
+                    select(TranscriptSegment)
+                    .where(TranscriptSegment.meeting_id == meeting_uuid)
+                    .order_by(TranscriptSegment.start_ms.asc())
+                )
+                .scalars()
+                .all()
+            )
+        if segments:
+            with timed_stage("llm"):
+                embeddings = embed_texts([seg.text for seg in segments])
+            for seg, emb in zip(segments, embeddings, strict=False):
+                session.add(
+                    SegmentEmbedding(
+                        meeting_id=meeting_uuid,
+                        segment_id=seg.id,
+                        embedding=emb,
+                    )
+                )
+        with timed_stage("db"):
+            session.commit()
+
+    enqueue_summary(meeting_id)
+    enqueue_once(
+        get_queue(LIFECYCLE_QUEUE),
+        idempotency_key(meeting_id, "lifecycle"),
+        collect_intermediates,
+        meeting_id,
+    )
+
+
+@timed_job("collect_intermediates")
+def collect_intermediates(meeting_id: str) -> None:
+    """Delete a consolidated meeting's clips and archive its normalized
+    audio (see ``app.lifecycle``)."""
+    meeting_uuid = uuid.UUID(meeting_id)
+    settings = get_settings()
+    with SessionLocal() as session:
+        meeting = session.get(Meeting, meeting_uuid)
+        if not meeting or meeting.deleted_at:
+            return
+        collect_clips(session, meeting_uuid)
+        with timed_stage("db"):
+            session.commit()
+        if not settings.archive_normalized:
+            return
+        # Live meetings may be consolidated before their ingest has written
+        # the normalized audio; the lifecycle sweep archives it later.
+        assets = (
+            session.execute(
+                select(MediaAsset).where(MediaAsset.meeting_id == meeting_uuid)
+            )
+            .scalars()
+            .all()
+        )
+        for asset in assets:
+            archive_normalized(session, asset)
+
+
+def enqueue_summary(meeting_id: str) -> None:
+    """Queue a summary of the current transcript revision; repeated requests
+    for the same revision share one job."""
+    meeting_uuid = uuid.UUID(meeting_id)
+    with SessionLocal() as session:
+        revision_no = latest_revision_no(session, meeting_uuid)
+        audio_ms = _meeting_audio_ms(session, meeting_uuid)
+    enqueue_once(
+        get_queue(FINALIZE_QUEUE),
+        idempotency_key(meeting_id, "summarize", revision_no),
+        summarize_meeting,
+        meeting_id,
+        backlog_ms=audio_ms,
+    )
+
 
+@timed_job("reembed_segments")
+def reembed_segments(meeting_id: str, segment_ids: list[str]) -> None:
+    meeting_uuid = uuid.UUID(meeting_id)
+    segment_uuids = [uuid.UUID(segment_id) for segment_id in segment_ids]
+    with SessionLocal() as session:
         segments = (
             session.execute(
                 select(TranscriptSegment)
                 .where(TranscriptSegment.meeting_id == meeting_uuid)
-                .order_by(TranscriptSegment.start_ms.asc())
+                .where(TranscriptSegment.id.in_(segment_uuids))
             )
             .scalars()
             .all()
         )
+        session.query(SegmentEmbedding).filter(
+            SegmentEmbedding.segment_id.in_(segment_uuids)
+        ).delete(synchronize_session=False)
         if segments:
-            embeddings = embed_texts([seg.text for seg in segments])
+            with timed_stage("llm"):
+                embeddings = embed_texts([seg.text for seg in segments])
             for seg, emb in zip(segments, embeddings, strict=False):
                 session.add(
                     SegmentEmbedding(
@@ -398,10 +839,8 @@ def consolidate_transcript(meeting_id: str) -> None:
                 )
         session.commit()
 
-    queue = get_queue()
-    queue.enqueue(summarize_meeting, meeting_id)
-
 
+@timed_job("summarize_meeting")
 def summarize_meeting(meeting_id: str) -> None:
     meeting_uuid = uuid.UUID(meeting_id)
     with SessionLocal() as session:
@@ -431,12 +870,13 @@ def summarize_meeting(meeting_id: str) -> None:
         if current:
             chunks.append("\n".join(current))
 
-        partials = [summarize_map(chunk) for chunk in chunks] if chunks else []
-        summary = (
-            summarize_reduce(partials)
-            if partials
-            else {"work_summary": {}, "timeline": []}
-        )
+        with timed_stage("llm"):
+            partials = [summarize_map(chunk) for chunk in chunks] if chunks else []
+            summary = (
+                summarize_reduce(partials)
+                if partials
+                else {"work_summary": {}, "timeline": []}
+            )
 
         session.query(Summary).filter(Summary.meeting_id == meeting_uuid).delete()
         work_summary = summary.get("work_summary", {})
@@ -453,4 +893,5 @@ def summarize_meeting(meeting_id: str) -> None:
         )
         meeting.status = "done"
         _update_progress(meeting, "done", 100)
-        session.commit()
+        with timed_stage("db"):
+            session.commit()
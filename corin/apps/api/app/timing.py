@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import functools
+import logging
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from opentelemetry import trace
+from rq import get_current_job
+
+from app.backlog import settle_backlog
+from app.metrics import PIPELINE_STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+_tracer = trace.get_tracer("corin.pipeline")
+_current: ContextVar[JobTimer | None] = ContextVar("corin_job_timer", default=None)
+
+
+@dataclass
+class JobTimer:
+    job: str
+    meeting_id: str
+    rq_job_id: str | None = None
+    records: list[tuple[str, float]] = field(default_factory=list)
+
+    def record(self, stage_name: str, seconds: float) -> None:
+        self.records.append((stage_name, seconds))
+        PIPELINE_STAGE_SECONDS.labels(job=self.job, stage=stage_name).observe(seconds)
+
+    def flush(self) -> None:
+        if not self.records:
+            return
+        from app.db import SessionLocal
+        from app.models import PipelineTiming
+
+        with SessionLocal() as session:
+            session.add_all(
+                PipelineTiming(
+                    meeting_id=uuid.UUID(self.meeting_id),
+                    job=self.job,
+                    rq_job_id=self.rq_job_id,
+                    stage=stage_name,
+                    duration_ms=int(seconds * 1000),
+                )
+                for stage_name, seconds in self.records
+            )
+            session.commit()
+        self.records.clear()
+
+
+@contextmanager
+def timed_stage(name: str) -> Iterator[None]:
+    """Time a pipeline stage of the running job; a no-op outside timed jobs."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    with _tracer.start_as_current_span(
+        f"{timer.job}.{name}", attributes={"corin.meeting_id": timer.meeting_id}
+    ):
+        try:
+            yield
+        finally:
+            timer.record(name, time.perf_counter() - started)
+
+
+def _queue_wait_seconds() -> tuple[str | None, float | None]:
+    job = get_current_job()
+    if job is None:
+        return None, None
+    if job.enqueued_at is None or job.started_at is None:
+        return job.id, None
+    return job.id, max((job.started_at - job.enqueued_at).total_seconds(), 0.0)
+
+
+def timed_job(name: str) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    """Record queue wait and stage timings for a job whose first argument is
+    the meeting id. Timings are persisted even when the job raises."""
+
+    def decorator(func: Callable[..., None]) -> Callable[..., None]:
+        @functools.wraps(func)
+        def wrapper(meeting_id: str, *args, **kwargs) -> None:
+            started = time.perf_counter()
+            rq_job_id, wait_seconds = _queue_wait_seconds()
+            timer = JobTimer(job=name, meeting_id=meeting_id, rq_job_id=rq_job_id)
+            if wait_seconds is not None:
+                timer.record("queue_wait", wait_seconds)
+            token = _current.set(timer)
+            try:
+                with _tracer.start_as_current_span(
+                    name, attributes={"corin.meeting_id": meeting_id}
+                ):
+                    return func(meeting_id, *args, **kwargs)
+            finally:
+                _current.reset(token)
+                # Bookkeeping must neither fail a job that succeeded nor
+                # replace the exception of one that failed.
+                try:
+                    timer.flush()
+                except Exception:
+                    logger.exception("could not store timings of %s", name)
+                job = get_current_job()
+                if job is not None:
+                    try:
+                        settle_backlog(job, time.perf_counter() - started)
+                    except Exception:
+                        logger.exception("could not settle backlog of %s", job.id)
+
+        return wrapper
+
+    return decorator
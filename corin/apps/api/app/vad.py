@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 
 import wave
 
+import numpy as np
 import webrtcvad
 
+_RMS_BLOCK_FRAMES = 4096
+# Share of the recording whose speech/non-speech classification a sharded
+# ``detect_segments`` may change compared with a serial pass.
+SHARD_SEAM_TOLERANCE = 0.01
+
 
 @dataclass
 class VadSegmentResult:
@@ -16,15 +24,6 @@ class VadSegmentResult:
     energy_score: float | None = None
 
 
-def _read_wave(path: str) -> tuple[bytes, int]:
-    with wave.open(path, "rb") as wf:
-        if wf.getsampwidth() != 2:
-            raise ValueError("Only 16-bit PCM WAV is supported")
-        sample_rate = wf.getframerate()
-        audio = wf.readframes(wf.getnframes())
-    return audio, sample_rate
-
-
 def _frame_generator(frame_ms: int, audio: bytes, sample_rate: int):
     frame_bytes = int(sample_rate * (frame_ms / 1000.0) * 2)
     offset = 0
@@ -36,6 +35,245 @@ def _frame_generator(frame_ms: int, audio: bytes, sample_rate: int):
         offset += frame_bytes
 
 
+class StreamingVad:
+    """Incremental VAD over a live PCM stream.
+
+    Applies the same frame, merge, min-length and padding rules as
+    ``detect_segments`` and returns each segment as soon as no later speech
+    can merge into it and its trailing padding has been received.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        frame_ms: int = 30,
+        aggressiveness: int = 0,
+        min_segment_ms: int = 300,
+        merge_gap_ms: int = 200,
+        pad_ms: int = 250,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.min_segment_ms = min_segment_ms
+        self.merge_gap_ms = merge_gap_ms
+        self.pad_ms = pad_ms
+        self._vad = webrtcvad.Vad(aggressiveness)
+        self._frame_bytes = int(sample_rate * (frame_ms / 1000.0) * 2)
+        self._pending = b""
+        self._total_bytes = 0
+        self._position_ms = 0
+        self._triggered = False
+        self._run_start_ms = 0
+        self._merged: list[list[int]] = []
+        self._rms_cumsum = [0.0]
+
+    def feed(self, chunk: bytes) -> list[VadSegmentResult]:
+        self._total_bytes += len(chunk)
+        audio = self._pending + chunk
+        usable = len(audio) - len(audio) % self._frame_bytes
+        self._pending = audio[usable:]
+        for frame_bytes, timestamp_ms, duration_ms in _frame_generator(
+            self.frame_ms, audio[:usable], self.sample_rate
+        ):
+            timestamp_ms += self._position_ms
+            frame = np.frombuffer(frame_bytes, dtype="<i2").astype(np.float32)
+            self._rms_cumsum.append(
+                self._rms_cumsum[-1]
+                + float(np.sqrt(np.dot(frame, frame) / len(frame)) / 32768.0)
+            )
+            is_speech = self._vad.is_speech(frame_bytes, self.sample_rate)
+            if is_speech and not self._triggered:
+                self._triggered = True
+                self._run_start_ms = timestamp_ms
+            if self._triggered and not is_speech:
+                self._close_run(self._run_start_ms, timestamp_ms + duration_ms)
+                self._triggered = False
+        self._position_ms += (usable // self._frame_bytes) * self.frame_ms
+        return self._emit(final=False)
+
+    def finish(self) -> list[VadSegmentResult]:
+        if self._triggered:
+            self._close_run(self._run_start_ms, self._position_ms)
+            self._triggered = False
+        return self._emit(final=True)
+
+    def _close_run(self, start_ms: int, end_ms: int) -> None:
+        if self._merged and start_ms - self._merged[-1][1] < self.merge_gap_ms:
+            self._merged[-1][1] = end_ms
+            return
+        self._merged.append([start_ms, end_ms])
+
+    def _can_still_grow(self, end_ms: int) -> bool:
+        if self._triggered and self._run_start_ms - end_ms < self.merge_gap_ms:
+            return True
+        return self._position_ms - end_ms < self.merge_gap_ms
+
+    def _emit(self, final: bool) -> list[VadSegmentResult]:
+        audio_length_ms = int(self._total_bytes / 2 / self.sample_rate * 1000)
+        results: list[VadSegmentResult] = []
+        while self._merged:
+            start_ms, end_ms = self._merged[0]
+            if not final:
+                if len(self._merged) == 1 and self._can_still_grow(end_ms):
+                    break
+                if self._position_ms < end_ms + self.pad_ms:
+                    break
+            self._merged.pop(0)
+            if end_ms - start_ms < self.min_segment_ms:
+                continue
+            first = start_ms // self.frame_ms
+            last = end_ms // self.frame_ms
+            energy = (self._rms_cumsum[last] - self._rms_cumsum[first]) / max(
+                last - first, 1
+            )
+            results.append(
+                VadSegmentResult(
+                    start_ms=start_ms,
+                    end_ms=end_ms,
+                    padded_start_ms=max(start_ms - self.pad_ms, 0),
+                    padded_end_ms=min(end_ms + self.pad_ms, audio_length_ms),
+                    energy_score=round(energy, 6),
+                )
+            )
+        return results
+
+
+def _frame_matrix(pcm: np.ndarray, sample_rate: int, frame_ms: int) -> np.ndarray:
+    frame_len = int(sample_rate * frame_ms / 1000)
+    n_frames = len(pcm) // frame_len
+    return pcm[: n_frames * frame_len].reshape(n_frames, frame_len)
+
+
+def _frame_rms(frames: np.ndarray) -> np.ndarray:
+    """RMS per frame normalized to 0..1, computed in blocks to bound the
+    float working set for multi-hour recordings."""
+    energy = np.empty(len(frames), dtype=np.float32)
+    for block_start in range(0, len(frames), _RMS_BLOCK_FRAMES):
+        block = frames[block_start : block_start + _RMS_BLOCK_FRAMES].astype(
+            np.float32
+        )
+        energy[block_start : block_start + len(block)] = np.einsum(
+            "ij,ij->i", block, block
+        )
+    if len(frames) == 0:
+        return energy
+    return np.sqrt(energy / frames.shape[1]) / 32768.0
+
+
+def _speech_flags(
+    frames: np.ndarray, sample_rate: int, aggressiveness: int
+) -> np.ndarray:
+    vad = webrtcvad.Vad(aggressiveness)
+    if len(frames) == 0:
+        return np.zeros(0, dtype=bool)
+    frame_bytes = frames.shape[1] * 2
+    buffer = memoryview(np.ascontiguousarray(frames)).cast("B")
+    return np.fromiter(
+        (
+            vad.is_speech(buffer[offset : offset + frame_bytes], sample_rate)
+            for offset in range(0, len(buffer), frame_bytes)
+        ),
+        dtype=bool,
+        count=len(frames),
+    )
+
+
+def _flags_to_runs(flags: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Frame index ranges of speech runs. A run closes on the first
+    non-speech frame, which is included in the run as in the frame loop."""
+    edges = np.diff(np.concatenate(([0], flags.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    ends = np.minimum(stops + 1, len(flags))
+    return starts, ends
+
+
+def _merge_runs(
+    starts_ms: np.ndarray, ends_ms: np.ndarray, merge_gap_ms: int
+) -> tuple[np.ndarray, np.ndarray]:
+    if len(starts_ms) == 0:
+        return starts_ms, ends_ms
+    gaps = starts_ms[1:] - ends_ms[:-1]
+    opens_group = np.concatenate(([True], gaps >= merge_gap_ms))
+    closes_group = np.concatenate((opens_group[1:], [True]))
+    return starts_ms[opens_group], ends_ms[closes_group]
+
+
+def _segments_from_flags(
+    flags: np.ndarray,
+    rms: np.ndarray,
+    frame_ms: int,
+    audio_length_ms: int,
+    min_segment_ms: int,
+    merge_gap_ms: int,
+    pad_ms: int,
+) -> list[VadSegmentResult]:
+    start_frames, end_frames = _flags_to_runs(flags)
+    starts_ms, ends_ms = _merge_runs(
+        start_frames * frame_ms, end_frames * frame_ms, merge_gap_ms
+    )
+    keep = (ends_ms - starts_ms) >= min_segment_ms
+    starts_ms = starts_ms[keep]
+    ends_ms = ends_ms[keep]
+    if len(starts_ms) == 0:
+        return []
+
+    padded_starts = np.maximum(starts_ms - pad_ms, 0)
+    padded_ends = np.minimum(ends_ms + pad_ms, audio_length_ms)
+    rms_cumsum = np.concatenate(([0.0], np.cumsum(rms, dtype=np.float64)))
+    first = starts_ms // frame_ms
+    last = ends_ms // frame_ms
+    energies = (rms_cumsum[last] - rms_cumsum[first]) / np.maximum(last - first, 1)
+
+    return [
+        VadSegmentResult(
+            start_ms=int(start),
+            end_ms=int(end),
+            padded_start_ms=int(padded_start),
+            padded_end_ms=int(padded_end),
+            energy_score=round(float(energy), 6),
+        )
+        for start, end, padded_start, padded_end, energy in zip(
+            starts_ms, ends_ms, padded_starts, padded_ends, energies
+        )
+    ]
+
+
+def _plan_shards(
+    n_frames: int, workers: int, min_shard_frames: int
+) -> list[tuple[int, int]]:
+    shard_count = max(1, min(workers, n_frames // max(min_shard_frames, 1)))
+    bounds = np.linspace(0, n_frames, shard_count + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _analyze_shard(
+    wav_path: str,
+    frame_ms: int,
+    aggressiveness: int,
+    start_frame: int,
+    end_frame: int,
+    warmup_frames: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Speech flags and frame RMS for ``[start_frame, end_frame)``. The
+    detector first runs over up to ``warmup_frames`` earlier frames so its
+    adaptive noise estimate has settled when the shard begins."""
+    with wave.open(wav_path, "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError("Only 16-bit PCM WAV is supported")
+        sample_rate = wf.getframerate()
+        frame_len = int(sample_rate * frame_ms / 1000)
+        first_frame = max(start_frame - warmup_frames, 0)
+        wf.setpos(first_frame * frame_len)
+        pcm = np.frombuffer(
+            wf.readframes((end_frame - first_frame) * frame_len), dtype="<i2"
+        )
+    frames = _frame_matrix(pcm, sample_rate, frame_ms)
+    skip = start_frame - first_frame
+    flags = _speech_flags(frames, sample_rate, aggressiveness)[skip:]
+    return flags, _frame_rms(frames[skip:])
+
+
 def detect_segments(
     wav_path: str,
     frame_ms: int = 30,
@@ -43,51 +281,62 @@ def detect_segments(
     min_segment_ms: int = 300,
     merge_gap_ms: int = 200,
     pad_ms: int = 250,
+    workers: int = 1,
+    min_shard_ms: int = 600_000,
+    shard_overlap_ms: int = 30_000,
 ) -> list[VadSegmentResult]:
-    audio, sample_rate = _read_wave(wav_path)
-    vad = webrtcvad.Vad(aggressiveness)
-    segments: list[tuple[int, int]] = []
-    triggered = False
-    start_ms = 0
-
-    for frame_bytes, timestamp_ms, duration_ms in _frame_generator(
-        frame_ms, audio, sample_rate
-    ):
-        is_speech = vad.is_speech(frame_bytes, sample_rate)
-        if is_speech and not triggered:
-            triggered = True
-            start_ms = timestamp_ms
-        if triggered and not is_speech:
-            end_ms = timestamp_ms + duration_ms
-            segments.append((start_ms, end_ms))
-            triggered = False
-
-    if triggered:
-        segments.append((start_ms, timestamp_ms + duration_ms))
-
-    if not segments:
-        return []
+    """Detect speech segments in a 16-bit PCM WAV.
 
-    merged: list[tuple[int, int]] = []
-    for seg_start, seg_end in segments:
-        if merged and seg_start - merged[-1][1] < merge_gap_ms:
-            merged[-1] = (merged[-1][0], seg_end)
-            continue
-        merged.append((seg_start, seg_end))
-
-    filtered = [seg for seg in merged if (seg[1] - seg[0]) >= min_segment_ms]
-
-    audio_length_ms = int(len(audio) / 2 / sample_rate * 1000)
-    results: list[VadSegmentResult] = []
-    for seg_start, seg_end in filtered:
-        padded_start = max(seg_start - pad_ms, 0)
-        padded_end = min(seg_end + pad_ms, audio_length_ms)
-        results.append(
-            VadSegmentResult(
-                start_ms=seg_start,
-                end_ms=seg_end,
-                padded_start_ms=padded_start,
-                padded_end_ms=padded_end,
-            )
+    With ``workers`` > 1, recordings longer than ``min_shard_ms`` per shard
+    are split into time shards analysed in a process pool. Shards start
+    ``shard_overlap_ms`` early to warm up the detector; run detection,
+    merging and padding then happen once over the stitched frame flags, so
+    segments spanning shard boundaries follow the same ``merge_gap_ms`` rules
+    as a serial run. ``workers=0`` uses every CPU.
+
+    Sharded results are close to, not equal to, a serial pass: webrtcvad's
+    adaptive noise model depends on all earlier audio, and after a seam the
+    warmed-up detector can still classify some frames differently up to the
+    end of the shard. Within ``SHARD_SEAM_TOLERANCE`` of the recording may
+    change class, which can move, split or merge segments after a seam.
+    ``workers=1`` (the default) is exact.
+    """
+    with wave.open(wav_path, "rb") as wf:
+        sample_rate = wf.getframerate()
+        n_samples = wf.getnframes()
+    frame_len = int(sample_rate * frame_ms / 1000)
+    n_frames = n_samples // frame_len
+    audio_length_ms = int(n_samples / sample_rate * 1000)
+
+    workers = workers or os.cpu_count() or 1
+    shards = _plan_shards(n_frames, workers, min_shard_ms // frame_ms)
+    if len(shards) == 1:
+        flags, rms = _analyze_shard(
+            wav_path, frame_ms, aggressiveness, 0, n_frames, 0
         )
-    return results
+    else:
+        warmup_frames = shard_overlap_ms // frame_ms
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            results = list(
+                pool.map(
+                    _analyze_shard,
+                    [wav_path] * len(shards),
+                    [frame_ms] * len(shards),
+                    [aggressiveness] * len(shards),
+                    [start for start, _ in shards],
+                    [end for _, end in shards],
+                    [warmup_frames] * len(shards),
+                )
+            )
+        flags = np.concatenate([shard_flags for shard_flags, _ in results])
+        rms = np.concatenate([shard_rms for _, shard_rms in results])
+
+    return _segments_from_flags(
+        flags,
+        rms,
+        frame_ms,
+        audio_length_ms,
+        min_segment_ms,
+        merge_gap_ms,
+        pad_ms,
+    )
@@ -1,7 +1,14 @@
-from fastapi import FastAPI
+import redis
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import REGISTRY
 
+from app.backlog import BacklogCollector
+from app.config import get_settings
 from app.db import init_db
+from app.metrics import render_metrics
+from app.queue import QUEUE_STAGES
+from app.routers.live import router as live_router
 from app.routers.meetings import router as meetings_router
 from app.routers.qa import router as qa_router
 from app.routers.segments import router as segments_router
@@ -10,6 +17,11 @@ from app.storage import ensure_bucket
 
 app = FastAPI(title="Corin API", version="0.1.0")
 
+# Queue backlog in estimated seconds of work, read from Redis per scrape.
+REGISTRY.register(
+    BacklogCollector(redis.from_url(get_settings().redis_url), QUEUE_STAGES)
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -29,7 +41,14 @@ def health() -> dict:
     return {"ok": True}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
 app.include_router(meetings_router)
+app.include_router(live_router)
 app.include_router(segments_router)
 app.include_router(qa_router)
 app.include_router(share_router)
@@ -0,0 +1,78 @@
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from app.audio import (
+    MemoryReader,
+    media_duration_ms,
+    pcm_to_wav_bytes,
+    read_wav_info,
+    read_wav_part,
+)
+
+
+class AudioTests(unittest.TestCase):
+    def test_read_wav_info_from_header(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "clip.wav"
+            with wave.open(str(path), "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(48000)
+                wf.writeframes(b"\x00\x00" * 72000)
+            info = read_wav_info(str(path))
+            assert info is not None
+            self.assertEqual(info.sample_rate, 48000)
+            self.assertEqual(info.n_frames, 72000)
+            self.assertEqual(info.duration_ms, 1500)
+            self.assertEqual(media_duration_ms(str(path)), 1500)
+
+    def test_read_wav_info_rejects_other_formats(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "audio.m4a"
+            path.write_bytes(b"\x00\x00\x00\x20ftypM4A ")
+            self.assertIsNone(read_wav_info(str(path)))
+
+    def test_pcm_to_wav_bytes_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "live.wav"
+            path.write_bytes(pcm_to_wav_bytes(b"\x01\x00" * 1600, 16000))
+            info = read_wav_info(str(path))
+            assert info is not None
+            self.assertEqual((info.sample_rate, info.duration_ms), (16000, 100))
+
+    def test_read_wav_part_matches_sample_range(self) -> None:
+        samples = np.arange(16000 * 3, dtype="<i2")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "clip.wav"
+            with wave.open(str(path), "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(16000)
+                wf.writeframes(samples.tobytes())
+            part = read_wav_part(str(path), 1000, 2500)
+            self.assertEqual(part.name, "part.wav")
+            with wave.open(part, "rb") as wf:
+                self.assertEqual(wf.getframerate(), 16000)
+                data = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2")
+            np.testing.assert_array_equal(data, samples[16000:40000])
+            tail = read_wav_part(str(path), 2900, 4000)
+            info = read_wav_info(tail)
+            assert info is not None
+            self.assertEqual(info.duration_ms, 100)
+            self.assertEqual(tail.tell(), 0)
+
+    def test_memory_reader_past_the_end_reads_nothing(self) -> None:
+        reader = MemoryReader(b"abcdef")
+        reader.seek(2)
+        self.assertEqual(reader.read(3), b"cde")
+        reader.seek(10)
+        self.assertEqual(reader.read(4), b"")
+        self.assertEqual(reader.readinto(bytearray(4)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import io
+import unittest
+import wave
+from unittest import mock
+
+import numpy as np
+
+from app import audio_clips
+from app.audio import pcm_to_wav_bytes
+from app.audio_clips import ClipCache, cut_clip, parse_range
+
+
+class CutClipTests(unittest.TestCase):
+    def setUp(self) -> None:
+        audio_clips._source.cache_clear()
+        self.samples = np.arange(16000 * 3, dtype="<i2")
+        self.stored = pcm_to_wav_bytes(self.samples.tobytes(), 16000)
+        self.reads: list[tuple[int, int]] = []
+
+        def read_range(_key: str, first: int, last: int) -> bytes:
+            self.reads.append((first, last))
+            return self.stored[first : last + 1]
+
+        patcher = mock.patch.object(audio_clips, "read_object_range", read_range)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_clip_reads_only_its_samples(self) -> None:
+        clip = cut_clip("vad/m-1/audio.wav", "v1", 1000, 1500)
+
+        with wave.open(io.BytesIO(clip), "rb") as wf:
+            self.assertEqual(wf.getframerate(), 16000)
+            frames = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2")
+        np.testing.assert_array_equal(frames, self.samples[16000:24000])
+        # One header probe, then exactly the clip's bytes.
+        self.assertEqual(len(self.reads), 2)
+        first, last = self.reads[1]
+        self.assertEqual(last - first + 1, 8000 * 2)
+
+    def test_clip_past_the_end_is_truncated(self) -> None:
+        clip = cut_clip("vad/m-1/audio.wav", "v1", 2500, 9000)
+
+        with wave.open(io.BytesIO(clip), "rb") as wf:
+            self.assertEqual(wf.getnframes(), 8000)
+
+    def test_header_is_probed_once_per_version(self) -> None:
+        cut_clip("vad/m-1/audio.wav", "v1", 0, 100)
+        cut_clip("vad/m-1/audio.wav", "v1", 100, 200)
+        cut_clip("vad/m-1/audio.wav", "v2", 100, 200)
+
+        probes = [read for read in self.reads if read[0] == 0]
+        self.assertEqual(len(probes), 2)
+
+
+class ClipCacheTests(unittest.TestCase):
+    def test_evicts_least_recently_used_by_size(self) -> None:
+        cache = ClipCache(max_bytes=10)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        self.assertEqual(cache.get("a"), b"aaaa")
+        cache.put("c", b"cccc")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), b"aaaa")
+        self.assertEqual(cache.get("c"), b"cccc")
+
+    def test_oversized_values_are_not_cached(self) -> None:
+        cache = ClipCache(max_bytes=4)
+        cache.put("a", b"aaaaa")
+        self.assertIsNone(cache.get("a"))
+
+
+class ParseRangeTests(unittest.TestCase):
+    def test_ranges(self) -> None:
+        self.assertIsNone(parse_range(None, 100))
+        self.assertIsNone(parse_range("items=0-1", 100))
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 100))
+        self.assertEqual(parse_range("bytes=10-19", 100), (10, 19))
+        self.assertEqual(parse_range("bytes=90-", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=90-500", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=-30", 100), (70, 99))
+
+    def test_unsatisfiable(self) -> None:
+        for header in ("bytes=100-", "bytes=20-10", "bytes=-0"):
+            with self.assertRaises(ValueError):
+                parse_range(header, 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
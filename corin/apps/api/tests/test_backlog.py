@@ -0,0 +1,63 @@
+import unittest
+from types import SimpleNamespace
+
+from app.backlog import (
+    audio_ms_from_size,
+    backlog_snapshot,
+    settle_backlog,
+    track_backlog,
+)
+
+
+class MemoryHashes:
+    """The Redis hash commands the backlog uses."""
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        entries = dict(mapping or {})
+        if field is not None:
+            entries[field] = value
+        target = self.hashes.setdefault(key, {})
+        for name, item in entries.items():
+            target[str(name).encode()] = str(item).encode()
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field.encode())
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hdel(self, key, *fields):
+        for name in fields:
+            name = name if isinstance(name, bytes) else name.encode()
+            self.hashes.get(key, {}).pop(name, None)
+
+
+class BacklogTests(unittest.TestCase):
+    def test_backlog_weights_audio_by_learned_real_time_factor(self) -> None:
+        connection = MemoryHashes()
+        queue = SimpleNamespace(name="corin-transcribe", connection=connection)
+        func = "app.tasks.transcribe_vad_segment"
+        first, _second = track_backlog(queue, [(func, 10_000), (func, 5_000)])
+
+        snapshot = backlog_snapshot(connection, ("transcribe", "finalize"))
+        self.assertEqual(snapshot["transcribe"]["jobs"], 2)
+        self.assertEqual(snapshot["transcribe"]["audio_s"], 15.0)
+        self.assertEqual(snapshot["finalize"]["jobs"], 0)
+
+        job = SimpleNamespace(meta=first, connection=connection, func_name=func)
+        settle_backlog(job, elapsed_s=2.0)
+        snapshot = backlog_snapshot(connection, ("transcribe",))
+        self.assertEqual(snapshot["transcribe"]["jobs"], 1)
+        # 2 s of work for 10 s of audio: the remaining 5 s clip is ~1 s.
+        self.assertAlmostEqual(snapshot["transcribe"]["work_s"], 1.0)
+
+    def test_upload_size_estimate(self) -> None:
+        self.assertEqual(audio_ms_from_size(None), 0)
+        self.assertEqual(audio_ms_from_size(16_000), 1_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from unittest import mock
+
+from sqlalchemy import event, text
+
+from app import db
+from app.config import Settings
+from app.metrics import DB_POOL_CHECKED_OUT, DB_POOL_SIZE
+
+
+class FakeCursor:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+        self.closed = False
+
+    def execute(self, statement: str) -> None:
+        self.statements.append(statement)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class DbTests(unittest.TestCase):
+    def test_pgbouncer_sets_statement_timeout_per_transaction(self) -> None:
+        settings = Settings(db_pgbouncer=True, db_statement_timeout_ms=5000)
+        self.assertNotIn("options", db._connect_args(settings))
+
+        with mock.patch.object(db, "_set_local_statement_timeout") as listener:
+            listener.return_value = lambda conn: None
+            engine = db.build_engine(settings)
+        listener.assert_called_once_with(5000)
+        self.assertTrue(event.contains(engine, "begin", listener.return_value))
+
+        cursor = FakeCursor()
+        conn = mock.Mock()
+        conn.connection.cursor.return_value = cursor
+        db._set_local_statement_timeout(5000)(conn)
+        self.assertEqual(cursor.statements, ["SET LOCAL statement_timeout = 5000"])
+        self.assertTrue(cursor.closed)
+
+    def test_pool_gauges_follow_checkouts(self) -> None:
+        engine = db.build_engine(Settings(database_url="sqlite://"))
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            self.assertEqual(DB_POOL_CHECKED_OUT._value.get(), 1)
+            self.assertEqual(DB_POOL_SIZE._value.get(), 1)
+        self.assertEqual(DB_POOL_CHECKED_OUT._value.get(), 0)
+        self.assertEqual(DB_POOL_SIZE._value.get(), 1)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from sqlalchemy.dialects import postgresql
+
+from app import etags
+from app.etags import etag_matches, meeting_etag
+
+UPDATED = datetime(2026, 1, 5, 9, 30, tzinfo=timezone.utc)
+
+
+class FakeSession:
+    def __init__(self, row: tuple | None) -> None:
+        self.row = row
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(first=lambda: self.row)
+
+
+def _request(if_none_match: str | None) -> SimpleNamespace:
+    headers = {"if-none-match": if_none_match} if if_none_match else {}
+    return SimpleNamespace(headers=headers)
+
+
+class MeetingEtagTests(unittest.TestCase):
+    def _etag(self, row, *variant, now: float = 1_000_000.0) -> str | None:
+        with mock.patch.object(etags.time, "time", return_value=now):
+            return meeting_etag(FakeSession(row), uuid.uuid4(), *variant)
+
+    def test_missing_or_deleted_meeting_has_no_etag(self) -> None:
+        self.assertIsNone(self._etag(None))
+
+    def test_etag_follows_the_fingerprint(self) -> None:
+        row = (UPDATED, 3, uuid.uuid4(), 120)
+        etag = self._etag(row)
+
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertEqual(etag, self._etag(row))
+        self.assertNotEqual(etag, self._etag((UPDATED, 4, row[2], 120)))
+        self.assertNotEqual(etag, self._etag((UPDATED, 3, row[2], 121)))
+        self.assertNotEqual(etag, self._etag(row, "columnar"))
+
+    def test_latest_summary_is_picked_deterministically(self) -> None:
+        session = FakeSession(None)
+        meeting_etag(session, uuid.uuid4())
+
+        sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+        self.assertIn("ORDER BY summaries.created_at DESC, summaries.id DESC", sql)
+
+    def test_etag_moves_before_presigned_urls_expire(self) -> None:
+        row = (UPDATED, None, None, 0)
+        self.assertNotEqual(
+            self._etag(row, now=0.0), self._etag(row, now=etags._URL_BUCKET_S)
+        )
+
+
+class EtagMatchesTests(unittest.TestCase):
+    def test_if_none_match(self) -> None:
+        etag = '"abc"'
+        self.assertFalse(etag_matches(_request(None), etag))
+        self.assertTrue(etag_matches(_request('"abc"'), etag))
+        self.assertTrue(etag_matches(_request('"x", "abc"'), etag))
+        self.assertTrue(etag_matches(_request('W/"abc"'), etag))
+        self.assertTrue(etag_matches(_request("*"), etag))
+        self.assertFalse(etag_matches(_request('"abd"'), etag))
+
+
+if __name__ == "__main__":
+    unittest.main()
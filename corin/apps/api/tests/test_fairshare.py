@@ -0,0 +1,136 @@
+import unittest
+
+from app import fairshare
+from app.fairshare import refill_fair, submit_fair, take_fair
+
+try:
+    from lupa import LuaRuntime
+except ImportError:  # the scripts only run where a Lua runtime is installed
+    LuaRuntime = None
+
+
+class MemoryLists:
+    """The Redis list commands the fair-share scripts use; ``eval`` runs the
+    scripts themselves against them."""
+
+    def __init__(self) -> None:
+        self.lists: dict[str, list[str]] = {}
+        self.lua = LuaRuntime()
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+        return len(self.lists[key])
+
+    def lpop(self, key):
+        items = self.lists.get(key)
+        return items.pop(0) if items else None
+
+    def lpos(self, key, value):
+        items = self.lists.get(key, [])
+        return items.index(value) if value in items else None
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def lrem(self, key, count, value):
+        items = self.lists.get(key, [])
+        kept = [item for item in items if item != value]
+        self.lists[key] = kept
+        return len(items) - len(kept)
+
+    def rpoplpush(self, source, destination):
+        items = self.lists.get(source)
+        if not items:
+            return None
+        value = items.pop()
+        self.lists.setdefault(destination, []).insert(0, value)
+        return value
+
+    def eval(self, script, numkeys, *keys_and_args):
+        run = self.lua.eval(
+            "function(redis, KEYS, ARGV)\n"
+            "local unpack = unpack or table.unpack\n"
+            f"{script}\nend"
+        )
+        redis = self.lua.table_from(
+            {"call": lambda command, *args: getattr(self, command.lower())(*args)}
+        )
+        keys = [str(key) for key in keys_and_args[:numkeys]]
+        args = [str(arg) for arg in keys_and_args[numkeys:]]
+        result = run(redis, self.lua.table_from(keys), self.lua.table_from(args))
+        return list(result.values()) if hasattr(result, "values") else result
+
+    def ring(self) -> list[str]:
+        return self.lists.get(fairshare._RING_KEY, [])
+
+
+class FakeQueue:
+    def __init__(self, connection: MemoryLists) -> None:
+        self.connection = connection
+        self.jobs: list = []
+
+    @property
+    def count(self) -> int:
+        return len(self.jobs)
+
+    def enqueue_many(self, job_datas: list) -> None:
+        self.jobs.extend(job_datas)
+
+
+def _jobs(meeting_id: str, count: int) -> list[tuple[str, tuple, dict]]:
+    return [
+        ("app.tasks.transcribe_segment", (meeting_id, index), {"clip": index})
+        for index in range(count)
+    ]
+
+
+@unittest.skipIf(LuaRuntime is None, "lupa is not installed")
+class FairshareTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.connection = MemoryLists()
+
+    def test_meetings_take_turns(self) -> None:
+        submit_fair(self.connection, "long", _jobs("long", 4))
+        submit_fair(self.connection, "short", _jobs("short", 2))
+
+        taken = take_fair(self.connection, 6)
+        self.assertEqual(
+            [tuple(args) for _, args, _ in taken],
+            [
+                ("short", 0),
+                ("long", 0),
+                ("short", 1),
+                ("long", 1),
+                ("long", 2),
+                ("long", 3),
+            ],
+        )
+        self.assertEqual(taken[0][0], "app.tasks.transcribe_segment")
+        self.assertEqual(taken[0][2], {"clip": 0})
+
+    def test_refill_stops_at_depth(self) -> None:
+        submit_fair(self.connection, "long", _jobs("long", 20))
+        queue = FakeQueue(self.connection)
+
+        self.assertEqual(refill_fair(queue, 8), 8)
+        self.assertEqual(refill_fair(queue, 8), 0)
+        del queue.jobs[:3]
+        self.assertEqual(refill_fair(queue, 8), 3)
+        self.assertEqual(queue.count, 8)
+        self.assertEqual(queue.jobs[-1].args, ["long", 10])
+
+    def test_drained_meeting_leaves_the_ring(self) -> None:
+        submit_fair(self.connection, "a", _jobs("a", 1))
+        submit_fair(self.connection, "a", _jobs("a", 1))
+        submit_fair(self.connection, "b", _jobs("b", 3))
+        self.assertEqual(self.connection.ring(), ["a", "b"])
+
+        self.assertEqual(len(take_fair(self.connection, 4)), 4)
+        self.assertEqual(self.connection.ring(), ["b"])
+        self.assertEqual(len(take_fair(self.connection, 4)), 1)
+        self.assertEqual(self.connection.ring(), [])
+        self.assertEqual(take_fair(self.connection, 4), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
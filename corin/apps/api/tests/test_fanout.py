@@ -0,0 +1,123 @@
+import unittest
+
+from app.fanout import add_fanout_members, complete_fanout_member, start_fanout
+
+try:
+    from lupa import LuaRuntime
+except ImportError:  # the scripts only run where a Lua runtime is installed
+    LuaRuntime = None
+
+
+class MemoryPipeline:
+    def __init__(self, connection: "MemorySets") -> None:
+        self.connection = connection
+        self.calls: list = []
+
+    def __getattr__(self, command):
+        return lambda *args: self.calls.append((command, args))
+
+    def execute(self) -> list:
+        return [
+            getattr(self.connection, command)(*args) for command, args in self.calls
+        ]
+
+
+class MemorySets:
+    """The Redis commands fan-out groups use; ``eval`` runs the scripts
+    themselves against them. Expiry is not modelled."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, object] = {}
+        self.lua = LuaRuntime()
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, *options):
+        self.values[key] = value
+
+    def delete(self, key):
+        return int(self.values.pop(key, None) is not None)
+
+    def expire(self, key, seconds):
+        return int(key in self.values)
+
+    def sadd(self, key, *members):
+        group = self.values.setdefault(key, set())
+        added = set(members) - group
+        group.update(members)
+        return len(added)
+
+    def srem(self, key, member):
+        group = self.values.get(key, set())
+        if member not in group:
+            return 0
+        group.discard(member)
+        if not group:
+            del self.values[key]
+        return 1
+
+    def scard(self, key):
+        return len(self.values.get(key, set()))
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+    def _call(self, command, *args):
+        name = {"DEL": "delete"}.get(command, command.lower())
+        return getattr(self, name)(*args)
+
+    def eval(self, script, numkeys, *keys_and_args):
+        run = self.lua.eval(
+            "function(redis, KEYS, ARGV)\n"
+            "local unpack = unpack or table.unpack\n"
+            f"{script}\nend"
+        )
+        redis = self.lua.table_from({"call": self._call})
+        keys = [str(key) for key in keys_and_args[:numkeys]]
+        args = [str(arg) for arg in keys_and_args[numkeys:]]
+        return run(redis, self.lua.table_from(keys), self.lua.table_from(args))
+
+
+@unittest.skipIf(LuaRuntime is None, "lupa is not installed")
+class FanoutTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.connection = MemorySets()
+
+    def _complete(self, member: str) -> bool:
+        return complete_fanout_member(self.connection, "m-1", "transcribe", member)
+
+    def test_last_member_empties_the_group(self) -> None:
+        start_fanout(self.connection, "m-1", "transcribe", ["a", "b"], "run-1")
+
+        self.assertFalse(self._complete("a"))
+        self.assertFalse(self._complete("a"))
+        self.assertTrue(self._complete("b"))
+        self.assertFalse(self._complete("b"))
+
+    def test_restarting_the_same_run_keeps_pending_members(self) -> None:
+        self.assertTrue(
+            start_fanout(self.connection, "m-1", "transcribe", ["stream"], "live")
+        )
+        add_fanout_members(self.connection, "m-1", "transcribe", ["a", "b"])
+        self.assertFalse(self._complete("a"))
+
+        # A reconnect must not wait for "a" again nor forget "b".
+        self.assertFalse(
+            start_fanout(self.connection, "m-1", "transcribe", ["stream"], "live")
+        )
+        self.assertFalse(self._complete("stream"))
+        self.assertTrue(self._complete("b"))
+
+    def test_another_run_replaces_the_group(self) -> None:
+        start_fanout(self.connection, "m-1", "transcribe", ["a", "b"], "run-1")
+
+        self.assertTrue(
+            start_fanout(self.connection, "m-1", "transcribe", ["c"], "run-2")
+        )
+        self.assertFalse(self._complete("a"))
+        self.assertTrue(self._complete("c"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from app.hls import rewrite_playlist
+
+PLAYLIST = """#EXTM3U
+#EXT-X-VERSION:7
+#EXT-X-TARGETDURATION:6
+#EXT-X-PLAYLIST-TYPE:VOD
+#EXT-X-MAP:URI="init.mp4"
+#EXTINF:6.016000,
+seg-00000.m4s
+#EXTINF:2.240000,
+seg-00001.m4s
+#EXT-X-ENDLIST
+"""
+
+
+class HlsTests(unittest.TestCase):
+    def test_rewrite_signs_map_and_segments_in_one_call(self) -> None:
+        calls: list[list[str]] = []
+
+        def sign(keys: list[str]) -> list[str]:
+            calls.append(keys)
+            return [f"https://s3.example/{key}?sig=1" for key in keys]
+
+        rewritten = rewrite_playlist(PLAYLIST, "playable/m-1/hls/", sign)
+
+        self.assertEqual(
+            calls,
+            [
+                [
+                    "playable/m-1/hls/init.mp4",
+                    "playable/m-1/hls/seg-00000.m4s",
+                    "playable/m-1/hls/seg-00001.m4s",
+                ]
+            ],
+        )
+        lines = rewritten.splitlines()
+        self.assertIn(
+            '#EXT-X-MAP:URI="https://s3.example/playable/m-1/hls/init.mp4?sig=1"',
+            lines,
+        )
+        self.assertEqual(
+            lines[6], "https://s3.example/playable/m-1/hls/seg-00000.m4s?sig=1"
+        )
+        self.assertEqual(lines[-1], "#EXT-X-ENDLIST")
+        self.assertEqual(len(lines), len(PLAYLIST.splitlines()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import uuid
+from unittest import mock
+
+from app import lifecycle
+from app.models import MediaAsset
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.commits = 0
+
+    def commit(self) -> None:
+        self.commits += 1
+
+
+class ArchiveTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.uploaded: list[str] = []
+        self.deleted: list[str] = []
+        patches = {
+            "download_file": lambda key, path: open(path, "wb").close(),
+            "encode_flac": lambda src, dst: open(dst, "wb").close(),
+            "upload_fileobj": lambda key, fh, content_type: self.uploaded.append(key),
+            "delete_objects": self.deleted.extend,
+            "touch_meeting": mock.Mock(),
+        }
+        for name, replacement in patches.items():
+            patcher = mock.patch.object(lifecycle, name, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_each_asset_of_a_meeting_gets_its_own_archive(self) -> None:
+        meeting_id = uuid.uuid4()
+        assets = [
+            MediaAsset(
+                id=uuid.uuid4(),
+                meeting_id=meeting_id,
+                normalized_object_key=f"normalized/{meeting_id}/{name}.wav",
+            )
+            for name in ("first", "second")
+        ]
+        session = FakeSession()
+
+        for asset in assets:
+            self.assertTrue(lifecycle.archive_normalized(session, asset))
+
+        self.assertEqual(
+            self.uploaded,
+            [f"archive/{meeting_id}/{asset.id}.flac" for asset in assets],
+        )
+        self.assertEqual([asset.archive_object_key for asset in assets], self.uploaded)
+        self.assertEqual(
+            self.deleted, [asset.normalized_object_key for asset in assets]
+        )
+        self.assertFalse(lifecycle.archive_normalized(session, assets[0]))
+        self.assertEqual(session.commits, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
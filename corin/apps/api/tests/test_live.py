@@ -0,0 +1,156 @@
+import io
+import shutil
+import unittest
+import uuid
+import wave
+from types import SimpleNamespace
+from unittest import mock
+
+from app.models import MediaAsset, VadSegment
+from app.routers import live
+from app.routers.live import LiveRecording
+from app.vad import VadSegmentResult
+
+SAMPLE_RATE = 16000
+
+
+def _pcm(seconds: float, value: int) -> bytes:
+    return value.to_bytes(2, "little", signed=True) * int(SAMPLE_RATE * seconds)
+
+
+def _wav(pcm: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class FakeSession:
+    """The meeting, its live asset and its VAD rows."""
+
+    def __init__(self, meeting, asset, vad_rows: list) -> None:
+        self.meeting = meeting
+        self.asset = asset
+        self.vad_rows = vad_rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def get(self, model, key):
+        return self.asset if model is MediaAsset else self.meeting
+
+    def execute(self, statement):
+        if statement.column_descriptions[0]["entity"] is MediaAsset:
+            return SimpleNamespace(scalar=lambda: self.asset)
+        return SimpleNamespace(scalar_one=lambda: len(self.vad_rows))
+
+    def add(self, instance) -> None:
+        if isinstance(instance, VadSegment):
+            self.vad_rows.append(instance)
+        else:
+            self.asset = instance
+
+    def commit(self) -> None:
+        pass
+
+
+class FakeStreamer:
+    def __init__(self, segments: list[VadSegmentResult]) -> None:
+        self.segments = segments
+
+    def feed(self, chunk: bytes) -> list[VadSegmentResult]:
+        return []
+
+    def finish(self) -> list[VadSegmentResult]:
+        return self.segments
+
+
+class LiveReconnectTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.meeting_id = uuid.uuid4()
+        self.objects = {"original/m/first-live.wav": _wav(_pcm(3.0, 1))}
+        self.asset = MediaAsset(
+            id=uuid.uuid4(),
+            meeting_id=self.meeting_id,
+            original_object_key="original/m/first-live.wav",
+            original_filename="live.wav",
+        )
+        self.meeting = SimpleNamespace(status="transcribing", progress_json={})
+        self.session = FakeSession(self.meeting, self.asset, [object(), object()])
+
+        def download_file(key, path):
+            with open(path, "wb") as fh:
+                fh.write(self.objects[key])
+
+        def upload_fileobj(key, fileobj, content_type=None):
+            self.objects[key] = fileobj.read()
+
+        self.enqueued = mock.Mock()
+        patches = {
+            "SessionLocal": lambda: self.session,
+            "download_file": download_file,
+            "upload_fileobj": upload_fileobj,
+            "delete_objects": lambda keys: [self.objects.pop(k) for k in keys],
+            "get_queue": mock.Mock(),
+            "start_fanout": mock.Mock(return_value=False),
+            "add_fanout_members": mock.Mock(),
+            "complete_fanout_member": mock.Mock(return_value=True),
+            "track_backlog": lambda queue, units: [{} for _ in units],
+            "submit_fair": mock.Mock(),
+            "refill_fair": mock.Mock(),
+            "enqueue_once": self.enqueued,
+        }
+        for name, replacement in patches.items():
+            patcher = mock.patch.object(live, name, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _record(self, pcm: bytes, segments: list[VadSegmentResult]) -> LiveRecording:
+        recording = LiveRecording(self.meeting_id, SAMPLE_RATE)
+        self.addCleanup(shutil.rmtree, recording._tmpdir.name, True)
+        recording.streamer = FakeStreamer(segments)
+        self.assertTrue(recording.start())
+        recording.feed(pcm)
+        recording.finish()
+        return recording
+
+    def test_reconnect_continues_the_recording(self) -> None:
+        recording = self._record(
+            _pcm(1.0, 2), [VadSegmentResult(100, 600, 0, 850, energy_score=0.1)]
+        )
+
+        self.assertEqual(recording.offset_ms, 3000)
+        vad_row = self.session.vad_rows[-1]
+        self.assertEqual((vad_row.start_ms, vad_row.end_ms), (3100, 3600))
+        clip = wave.open(io.BytesIO(self.objects[vad_row.clip_object_key]))
+        self.assertEqual(clip.readframes(clip.getnframes()), _pcm(0.85, 2))
+
+        # One original holding both connections replaces the first one.
+        self.assertNotIn("original/m/first-live.wav", self.objects)
+        original = wave.open(io.BytesIO(self.objects[self.asset.original_object_key]))
+        self.assertEqual(original.getnframes(), SAMPLE_RATE * 4)
+        self.assertIs(self.session.asset, self.asset)
+        self.assertEqual(self.meeting.progress_json["segments"], 3)
+
+    def test_silent_reconnect_keeps_earlier_segments(self) -> None:
+        self._record(_pcm(0.5, 0), [])
+
+        self.assertEqual(self.meeting.status, "transcribing")
+        stages = [call.args[2] for call in self.enqueued.call_args_list]
+        self.assertEqual(stages, [live.ingest_upload, live.consolidate_transcript])
+
+    def test_reconnect_at_another_sample_rate_is_refused(self) -> None:
+        recording = LiveRecording(self.meeting_id, 48000)
+        self.addCleanup(recording.abort)
+        with self.assertRaises(ValueError):
+            recording.start()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from app.audio import pcm_to_wav_bytes
+from app.peaks import (
+    BASE_SAMPLES_PER_PEAK,
+    LEVEL_FACTOR,
+    MAX_OVERVIEW_PEAKS,
+    compute_peaks,
+    read_peak_levels,
+)
+
+
+def _level_peaks(data: bytes, level) -> np.ndarray:
+    return np.frombuffer(
+        data, dtype=np.int8, count=level.count * 2, offset=level.offset
+    ).reshape(-1, 2)
+
+
+class PeaksTests(unittest.TestCase):
+    def _peaks_for(self, samples: np.ndarray) -> bytes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "audio.wav")
+            with open(path, "wb") as fh:
+                fh.write(pcm_to_wav_bytes(samples.astype("<i2").tobytes(), 48000))
+            return compute_peaks(path)
+
+    def test_levels_coarsest_first_with_bounded_overview(self) -> None:
+        n_base = MAX_OVERVIEW_PEAKS * LEVEL_FACTOR * 2 + 3
+        samples = np.zeros(n_base * BASE_SAMPLES_PER_PEAK - 100, dtype=np.int16)
+        data = self._peaks_for(samples)
+
+        sample_rate, total_samples, levels = read_peak_levels(data)
+        self.assertEqual(sample_rate, 48000)
+        self.assertEqual(total_samples, len(samples))
+        self.assertLessEqual(levels[0].count, MAX_OVERVIEW_PEAKS)
+        self.assertEqual(levels[-1].samples_per_peak, BASE_SAMPLES_PER_PEAK)
+        self.assertEqual(levels[-1].count, n_base)
+        self.assertEqual(
+            [level.samples_per_peak for level in levels],
+            sorted((level.samples_per_peak for level in levels), reverse=True),
+        )
+        last = levels[-1]
+        self.assertEqual(len(data), last.offset + last.count * 2)
+
+    def test_base_level_keeps_extremes(self) -> None:
+        samples = np.zeros(BASE_SAMPLES_PER_PEAK * 10, dtype=np.int16)
+        samples[BASE_SAMPLES_PER_PEAK * 3 + 7] = 32767
+        samples[BASE_SAMPLES_PER_PEAK * 8] = -32768
+        data = self._peaks_for(samples)
+
+        _, _, levels = read_peak_levels(data)
+        base = _level_peaks(data, levels[-1])
+        self.assertEqual(base[3].tolist(), [0, 127])
+        self.assertEqual(base[8].tolist(), [-128, 0])
+        self.assertEqual(base[0].tolist(), [0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
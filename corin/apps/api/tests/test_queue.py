@@ -0,0 +1,39 @@
+import unittest
+
+from app.queue import idempotency_key, queue_name, worker_queue_names
+
+
+class QueueNameTests(unittest.TestCase):
+    def test_stage_queue_names(self) -> None:
+        self.assertEqual(queue_name(None), "corin")
+        self.assertEqual(queue_name("transcribe"), "corin-transcribe")
+        with self.assertRaises(ValueError):
+            queue_name("nope")
+
+    def test_worker_queue_names_keep_priority_and_legacy_queue(self) -> None:
+        self.assertEqual(
+            worker_queue_names("finalize, ingest,transcribe"),
+            ["corin-finalize", "corin-ingest", "corin-transcribe", "corin"],
+        )
+        self.assertEqual(
+            worker_queue_names("transcribe,transcribe"),
+            ["corin-transcribe", "corin"],
+        )
+
+    def test_idempotency_key_depends_on_stage_and_inputs(self) -> None:
+        key = idempotency_key("m-1", "ingest", "original/m-1/abc-a.m4a")
+        self.assertTrue(key.startswith("ingest-m-1-"))
+        self.assertEqual(
+            key, idempotency_key("m-1", "ingest", "original/m-1/abc-a.m4a")
+        )
+        self.assertNotEqual(
+            key, idempotency_key("m-1", "ingest", "original/m-1/def-a.m4a")
+        )
+        self.assertNotEqual(
+            idempotency_key("m-1", "summarize", 3),
+            idempotency_key("m-1", "summarize", 4),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
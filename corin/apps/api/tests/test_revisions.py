@@ -0,0 +1,35 @@
+import unittest
+
+from app.revisions import apply_revisions
+
+
+def _seg(seg_id: str, start_ms: int, text: str) -> dict:
+    return {
+        "id": seg_id,
+        "start_ms": start_ms,
+        "end_ms": start_ms + 100,
+        "speaker_key": "spk_1",
+        "text": text,
+    }
+
+
+class RevisionTests(unittest.TestCase):
+    def test_apply_revisions_replays_deltas_in_order(self) -> None:
+        base = [_seg("a", 0, "hello"), _seg("b", 200, "world")]
+        deltas = [
+            {"upserts": [_seg("b", 200, "there")], "deletes": []},
+            {"upserts": [_seg("c", 100, "new")], "deletes": ["a"]},
+            {"upserts": [_seg("b", 200, "again")], "deletes": []},
+        ]
+        segments = apply_revisions(base, deltas)
+        self.assertEqual([seg["id"] for seg in segments], ["c", "b"])
+        self.assertEqual(segments[1]["text"], "again")
+
+    def test_apply_revisions_without_deltas_keeps_base(self) -> None:
+        base = [_seg("b", 200, "world"), _seg("a", 0, "hello")]
+        segments = apply_revisions(base, [])
+        self.assertEqual([seg["id"] for seg in segments], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.db import get_session
+from app.models import Meeting, TranscriptRevision, TranscriptSegment
+from app.routers import meetings
+
+
+class FakeSession:
+    """Answers the batch edit's queries: the meeting, its segments and the
+    revision head (latest revision, latest snapshot)."""
+
+    def __init__(self, meeting, segments, head: tuple[int, int]) -> None:
+        self.meeting = meeting
+        self.segments = segments
+        self.head = head
+        self.added: list = []
+        self.committed = False
+        self.rolled_back = False
+
+    def get(self, model, key):
+        return self.meeting if model is Meeting and key == self.meeting.id else None
+
+    def execute(self, statement):
+        entity = statement.column_descriptions[0]["entity"]
+        if entity is TranscriptRevision:
+            return SimpleNamespace(one=lambda: self.head)
+        return SimpleNamespace(
+            scalars=lambda: SimpleNamespace(all=lambda: self.segments)
+        )
+
+    def add(self, instance) -> None:
+        self.added.append(instance)
+
+    def commit(self) -> None:
+        self.committed = True
+
+    def rollback(self) -> None:
+        self.rolled_back = True
+
+
+def _segment(meeting_id: uuid.UUID, start_ms: int, text: str) -> TranscriptSegment:
+    return TranscriptSegment(
+        id=uuid.uuid4(),
+        meeting_id=meeting_id,
+        start_ms=start_ms,
+        end_ms=start_ms + 1000,
+        speaker_key="spk_1",
+        text=text,
+        confidence=None,
+    )
+
+
+class SegmentBatchEditTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.meeting = SimpleNamespace(id=uuid.uuid4(), deleted_at=None)
+        self.segments = [
+            _segment(self.meeting.id, 0, "hello"),
+            _segment(self.meeting.id, 1500, "world"),
+        ]
+        # Revision 3 is a delta on the snapshot at revision 1.
+        self.session = FakeSession(self.meeting, self.segments, head=(3, 1))
+        app = FastAPI()
+        app.include_router(meetings.router)
+        app.dependency_overrides[get_session] = lambda: self.session
+        self.client = TestClient(app)
+        self.queue = mock.Mock()
+        patcher = mock.patch.object(meetings, "get_queue", return_value=self.queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _patch(self, base_revision_no: int):
+        return self.client.patch(
+            f"/meetings/{self.meeting.id}/segments",
+            json={
+                "base_revision_no": base_revision_no,
+                "edits": [
+                    {"id": str(self.segments[0].id), "text": "hello there"},
+                    {"id": str(self.segments[1].id), "speaker_key": "spk_2"},
+                ],
+            },
+        )
+
+    def test_stale_base_revision_is_a_conflict(self) -> None:
+        response = self._patch(base_revision_no=2)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["detail"]["current_revision_no"], 3)
+        self.assertTrue(self.session.rolled_back)
+        self.assertFalse(self.session.committed)
+        self.assertEqual(self.session.added, [])
+        self.queue.enqueue.assert_not_called()
+
+    def test_edits_are_stored_as_one_delta(self) -> None:
+        response = self._patch(base_revision_no=3)
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["revision_no"], 4)
+        self.assertEqual(
+            [(seg["text"], seg["speaker_key"]) for seg in body["segments"]],
+            [("hello there", "spk_1"), ("world", "spk_2")],
+        )
+        self.assertTrue(self.session.committed)
+        (revision,) = self.session.added
+        self.assertEqual(revision.kind, "delta")
+        self.assertEqual(revision.base_revision_no, 1)
+        self.assertEqual(
+            [seg["id"] for seg in revision.delta_json["upserts"]],
+            [str(seg.id) for seg in self.segments],
+        )
+        # Only the segment whose text changed is re-embedded.
+        self.queue.enqueue.assert_called_once()
+        self.assertEqual(
+            self.queue.enqueue.call_args.args[1:],
+            (str(self.meeting.id), [str(self.segments[0].id)]),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import json
+import unittest
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from app import serialization
+from app.models import MediaAsset, TranscriptRevision, TranscriptSegment
+from app.schemas import MeetingDetail
+from app.serialization import JsonBytesResponse, columnar, meeting_detail_payload
+
+CREATED = datetime(2026, 1, 5, 9, 30, tzinfo=timezone.utc)
+
+
+class FakeSession:
+    """Answers the detail's column selects: transcript and media asset rows,
+    nothing else."""
+
+    def __init__(self, transcript_rows: list[tuple], asset_rows=()) -> None:
+        self.rows = {TranscriptSegment: transcript_rows, MediaAsset: asset_rows}
+        self.columns: dict[type, list[str]] = {}
+
+    def execute(self, statement):
+        entity = statement.column_descriptions[0]["entity"]
+        self.columns[entity] = [col["name"] for col in statement.column_descriptions]
+        rows = self.rows.get(entity, [])
+        return SimpleNamespace(all=lambda: rows)
+
+
+def _meeting() -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        title="Weekly sync",
+        meeting_date=None,
+        tags=["team"],
+        folder=None,
+        status="done",
+        progress_json={"stage": "done", "percent": 100},
+        stt_provider="local",
+        stt_audio_tokens=0,
+        stt_input_text_tokens=0,
+        stt_output_tokens=0,
+        stt_cost_usd=0.0,
+        created_at=CREATED,
+    )
+
+
+class SerializationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rows = [
+            (uuid.uuid4(), 0, 1200, "spk_1", "hello", None),
+            (uuid.uuid4(), 1300, 2500, "spk_2", "hi there", 0.9),
+        ]
+        self.session = FakeSession(self.rows)
+
+    def test_detail_payload_is_a_valid_meeting_detail(self) -> None:
+        payload = meeting_detail_payload(self.session, _meeting())
+        body = JsonBytesResponse(payload).body
+
+        detail = MeetingDetail.model_validate_json(body)
+        self.assertEqual(
+            [segment.id for segment in detail.transcript_segments],
+            [row[0] for row in self.rows],
+        )
+        self.assertIsNone(detail.transcript_columns)
+        self.assertEqual(json.loads(body)["created_at"], "2026-01-05T09:30:00Z")
+
+    def test_revisions_are_listed_without_their_content(self) -> None:
+        meeting_detail_payload(self.session, _meeting())
+
+        columns = self.session.columns[TranscriptRevision]
+        self.assertIn("revision_no", columns)
+        self.assertNotIn("snapshot_json", columns)
+        self.assertNotIn("delta_json", columns)
+
+    def test_columnar_transcript(self) -> None:
+        payload = meeting_detail_payload(self.session, _meeting(), "columnar")
+
+        detail = MeetingDetail.model_validate_json(JsonBytesResponse(payload).body)
+        self.assertEqual(detail.transcript_segments, [])
+        self.assertEqual(detail.transcript_columns.start_ms, [0, 1300])
+        self.assertEqual(detail.transcript_columns.text, ["hello", "hi there"])
+        self.assertEqual(detail.transcript_columns.confidence, [None, 0.9])
+
+    def test_media_urls_come_from_the_first_asset(self) -> None:
+        asset = (
+            uuid.uuid4(),
+            "original/m/a.m4a",
+            "normalized/m/a.wav",
+            None,
+            "playable/m/a.m4a",
+            "peaks/m/a.json",
+            "playable/m/hls/index.m3u8",
+            None,
+            "a.m4a",
+            "audio/mp4",
+            60000,
+        )
+        session = FakeSession(self.rows, [asset])
+        meeting = _meeting()
+
+        with mock.patch.object(
+            serialization,
+            "presigned_get",
+            lambda key: SimpleNamespace(url=f"https://s3/{key}"),
+        ):
+            payload = meeting_detail_payload(session, meeting)
+
+        self.assertEqual(payload["playable_url"], "https://s3/playable/m/a.m4a")
+        self.assertEqual(payload["peaks_url"], "https://s3/peaks/m/a.json")
+        self.assertEqual(payload["hls_url"], f"/meetings/{meeting.id}/hls.m3u8")
+
+    def test_columnar_of_no_rows_has_empty_arrays(self) -> None:
+        self.assertEqual(columnar([], ["id", "text"]), {"id": [], "text": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
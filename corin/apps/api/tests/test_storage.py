@@ -0,0 +1,43 @@
+import unittest
+from unittest import mock
+
+from app import storage
+
+
+class FakeS3:
+    def __init__(self, errors: list[dict] | None = None) -> None:
+        self.batches: list[list[str]] = []
+        self.errors = errors or []
+
+    def delete_objects(self, Bucket: str, Delete: dict) -> dict:
+        self.batches.append([item["Key"] for item in Delete["Objects"]])
+        return {"Errors": self.errors} if self.errors else {}
+
+
+class DeleteObjectsTests(unittest.TestCase):
+    def _delete(self, client: FakeS3, keys: list[str]) -> None:
+        with mock.patch.object(storage, "get_s3_client", return_value=client):
+            storage.delete_objects(keys)
+
+    def test_deletes_in_batches_of_1000(self) -> None:
+        client = FakeS3()
+        keys = [f"clips/m-1/{index}.wav" for index in range(2500)]
+
+        self._delete(client, keys)
+
+        self.assertEqual([len(batch) for batch in client.batches], [1000, 1000, 500])
+        self.assertEqual(sum(client.batches, []), keys)
+
+    def test_no_keys_makes_no_request(self) -> None:
+        client = FakeS3()
+        self._delete(client, [])
+        self.assertEqual(client.batches, [])
+
+    def test_failed_keys_raise(self) -> None:
+        client = FakeS3(errors=[{"Key": "clips/m-1/0.wav", "Message": "denied"}])
+        with self.assertRaises(RuntimeError):
+            self._delete(client, ["clips/m-1/0.wav"])
+
+
+if __name__ == "__main__":
+    unittest.main()
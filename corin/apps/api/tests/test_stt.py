@@ -0,0 +1,151 @@
+import time
+import unittest
+from typing import Callable
+
+from app.llm import TranscriptionResult, TranscriptionSegment, TranscriptionUsage
+from app.metrics import STT_HEDGE_DISCARDED_TOKENS
+from app.stt import ProviderHealth, SttRouter, provider_order
+
+
+class MemoryHealthStore:
+    def __init__(self) -> None:
+        self.health: dict[str, ProviderHealth] = {}
+
+    def load(self, name: str) -> ProviderHealth:
+        return self.health.setdefault(name, ProviderHealth())
+
+    def update(self, name: str, change: Callable[[ProviderHealth], None]) -> None:
+        change(self.load(name))
+
+
+def _provider(
+    text: str,
+    delay_s: float = 0.0,
+    fail: bool = False,
+    usage: TranscriptionUsage | None = None,
+):
+    def transcribe(file_path: str) -> TranscriptionResult:
+        time.sleep(delay_s)
+        if fail:
+            raise RuntimeError(f"{text} down")
+        return TranscriptionResult(
+            segments=[TranscriptionSegment(start_ms=0, end_ms=1000, text=text)],
+            usage=usage,
+        )
+
+    return transcribe
+
+
+class SttRouterTests(unittest.TestCase):
+    def _router(self, providers, **kwargs) -> SttRouter:
+        return SttRouter(
+            providers=providers,
+            batch_providers={},
+            store=MemoryHealthStore(),
+            order=list(providers),
+            **kwargs,
+        )
+
+    def test_falls_back_and_opens_breaker(self) -> None:
+        router = self._router(
+            {"a": _provider("a", fail=True), "b": _provider("b")},
+            breaker_failures=2,
+            breaker_cooldown_s=60,
+        )
+        for _ in range(2):
+            result = router.transcribe("clip.wav")
+            self.assertEqual(result.provider, "b")
+        self.assertEqual(router.candidates(), ["b"])
+        health = router.store.load("a")
+        self.assertEqual(health.failures, 2)
+        self.assertTrue(health.is_open(time.time()))
+
+    def test_half_open_breaker_closes_on_success(self) -> None:
+        now = [1000.0]
+        router = self._router(
+            {"a": _provider("a"), "b": _provider("b")},
+            breaker_failures=1,
+            breaker_cooldown_s=30,
+            clock=lambda: now[0],
+        )
+        router.store.load("a").record_failure(now[0], 1, 30)
+        self.assertEqual(router.candidates(), ["b"])
+        now[0] += 31
+        self.assertEqual(router.transcribe("clip.wav").provider, "a")
+        self.assertEqual(router.store.load("a").failures, 0)
+
+    def test_hedges_past_p95(self) -> None:
+        router = self._router(
+            {"slow": _provider("slow", delay_s=0.5), "fast": _provider("fast")},
+            hedge_min_samples=5,
+        )
+        for _ in range(5):
+            router.store.load("slow").record_success(20.0)
+        started = time.perf_counter()
+        result = router.transcribe("clip.wav")
+        self.assertEqual(result.provider, "fast")
+        self.assertLess(time.perf_counter() - started, 0.4)
+
+    def test_losing_hedge_usage_is_counted(self) -> None:
+        usage = TranscriptionUsage(audio_tokens=40, text_tokens=3, output_tokens=7)
+        router = self._router(
+            {
+                "slow": _provider("slow", delay_s=0.2, usage=usage),
+                "fast": _provider("fast"),
+            },
+            hedge_min_samples=5,
+        )
+        for _ in range(5):
+            router.store.load("slow").record_success(20.0)
+        discarded = STT_HEDGE_DISCARDED_TOKENS.labels(provider="slow", kind="audio")
+        before = discarded._value.get()
+
+        self.assertEqual(router.transcribe("clip.wav").provider, "fast")
+        deadline = time.monotonic() + 2
+        while discarded._value.get() == before and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(discarded._value.get() - before, 40)
+
+    def test_failed_batch_falls_back_to_the_next_provider(self) -> None:
+        calls: list[str] = []
+
+        def failing_batch(file_paths):
+            raise RuntimeError("local down")
+
+        def single(name):
+            def transcribe(file_path):
+                calls.append(name)
+                return _provider(name)(file_path)
+
+            return transcribe
+
+        router = SttRouter(
+            providers={"local": single("local"), "whisper": single("whisper")},
+            batch_providers={"local": failing_batch},
+            store=MemoryHealthStore(),
+            order=["local", "whisper"],
+        )
+        results = router.transcribe_batch(["a.wav", "b.wav"])
+
+        self.assertEqual([result.provider for result in results], ["whisper"] * 2)
+        self.assertEqual(calls, ["whisper", "whisper"])
+
+    def test_no_hedge_without_latency_history(self) -> None:
+        router = self._router(
+            {"slow": _provider("slow", delay_s=0.05), "fast": _provider("fast")},
+        )
+        self.assertEqual(router.transcribe("clip.wav").provider, "slow")
+
+    def test_provider_order(self) -> None:
+        self.assertEqual(
+            provider_order("whisper", "openai_4o, whisper,unknown"),
+            ["whisper", "openai_4o"],
+        )
+        self.assertEqual(
+            ProviderHealth(latencies_ms=[float(i) for i in range(100)]).p95_ms(20),
+            95.0,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
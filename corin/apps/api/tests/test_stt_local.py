@@ -0,0 +1,79 @@
+import sys
+import types
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+from app import stt_local
+from app.stt_local import _SAMPLE_RATE, _plan_windows, _split_segments
+
+
+class FakePipeline:
+    def __init__(self) -> None:
+        self.kwargs: dict = {}
+
+    def transcribe(self, audio, **kwargs):
+        self.kwargs = kwargs
+        return [SimpleNamespace(start=6.0, end=7.5, text="hello")], None
+
+
+class LocalSttTests(unittest.TestCase):
+    def test_plan_windows_stay_inside_clips(self) -> None:
+        clip_samples = [5 * _SAMPLE_RATE, 70 * _SAMPLE_RATE, 0, 30 * _SAMPLE_RATE]
+        offsets, windows = _plan_windows(clip_samples)
+        self.assertEqual(
+            offsets, [0, 5 * _SAMPLE_RATE, 75 * _SAMPLE_RATE, 75 * _SAMPLE_RATE]
+        )
+        self.assertEqual(len(windows), 1 + 3 + 0 + 1)
+        for start, end in windows:
+            self.assertLessEqual(end - start, 30 * _SAMPLE_RATE)
+        self.assertEqual(windows[1][0], 5 * _SAMPLE_RATE)
+        self.assertEqual(windows[3][1], 75 * _SAMPLE_RATE)
+
+    def test_split_segments_rebases_to_clip(self) -> None:
+        clip_samples = [2 * _SAMPLE_RATE, 3 * _SAMPLE_RATE]
+        offsets, _ = _plan_windows(clip_samples)
+        results = _split_segments(
+            [(0.1, 1.9, " first "), (2.5, 5.2, "second"), (3.0, 3.5, "  ")],
+            offsets,
+            clip_samples,
+        )
+        self.assertEqual(len(results), 2)
+        self.assertEqual(
+            [(s.start_ms, s.end_ms, s.text) for s in results[0].segments],
+            [(100, 1900, "first")],
+        )
+        self.assertEqual(
+            [(s.start_ms, s.end_ms, s.text) for s in results[1].segments],
+            [(500, 3000, "second")],
+        )
+
+    def test_clip_timestamps_are_passed_in_seconds(self) -> None:
+        clips = {"a.wav": 5 * _SAMPLE_RATE, "b.wav": 40 * _SAMPLE_RATE}
+        fake_module = types.ModuleType("faster_whisper")
+        fake_module.decode_audio = lambda path, sampling_rate: np.zeros(
+            clips[path], dtype=np.float32
+        )
+        pipeline = FakePipeline()
+        with mock.patch.dict(sys.modules, {"faster_whisper": fake_module}), (
+            mock.patch.object(stt_local, "get_local_pipeline", return_value=pipeline)
+        ):
+            results = stt_local.transcribe_local_batch(list(clips))
+
+        self.assertEqual(
+            pipeline.kwargs["clip_timestamps"],
+            [
+                {"start": 0.0, "end": 5.0},
+                {"start": 5.0, "end": 25.0},
+                {"start": 25.0, "end": 45.0},
+            ],
+        )
+        self.assertEqual(
+            [(s.start_ms, s.end_ms) for s in results[1].segments], [(1000, 2500)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from app import timing
+from app.timing import JobTimer, _current, timed_job, timed_stage
+
+
+class TimingTests(unittest.TestCase):
+    def test_timed_stage_records_into_current_timer(self) -> None:
+        timer = JobTimer(job="run_vad", meeting_id="m-1")
+        token = _current.set(timer)
+        try:
+            with timed_stage("vad"):
+                pass
+            with self.assertRaises(RuntimeError):
+                with timed_stage("upload"):
+                    raise RuntimeError("boom")
+        finally:
+            _current.reset(token)
+        self.assertEqual([name for name, _ in timer.records], ["vad", "upload"])
+        self.assertTrue(all(seconds >= 0 for _, seconds in timer.records))
+
+    def test_timed_stage_without_timer_is_noop(self) -> None:
+        with timed_stage("vad"):
+            value = 1
+        self.assertEqual(value, 1)
+
+    def test_bookkeeping_failures_do_not_change_the_job_outcome(self) -> None:
+        @timed_job("run_vad")
+        def succeeds(meeting_id: str) -> str:
+            with timed_stage("vad"):
+                return "ok"
+
+        @timed_job("run_vad")
+        def fails(meeting_id: str) -> None:
+            with timed_stage("vad"):
+                raise ValueError("bad audio")
+
+        job = SimpleNamespace(id="job-1", enqueued_at=None, started_at=None)
+        with (
+            mock.patch.object(JobTimer, "flush", side_effect=OSError("db down")),
+            mock.patch.object(timing, "get_current_job", return_value=job),
+            mock.patch.object(
+                timing, "settle_backlog", side_effect=OSError("redis down")
+            ),
+            self.assertLogs(timing.logger, "ERROR") as logs,
+        ):
+            self.assertEqual(succeeds("m-1"), "ok")
+            with self.assertRaisesRegex(ValueError, "bad audio"):
+                fails("m-1")
+        self.assertEqual(len(logs.records), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
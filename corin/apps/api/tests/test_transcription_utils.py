@@ -1,12 +1,19 @@
 import unittest
-from typing import cast
+import uuid
 
-from app.llm import _extract_usage, _normalize_speaker
+from app.llm import (
+    TranscriptionResult,
+    TranscriptionSegment,
+    TranscriptionUsage,
+    _extract_usage,
+    _normalize_speaker,
+)
 from app.tasks import (
+    _build_segment_rows,
     _compute_stt_cost,
     _iter_clip_parts,
+    _new_usage,
     _remap_segment_times,
-    _window_has_existing_segments,
 )
 
 
@@ -15,12 +22,6 @@ class DummyResponse:
         self.usage = usage
 
 
-class DummySegment:
-    def __init__(self, start_ms: int, end_ms: int) -> None:
-        self.start_ms = start_ms
-        self.end_ms = end_ms
-
-
 class TranscriptionUtilsTests(unittest.TestCase):
     def test_iter_clip_parts_splits(self) -> None:
         parts = _iter_clip_parts(1000, 400)
@@ -53,11 +54,47 @@ class TranscriptionUtilsTests(unittest.TestCase):
         self.assertEqual(usage.text_tokens, 3)
         self.assertEqual(usage.output_tokens, 7)
 
-    def test_window_has_existing_segments(self) -> None:
-        segments = [DummySegment(100, 200), DummySegment(400, 500)]
-        typed_segments = cast(list, segments)
-        self.assertTrue(_window_has_existing_segments(typed_segments, 50, 250))
-        self.assertFalse(_window_has_existing_segments(typed_segments, 250, 350))
+    def test_build_segment_rows(self) -> None:
+        meeting_uuid = uuid.uuid4()
+        vad_uuid = uuid.uuid4()
+        result = TranscriptionResult(
+            segments=[
+                TranscriptionSegment(start_ms=0, end_ms=400, text=" hello "),
+                TranscriptionSegment(
+                    start_ms=400, end_ms=900, text="world", speaker="spk_2"
+                ),
+            ]
+        )
+        rows = _build_segment_rows(meeting_uuid, vad_uuid, 1000, 5000, result)
+        self.assertEqual([row["part_seq"] for row in rows], [0, 1])
+        self.assertEqual([row["part_start_ms"] for row in rows], [1000, 1000])
+        self.assertEqual((rows[0]["start_ms"], rows[0]["end_ms"]), (5000, 5400))
+        self.assertEqual(rows[0]["text"], "hello")
+        self.assertEqual(rows[0]["speaker_key"], "spk_1")
+        self.assertEqual(rows[1]["speaker_key"], "spk_2")
+        self.assertEqual(rows[1]["vad_segment_id"], vad_uuid)
+
+    def test_rerun_does_not_bill_stored_parts_again(self) -> None:
+        vad_uuid = uuid.uuid4()
+        spoken = TranscriptionResult(
+            segments=[TranscriptionSegment(start_ms=0, end_ms=400, text="hi")],
+            usage=TranscriptionUsage(audio_tokens=100, text_tokens=0, output_tokens=5),
+        )
+        silent = TranscriptionResult(
+            segments=[],
+            usage=TranscriptionUsage(audio_tokens=40, text_tokens=0, output_tokens=1),
+        )
+        parts = [((vad_uuid, 0), spoken), ((vad_uuid, 60000), spoken)]
+
+        first = _new_usage(parts, {(vad_uuid, 0), (vad_uuid, 60000)}, 2.5, 10.0)
+        rerun = _new_usage(parts, set(), 2.5, 10.0)
+        partial = _new_usage(parts, {(vad_uuid, 60000)}, 2.5, 10.0)
+        no_text = _new_usage([((vad_uuid, 0), silent)], set(), 2.5, 10.0)
+
+        self.assertEqual(first[:3], (200, 0, 10))
+        self.assertEqual(rerun, (0, 0, 0, 0))
+        self.assertEqual(partial[:3], (100, 0, 5))
+        self.assertEqual(no_text[:3], (40, 0, 1))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,192 @@
+import random
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from app.vad import (
+    SHARD_SEAM_TOLERANCE,
+    StreamingVad,
+    _plan_shards,
+    _segments_from_flags,
+    detect_segments,
+)
+
+
+def _reference_segments(
+    flags: list[bool],
+    frame_ms: int,
+    audio_length_ms: int,
+    min_segment_ms: int,
+    merge_gap_ms: int,
+    pad_ms: int,
+) -> list[tuple[int, int, int, int]]:
+    segments = []
+    triggered = False
+    start_ms = 0
+    timestamp_ms = 0
+    for index, is_speech in enumerate(flags):
+        timestamp_ms = index * frame_ms
+        if is_speech and not triggered:
+            triggered = True
+            start_ms = timestamp_ms
+        if triggered and not is_speech:
+            segments.append((start_ms, timestamp_ms + frame_ms))
+            triggered = False
+    if triggered:
+        segments.append((start_ms, timestamp_ms + frame_ms))
+    merged: list[tuple[int, int]] = []
+    for seg_start, seg_end in segments:
+        if merged and seg_start - merged[-1][1] < merge_gap_ms:
+            merged[-1] = (merged[-1][0], seg_end)
+            continue
+        merged.append((seg_start, seg_end))
+    return [
+        (
+            seg_start,
+            seg_end,
+            max(seg_start - pad_ms, 0),
+            min(seg_end + pad_ms, audio_length_ms),
+        )
+        for seg_start, seg_end in merged
+        if seg_end - seg_start >= min_segment_ms
+    ]
+
+
+class VadTests(unittest.TestCase):
+    def test_segments_from_flags_matches_frame_loop(self) -> None:
+        rng = random.Random(7)
+        for _ in range(200):
+            n_frames = rng.randint(0, 400)
+            flags = [rng.random() < 0.4 for _ in range(n_frames)]
+            audio_length_ms = n_frames * 30 + rng.randint(0, 29)
+            expected = _reference_segments(flags, 30, audio_length_ms, 300, 200, 250)
+            results = _segments_from_flags(
+                np.array(flags, dtype=bool),
+                np.zeros(n_frames, dtype=np.float32),
+                30,
+                audio_length_ms,
+                300,
+                200,
+                250,
+            )
+            actual = [
+                (r.start_ms, r.end_ms, r.padded_start_ms, r.padded_end_ms)
+                for r in results
+            ]
+            self.assertEqual(actual, expected)
+
+    def test_detect_segments_fills_energy(self) -> None:
+        sample_rate = 16000
+        t = np.arange(sample_rate * 3) / sample_rate
+        tone = 0.5 * np.sin(2 * np.pi * 220 * t) * (t >= 1.0) * (t < 2.0)
+        noise = np.random.default_rng(3).normal(0, 0.2, len(t)) * (t >= 1.0) * (
+            t < 2.0
+        )
+        pcm = ((tone + noise) * 32767 * 0.5).astype("<i2")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "speech.wav"
+            with wave.open(str(path), "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(sample_rate)
+                wf.writeframes(pcm.tobytes())
+            segments = detect_segments(str(path))
+        self.assertTrue(segments)
+        for seg in segments:
+            self.assertIsNotNone(seg.energy_score)
+            assert seg.energy_score is not None
+            self.assertGreater(seg.energy_score, 0.0)
+            self.assertLessEqual(seg.energy_score, 1.0)
+
+    def test_plan_shards_covers_all_frames(self) -> None:
+        self.assertEqual(_plan_shards(100, 4, 1000), [(0, 100)])
+        shards = _plan_shards(1000, 3, 100)
+        self.assertEqual(len(shards), 3)
+        self.assertEqual(shards[0][0], 0)
+        self.assertEqual(shards[-1][1], 1000)
+        for (_, end), (start, _) in zip(shards, shards[1:]):
+            self.assertEqual(end, start)
+
+    def test_sharded_detection_stays_within_seam_tolerance(self) -> None:
+        # A slowly moving noise floor keeps the warmed-up shard detectors
+        # from fully matching a serial pass.
+        sample_rate = 16000
+        t = np.arange(sample_rate * 90) / sample_rate
+        rng = np.random.default_rng(8)
+        speaking = np.sin(2 * np.pi * t / 4.1) > 0.1
+        noise_level = 0.05 + 0.2 * (np.sin(2 * np.pi * t / 40) + 1)
+        signal = 0.4 * np.sin(2 * np.pi * 210 * t) * speaking + rng.normal(
+            0, 1, len(t)
+        ) * noise_level * 0.6
+        pcm = (signal * 9000).clip(-32767, 32767).astype("<i2")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "long.wav"
+            with wave.open(str(path), "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(sample_rate)
+                wf.writeframes(pcm.tobytes())
+            serial = detect_segments(str(path))
+            sharded = detect_segments(
+                str(path), workers=3, min_shard_ms=5_000, shard_overlap_ms=30_000
+            )
+
+        def speech_mask(segments) -> np.ndarray:
+            mask = np.zeros(len(t) * 1000 // sample_rate, dtype=bool)
+            for seg in segments:
+                mask[seg.start_ms : seg.end_ms] = True
+            return mask
+
+        disagreement = np.mean(speech_mask(serial) != speech_mask(sharded))
+        self.assertLessEqual(disagreement, SHARD_SEAM_TOLERANCE)
+        self.assertTrue(serial)
+
+    def test_streaming_vad_matches_batch(self) -> None:
+        sample_rate = 16000
+        t = np.arange(sample_rate * 20) / sample_rate
+        speaking = ((t % 2.7) < 1.6) | ((t % 5.0) > 4.9)
+        rng = np.random.default_rng(11)
+        signal = 0.4 * np.sin(2 * np.pi * 200 * t) + rng.normal(0, 0.1, len(t))
+        audio = (signal * speaking * 12000).astype("<i2").tobytes()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "live.wav"
+            with wave.open(str(path), "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(sample_rate)
+                wf.writeframes(audio)
+            expected = detect_segments(str(path))
+
+        streamer = StreamingVad(sample_rate)
+        chunk_rng = random.Random(2)
+        streamed = []
+        offset = 0
+        while offset < len(audio):
+            size = chunk_rng.randint(1, 4000) * 2 + chunk_rng.randint(0, 1)
+            chunk = audio[offset : offset + size]
+            offset += len(chunk)
+            received_ms = offset / 2 / sample_rate * 1000
+            for seg in streamer.feed(chunk):
+                self.assertLessEqual(seg.padded_end_ms, received_ms)
+                streamed.append(seg)
+        streamed.extend(streamer.finish())
+
+        self.assertTrue(expected)
+
+        def bounds(segments):
+            return [
+                (s.start_ms, s.end_ms, s.padded_start_ms, s.padded_end_ms)
+                for s in segments
+            ]
+
+        self.assertEqual(bounds(streamed), bounds(expected))
+        for live, batch in zip(streamed, expected):
+            assert live.energy_score is not None and batch.energy_score is not None
+            self.assertAlmostEqual(live.energy_score, batch.energy_score, places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
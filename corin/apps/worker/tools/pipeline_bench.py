@@ -0,0 +1,496 @@
+"""Offline end-to-end pipeline benchmark.
+
+Runs the real ``app.tasks`` stages on synthetic audio against the configured
+Postgres (``DATABASE_URL``). S3, the job queue and the STT/LLM providers are
+replaced by in-process stand-ins, so no network access or API keys are needed.
+Requires ffmpeg on PATH.
+
+    PYTHONPATH=corin/apps/api python corin/apps/worker/tools/pipeline_bench.py \\
+        --durations 600 3600 10800 --stt-latency-ms 300
+
+``--client-overhead N`` instead times N OpenAI embedding calls against a
+local stub server, comparing a client built per call with the shared
+keep-alive client. No database or API key is needed for that mode.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import resource
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+import wave
+from collections import Counter, deque
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+from openai import OpenAI
+from rq.utils import import_attribute
+
+from app import hls, lifecycle, llm, tasks
+from app.config import get_settings
+from app.db import SessionLocal, init_db
+from app.llm import TranscriptionResult, TranscriptionSegment, TranscriptionUsage
+from app.models import Meeting
+
+_EMBED_DIM = 1536
+
+
+class LocalObjectStore:
+    """S3 stand-in that keeps objects as files in a scratch directory."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.calls: Counter[str] = Counter()
+
+    def _path(self, object_key: str) -> Path:
+        path = self.root / object_key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def upload_fileobj(self, object_key: str, fileobj, content_type=None) -> None:
+        self.calls["upload"] += 1
+        with open(self._path(object_key), "wb") as target:
+            shutil.copyfileobj(fileobj, target)
+
+    def download_file(self, object_key: str, target_path: str) -> None:
+        self.calls["download"] += 1
+        shutil.copyfile(self._path(object_key), target_path)
+
+    def delete_objects(self, object_keys: list[str]) -> None:
+        self.calls["delete"] += 1
+        for object_key in object_keys:
+            (self.root / object_key).unlink(missing_ok=True)
+
+
+@dataclass
+class FakeJob:
+    id: str
+
+
+class InlineQueue:
+    """Queue stand-in; jobs run FIFO in this process. Fan-out groups are
+    kept in memory (see ``InlineFanout``), so no Redis is needed."""
+
+    connection = None
+
+    def __init__(self) -> None:
+        self.pending: deque = deque()
+        self.round_trips = 0
+
+    def enqueue(self, func, *args, depends_on=None, **kwargs) -> FakeJob:
+        job = FakeJob(id=str(uuid.uuid4()))
+        self.round_trips += 1
+        self.pending.append((func, args, kwargs))
+        return job
+
+    def enqueue_once(
+        self, queue, key, func, *args, backlog_ms=None, **kwargs
+    ) -> FakeJob:
+        return self.enqueue(func, *args, **kwargs)
+
+    def enqueue_many(self, job_datas) -> list[FakeJob]:
+        self.round_trips += 1
+        jobs = []
+        for data in job_datas:
+            jobs.append(FakeJob(id=str(uuid.uuid4())))
+            self.pending.append((data.func, tuple(data.args), data.kwargs or {}))
+        return jobs
+
+
+class InlineFairShare:
+    """In-memory ``app.fairshare`` stand-in. With a single meeting there is
+    nothing to interleave, so submitted jobs go straight to the queue."""
+
+    def __init__(self, queue: InlineQueue) -> None:
+        self.queue = queue
+
+    def submit(self, connection, meeting_id: str, jobs) -> None:
+        self.queue.round_trips += 1
+        for func, args, _meta in jobs:
+            self.queue.pending.append((import_attribute(func), tuple(args), {}))
+
+    def refill(self, queue, depth: int) -> int:
+        return 0
+
+    def clear(self, connection, meeting_id: str) -> None:
+        pass
+
+
+class InlineFanout:
+    """In-memory ``app.fanout`` stand-in."""
+
+    def __init__(self) -> None:
+        self.groups: dict[tuple[str, str], set[str]] = {}
+        self.runs: dict[tuple[str, str], str] = {}
+
+    def start(
+        self, connection, meeting_id: str, stage: str, members: list[str], run_id: str
+    ) -> bool:
+        if self.runs.get((meeting_id, stage)) == run_id:
+            return False
+        self.groups[(meeting_id, stage)] = set(members)
+        self.runs[(meeting_id, stage)] = run_id
+        return True
+
+    def complete(self, connection, meeting_id: str, stage: str, member: str) -> bool:
+        group = self.groups.get((meeting_id, stage), set())
+        if member not in group:
+            return False
+        group.discard(member)
+        return not group
+
+
+@dataclass
+class FakeProvider:
+    """Deterministic STT/LLM stand-in with configurable latency."""
+
+    stt_latency_s: float
+    embed_latency_s: float
+    llm_latency_s: float
+    calls: Counter[str] = field(default_factory=Counter)
+
+    def transcribe_audio_with_usage(self, file_path: str) -> TranscriptionResult:
+        self.calls["stt"] += 1
+        time.sleep(self.stt_latency_s)
+        with wave.open(file_path, "rb") as wf:
+            duration_ms = int(wf.getnframes() * 1000 / wf.getframerate())
+        text = f"segment {self.calls['stt']} lasting {duration_ms} ms"
+        return TranscriptionResult(
+            segments=[
+                TranscriptionSegment(start_ms=0, end_ms=duration_ms, text=text)
+            ],
+            usage=TranscriptionUsage(
+                audio_tokens=duration_ms // 100,
+                text_tokens=0,
+                output_tokens=len(text.split()),
+            ),
+        )
+
+    def transcribe_batch_with_usage(
+        self, file_paths: list[str]
+    ) -> list[TranscriptionResult]:
+        return [self.transcribe_audio_with_usage(path) for path in file_paths]
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        self.calls["embed"] += 1
+        time.sleep(self.embed_latency_s)
+        vectors = []
+        for text in texts:
+            digest = hashlib.sha256(text.encode()).digest()
+            vectors.append(
+                [digest[i % len(digest)] / 255.0 for i in range(_EMBED_DIM)]
+            )
+        return vectors
+
+    def summarize_map(self, chunk_text: str) -> dict:
+        self.calls["summarize_map"] += 1
+        time.sleep(self.llm_latency_s)
+        return {"agenda": [], "decisions": [], "timeline": []}
+
+    def summarize_reduce(self, partials: list[dict]) -> dict:
+        self.calls["summarize_reduce"] += 1
+        time.sleep(self.llm_latency_s)
+        return {"work_summary": {"agenda": [], "decisions": []}, "timeline": []}
+
+
+@dataclass
+class JobStats:
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+
+
+def _cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _peak_rss_mb() -> tuple[float, float]:
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return own, children
+
+
+def generate_synthetic_audio(path: Path, duration_s: int) -> None:
+    # Six seconds of modulated tone plus noise, then three seconds of silence.
+    speech = "lt(mod(t\\,9)\\,6)"
+    expr = (
+        f"(0.4*sin(2*PI*180*t)*abs(sin(2*PI*3*t))"
+        f"+0.1*(random(0)-0.5))*{speech}"
+    )
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"aevalsrc={expr}:s=48000:d={duration_s}",
+            "-ac",
+            "1",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "64k",
+            str(path),
+        ],
+        check=True,
+    )
+
+
+def run_pipeline(
+    duration_s: int, provider: FakeProvider, scratch: Path
+) -> dict:
+    store = LocalObjectStore(scratch / "s3")
+    queue = InlineQueue()
+    fanout = InlineFanout()
+    fair = InlineFairShare(queue)
+    original = scratch / f"input-{duration_s}.m4a"
+    generate_synthetic_audio(original, duration_s)
+
+    with SessionLocal() as session:
+        meeting = Meeting(
+            title=f"pipeline bench {duration_s}s",
+            status="uploaded",
+            progress_json={"stage": "uploaded", "percent": 1},
+        )
+        session.add(meeting)
+        session.commit()
+        meeting_id = str(meeting.id)
+
+    # The meeting's rows are only needed for the measurement; a failed run
+    # must not leave them behind either.
+    try:
+        object_key = f"original/{meeting_id}/input.m4a"
+        with open(original, "rb") as fh:
+            store.upload_fileobj(object_key, fh)
+        store.calls.clear()
+
+        job_stats: dict[str, JobStats] = {}
+        with ExitStack() as stack:
+            patches = {
+                "download_file": store.download_file,
+                "upload_fileobj": store.upload_fileobj,
+                "get_queue": lambda *args, **kwargs: queue,
+                "enqueue_once": queue.enqueue_once,
+                "track_backlog": lambda queue, units: [{} for _ in units],
+                "start_fanout": fanout.start,
+                "complete_fanout_member": fanout.complete,
+                "submit_fair": fair.submit,
+                "refill_fair": fair.refill,
+                "clear_fair": fair.clear,
+                "transcribe_batch_with_usage": provider.transcribe_batch_with_usage,
+                "embed_texts": provider.embed_texts,
+                "summarize_map": provider.summarize_map,
+                "summarize_reduce": provider.summarize_reduce,
+            }
+            for name, replacement in patches.items():
+                stack.enter_context(mock.patch.object(tasks, name, replacement))
+            for name in ("download_file", "upload_fileobj", "delete_objects"):
+                stack.enter_context(
+                    mock.patch.object(lifecycle, name, getattr(store, name))
+                )
+            # With HLS_ENABLED, ingest uploads the segments through app.hls.
+            stack.enter_context(
+                mock.patch.object(hls, "upload_fileobj", store.upload_fileobj)
+            )
+
+            queue.enqueue(tasks.ingest_upload, meeting_id, object_key)
+            started_wall = time.perf_counter()
+            started_cpu = _cpu_seconds()
+            while queue.pending:
+                func, args, kwargs = queue.pending.popleft()
+                stats = job_stats.setdefault(func.__name__, JobStats())
+                job_wall = time.perf_counter()
+                job_cpu = _cpu_seconds()
+                func(*args, **kwargs)
+                stats.calls += 1
+                stats.wall_s += time.perf_counter() - job_wall
+                stats.cpu_s += _cpu_seconds() - job_cpu
+            total_wall = time.perf_counter() - started_wall
+            total_cpu = _cpu_seconds() - started_cpu
+
+        with SessionLocal() as session:
+            meeting = session.get(Meeting, uuid.UUID(meeting_id))
+            status = meeting.status if meeting else "missing"
+    finally:
+        with SessionLocal() as session:
+            lifecycle.delete_meeting_rows(session, uuid.UUID(meeting_id))
+            session.commit()
+
+    rss_self, rss_children = _peak_rss_mb()
+    return {
+        "duration_s": duration_s,
+        "meeting_id": meeting_id,
+        "status": status,
+        "wall_s": round(total_wall, 3),
+        "cpu_s": round(total_cpu, 3),
+        "peak_rss_mb": round(rss_self, 1),
+        "peak_child_rss_mb": round(rss_children, 1),
+        "jobs": {
+            name: {
+                "calls": stats.calls,
+                "wall_s": round(stats.wall_s, 3),
+                "cpu_s": round(stats.cpu_s, 3),
+            }
+            for name, stats in job_stats.items()
+        },
+        "storage_calls": dict(store.calls),
+        "queue_round_trips": queue.round_trips,
+        "provider_calls": dict(provider.calls),
+    }
+
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    """Answers every POST with a tiny embeddings payload over keep-alive
+    HTTP/1.1, counting the connections clients open."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1  # type: ignore[attr-defined]
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(
+            {
+                "object": "list",
+                "data": [{"object": "embedding", "index": 0, "embedding": [0.0] * 8}],
+                "model": "stub",
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def measure_client_overhead(calls: int) -> dict:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenAIHandler)
+    server.connections = 0  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["OPENAI_API_KEY"] = "bench"
+    get_settings.cache_clear()
+    llm._reset_inherited_clients()
+    report = {"calls": calls}
+    try:
+        # Plain HTTP, so this is the floor: against the real API every new
+        # connection also pays DNS and a TLS handshake.
+        started = time.perf_counter()
+        for _ in range(calls):
+            client = OpenAI(api_key="bench", base_url=base_url)
+            client.embeddings.create(model="stub", input=["x"])
+        report["per_call_client"] = {
+            "ms_per_call": round((time.perf_counter() - started) * 1000 / calls, 3),
+            "connections": server.connections,  # type: ignore[attr-defined]
+        }
+
+        server.connections = 0  # type: ignore[attr-defined]
+        started = time.perf_counter()
+        for _ in range(calls):
+            llm.embed_texts(["x"])
+        report["shared_client"] = {
+            "ms_per_call": round((time.perf_counter() - started) * 1000 / calls, 3),
+            "connections": server.connections,  # type: ignore[attr-defined]
+        }
+    finally:
+        server.shutdown()
+        server.server_close()
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"\n== {report['duration_s']}s input  meeting={report['meeting_id']} "
+        f"status={report['status']}"
+    )
+    print(
+        f"wall {report['wall_s']:.2f}s  cpu {report['cpu_s']:.2f}s  "
+        f"peak rss {report['peak_rss_mb']:.0f} MB "
+        f"(children {report['peak_child_rss_mb']:.0f} MB)"
+    )
+    print(f"{'job':<26}{'calls':>8}{'wall s':>12}{'cpu s':>12}")
+    for name, stats in report["jobs"].items():
+        print(
+            f"{name:<26}{stats['calls']:>8}{stats['wall_s']:>12.2f}"
+            f"{stats['cpu_s']:>12.2f}"
+        )
+    print(f"storage calls: {report['storage_calls']}")
+    print(f"queue round trips: {report['queue_round_trips']}")
+    print(f"provider calls: {report['provider_calls']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--durations",
+        type=int,
+        nargs="+",
+        default=[600, 3600, 10800],
+        help="synthetic input lengths in seconds",
+    )
+    parser.add_argument("--stt-latency-ms", type=float, default=0.0)
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--json", action="store_true", help="print JSON only")
+    parser.add_argument(
+        "--client-overhead",
+        type=int,
+        metavar="CALLS",
+        help="measure OpenAI client overhead against a local stub and exit",
+    )
+    args = parser.parse_args()
+
+    if args.client_overhead:
+        report = measure_client_overhead(args.client_overhead)
+        if args.json:
+            print(json.dumps(report, indent=2))
+            return
+        print(f"{'client':<18}{'ms/call':>10}{'connections':>14}")
+        for name in ("per_call_client", "shared_client"):
+            print(
+                f"{name:<18}{report[name]['ms_per_call']:>10.3f}"
+                f"{report[name]['connections']:>14}"
+            )
+        return
+
+    init_db()
+    reports = []
+    for duration_s in args.durations:
+        provider = FakeProvider(
+            stt_latency_s=args.stt_latency_ms / 1000,
+            embed_latency_s=args.embed_latency_ms / 1000,
+            llm_latency_s=args.llm_latency_ms / 1000,
+        )
+        with tempfile.TemporaryDirectory() as scratch:
+            report = run_pipeline(duration_s, provider, Path(scratch))
+        reports.append(report)
+        if not args.json:
+            print_report(report)
+    if args.json:
+        print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    main()
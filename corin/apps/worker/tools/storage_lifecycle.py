@@ -0,0 +1,65 @@
+"""Storage lifecycle sweep; run it periodically, e.g. daily from cron.
+
+Purges meetings soft-deleted more than ``DELETED_MEETING_RETENTION_DAYS``
+ago, and queues ``collect_intermediates`` for finished meetings that still
+hold VAD clips or an unarchived normalized WAV (meetings processed before
+the lifecycle job existed, or live meetings consolidated before their
+ingest finished).
+
+    PYTHONPATH=corin/apps/api python corin/apps/worker/tools/storage_lifecycle.py \\
+        --dry-run
+"""
+
+import argparse
+
+from app.config import get_settings
+from app.db import SessionLocal
+from app.lifecycle import (
+    intermediate_objects,
+    meetings_with_intermediates,
+    purge_meeting,
+    purgeable_meetings,
+)
+from app.queue import LIFECYCLE_QUEUE, enqueue_once, get_queue, idempotency_key
+from app.tasks import collect_intermediates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=get_settings().deleted_meeting_retention_days,
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="report without changing anything"
+    )
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        purged = purgeable_meetings(session, args.retention_days)
+        for meeting_id in purged:
+            if args.dry_run:
+                print(f"would purge {meeting_id}")
+                continue
+            deleted = purge_meeting(session, meeting_id)
+            print(f"purged {meeting_id} ({deleted} objects)")
+
+        pending = meetings_with_intermediates(session)
+        queue = get_queue(LIFECYCLE_QUEUE)
+        for meeting_id in pending:
+            if args.dry_run:
+                keys = intermediate_objects(session, meeting_id)
+                print(f"would collect {meeting_id} ({len(keys)} objects)")
+                continue
+            enqueue_once(
+                queue,
+                idempotency_key(str(meeting_id), "lifecycle"),
+                collect_intermediates,
+                str(meeting_id),
+            )
+    print(f"{len(purged)} meetings to purge, {len(pending)} to collect")
+
+
+if __name__ == "__main__":
+    main()
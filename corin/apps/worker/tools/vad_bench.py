@@ -0,0 +1,203 @@
+"""Compare the vectorized VAD path with the original per-frame loop.
+
+    PYTHONPATH=corin/apps/api python corin/apps/worker/tools/vad_bench.py \\
+        --seconds 3600 --sample-rate 48000
+
+Pass ``--wav`` to benchmark a real 16-bit mono recording instead of
+synthetic audio.
+"""
+
+import argparse
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+import webrtcvad
+
+from app.vad import (
+    _frame_matrix,
+    _frame_rms,
+    _segments_from_flags,
+    _speech_flags,
+    detect_segments,
+)
+
+
+def read_pcm(path: str) -> tuple[np.ndarray, int]:
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError("Only 16-bit PCM WAV is supported")
+        sample_rate = wf.getframerate()
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2")
+    return pcm, sample_rate
+
+
+def legacy_postprocess(
+    flags: list[bool],
+    frame_ms: int,
+    audio_length_ms: int,
+    min_segment_ms: int = 300,
+    merge_gap_ms: int = 200,
+    pad_ms: int = 250,
+) -> list[tuple[int, int, int, int]]:
+    segments: list[tuple[int, int]] = []
+    triggered = False
+    start_ms = 0
+    timestamp_ms = 0
+    for index, is_speech in enumerate(flags):
+        timestamp_ms = index * frame_ms
+        if is_speech and not triggered:
+            triggered = True
+            start_ms = timestamp_ms
+        if triggered and not is_speech:
+            segments.append((start_ms, timestamp_ms + frame_ms))
+            triggered = False
+    if triggered:
+        segments.append((start_ms, timestamp_ms + frame_ms))
+
+    merged: list[tuple[int, int]] = []
+    for seg_start, seg_end in segments:
+        if merged and seg_start - merged[-1][1] < merge_gap_ms:
+            merged[-1] = (merged[-1][0], seg_end)
+            continue
+        merged.append((seg_start, seg_end))
+    return [
+        (
+            seg_start,
+            seg_end,
+            max(seg_start - pad_ms, 0),
+            min(seg_end + pad_ms, audio_length_ms),
+        )
+        for seg_start, seg_end in merged
+        if seg_end - seg_start >= min_segment_ms
+    ]
+
+
+def legacy_detect_segments(
+    wav_path: str, frame_ms: int = 30, aggressiveness: int = 0
+) -> list[tuple[int, int, int, int]]:
+    with wave.open(wav_path, "rb") as wf:
+        sample_rate = wf.getframerate()
+        audio = wf.readframes(wf.getnframes())
+    vad = webrtcvad.Vad(aggressiveness)
+    frame_bytes = int(sample_rate * (frame_ms / 1000.0) * 2)
+    flags = []
+    offset = 0
+    while offset + frame_bytes <= len(audio):
+        frame = audio[offset : offset + frame_bytes]
+        flags.append(vad.is_speech(frame, sample_rate))
+        offset += frame_bytes
+    audio_length_ms = int(len(audio) / 2 / sample_rate * 1000)
+    return legacy_postprocess(flags, frame_ms, audio_length_ms)
+
+
+def write_synthetic_wav(path: Path, seconds: int, sample_rate: int) -> None:
+    # Alternate six seconds of noisy tone with three seconds of silence,
+    # written in one-minute blocks to keep memory flat.
+    rng = np.random.default_rng(0)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        for block_start in range(0, seconds, 60):
+            block_seconds = min(60, seconds - block_start)
+            t = block_start + np.arange(block_seconds * sample_rate) / sample_rate
+            speaking = (t % 9) < 6
+            signal = 0.4 * np.sin(2 * np.pi * 180 * t) * np.abs(
+                np.sin(2 * np.pi * 3 * t)
+            ) + rng.normal(0, 0.05, len(t))
+            wf.writeframes((signal * speaking * 16000).astype("<i2").tobytes())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wav", help="existing 16-bit mono WAV")
+    parser.add_argument("--seconds", type=int, default=600)
+    parser.add_argument("--sample-rate", type=int, default=48000)
+    parser.add_argument("--frame-ms", type=int, default=30)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="*",
+        default=[2, 4],
+        help="process counts for the sharded run",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wav_path = args.wav
+        if not wav_path:
+            wav_path = str(Path(tmpdir) / "synthetic.wav")
+            write_synthetic_wav(Path(wav_path), args.seconds, args.sample_rate)
+        with wave.open(wav_path, "rb") as wf:
+            n_frames = int(
+                wf.getnframes() / (wf.getframerate() * args.frame_ms / 1000)
+            )
+
+        started = time.perf_counter()
+        legacy = legacy_detect_segments(wav_path, frame_ms=args.frame_ms)
+        legacy_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        vectorized = detect_segments(wav_path, frame_ms=args.frame_ms)
+        vectorized_s = time.perf_counter() - started
+
+        pcm, sample_rate = read_pcm(wav_path)
+        frames = _frame_matrix(pcm, sample_rate, args.frame_ms)
+        flags = _speech_flags(frames, sample_rate, 0)
+        audio_length_ms = int(len(pcm) / sample_rate * 1000)
+        flag_list = flags.tolist()
+
+        started = time.perf_counter()
+        legacy_postprocess(flag_list, args.frame_ms, audio_length_ms)
+        legacy_post_s = time.perf_counter() - started
+
+        sharded: list[tuple[int, float, bool]] = []
+        for workers in args.workers:
+            started = time.perf_counter()
+            result = detect_segments(
+                wav_path, frame_ms=args.frame_ms, workers=workers, min_shard_ms=60_000
+            )
+            sharded.append(
+                (workers, time.perf_counter() - started, result == vectorized)
+            )
+
+        started = time.perf_counter()
+        rms = _frame_rms(frames)
+        energy_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        _segments_from_flags(flags, rms, args.frame_ms, audio_length_ms, 300, 200, 250)
+        vectorized_post_s = time.perf_counter() - started
+
+    same = legacy == [
+        (r.start_ms, r.end_ms, r.padded_start_ms, r.padded_end_ms)
+        for r in vectorized
+    ]
+    print(f"frames: {n_frames}  segments: {len(vectorized)}  identical: {same}")
+    print("end to end (read + webrtcvad + post-processing)")
+    print(f"  legacy loop:  {legacy_s:8.3f}s  {n_frames / legacy_s:12.0f} frames/s")
+    print(
+        f"  vectorized:   {vectorized_s:8.3f}s  "
+        f"{n_frames / vectorized_s:12.0f} frames/s"
+    )
+    for workers, elapsed, identical in sharded:
+        print(
+            f"  {workers} workers:    {elapsed:8.3f}s  "
+            f"{n_frames / elapsed:12.0f} frames/s  identical: {identical}"
+        )
+    print("post-processing only (flags -> segments)")
+    print(
+        f"  legacy loop:  {legacy_post_s:8.3f}s  "
+        f"{n_frames / legacy_post_s:12.0f} frames/s"
+    )
+    print(
+        f"  vectorized:   {vectorized_post_s:8.3f}s  "
+        f"{n_frames / vectorized_post_s:12.0f} frames/s"
+    )
+    print(f"energy scoring: {energy_s:8.3f}s  {n_frames / energy_s:12.0f} frames/s")
+
+if __name__ == "__main__":
+    main()
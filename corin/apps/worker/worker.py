@@ -1,12 +1,70 @@
-from rq import Worker
+import os
 
-from app.queue import get_queue
+from prometheus_client import CollectorRegistry, multiprocess, start_http_server
+from rq import Queue, SimpleWorker, Worker
+
+from app.config import get_settings
+from app.fairshare import refill_fair
+from app.queue import TRANSCRIBE_QUEUE, get_queue, worker_queue_names
 from app import tasks  # noqa: F401
 
 
+class MultiprocessMetricsWorker(Worker):
+    """Worker whose finished work horses stop counting towards live gauges
+    such as the database pool's."""
+
+    def monitor_work_horse(self, job, queue) -> None:
+        horse_pid = self.horse_pid
+        try:
+            super().monitor_work_horse(job, queue)
+        finally:
+            multiprocess.mark_process_dead(horse_pid)
+
+
+def start_metrics_server(port: int, forks_jobs: bool) -> None:
+    # Jobs run in forked work horses; their samples are only visible when
+    # prometheus-client runs in multiprocess mode.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(port, registry=registry)
+    elif forks_jobs:
+        raise RuntimeError(
+            "WORKER_METRICS_PORT requires PROMETHEUS_MULTIPROC_DIR (or "
+            "WORKER_SIMPLE=true); metrics of forked jobs would be lost"
+        )
+    else:
+        start_http_server(port)
+
+
 def main() -> None:
-    queue = get_queue()
-    worker = Worker([queue], connection=queue.connection)
+    settings = get_settings()
+    if settings.worker_metrics_port:
+        start_metrics_server(
+            settings.worker_metrics_port, forks_jobs=not settings.worker_simple
+        )
+    # Queues are listed in priority order; the worker always takes from the
+    # first non-empty one.
+    connection = get_queue().connection
+    queues = [
+        Queue(name, connection=connection)
+        for name in worker_queue_names(settings.worker_queues)
+    ]
+    worker_class = Worker
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        worker_class = MultiprocessMetricsWorker
+    if settings.worker_simple:
+        # Jobs run in this process, so a model loaded here is reused by
+        # every job instead of being reloaded in each work horse.
+        worker_class = SimpleWorker
+        if settings.stt_provider == "local":
+            from app.stt_local import get_local_pipeline
+
+            get_local_pipeline()
+    # Admit transcription jobs that were left waiting when every worker
+    # stopped; after this, finishing jobs keep the queue topped up.
+    refill_fair(get_queue(TRANSCRIBE_QUEUE), settings.transcribe_queue_depth)
+    worker = worker_class(queues, connection=connection)
     worker.work(with_scheduler=True)
 
 